@@ -0,0 +1,44 @@
+"""Headless MarketPulse runner: analyze a watchlist file without Streamlit.
+
+    python batch.py watchlist.txt --period 1y --out reports/batch
+"""
+import argparse
+import datetime
+import json
+import os
+import time
+
+import pandas as pd
+
+from utils.engine import analyze_watchlist
+from utils.screener import load_universe
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the MarketPulse analysis for every ticker in a watchlist")
+    parser.add_argument("watchlist", help="Text file with one ticker per line, or a universe name like 'S&P 500'")
+    parser.add_argument("--period", default="1y", choices=["1y", "2y", "5y"])
+    parser.add_argument("--out", default=os.path.join("reports", "batch"), help="Output directory")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--no-sentiment", action="store_true", help="Skip headline fetching and scoring")
+    args = parser.parse_args()
+
+    tickers = load_universe(args.watchlist)
+    started = time.monotonic()
+    records = analyze_watchlist(tickers, args.period, not args.no_sentiment, args.workers)
+    elapsed = time.monotonic() - started
+
+    os.makedirs(args.out, exist_ok=True)
+    stamp = datetime.date.today().isoformat()
+    json_path = os.path.join(args.out, f"analysis_{stamp}.json")
+    csv_path = os.path.join(args.out, f"analysis_{stamp}.csv")
+    with open(json_path, "w") as f:
+        json.dump(records, f, indent=2)
+    pd.DataFrame([{k: v for k, v in r.items() if k != "headlines"} for r in records]).to_csv(csv_path, index=False)
+
+    failed = sum(1 for r in records if "error" in r)
+    print(f"Analyzed {len(records) - failed}/{len(records)} tickers in {elapsed:.1f}s -> {json_path}, {csv_path}")
+
+
+if __name__ == "__main__":
+    main()
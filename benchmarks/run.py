@@ -0,0 +1,180 @@
+# benchmarks/run.py
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks import synthetic
+
+# tickers x years of daily bars
+SIZES = {
+    "1x1y": (1, 1),
+    "10x5y": (10, 5),
+    "100x10y": (100, 10),
+    "1000x20y": (1000, 20),
+}
+
+HEADLINES_PER_TICKER = 20
+MAX_HEADLINES = 20_000
+
+# PDF pages grow with holdings; beyond this the stage measures matplotlib, not us
+PDF_MAX_HOLDINGS = 20
+
+REPORT_PATH = os.path.join("reports", "benchmarks.json")
+
+# Ignore regressions smaller than these; they're mostly noise
+MIN_REGRESSION_S = 0.01
+MIN_REGRESSION_MB = 1.0
+
+
+def _stages(n_tickers, years, repeat):
+    """Stage name -> zero-argument callable for one size; inputs are built here, outside the timings"""
+    from utils.backtest import run_backtest
+    from utils.engine import analyze_sentiment, calculate_technical_indicators, summarize_sentiment
+    from utils.indicators import compute_indicators
+    from utils.portfolio_model import PortfolioModel
+    from utils.report_generator import build_portfolio_report
+    from utils.risk import analyze_risk
+
+    prices = synthetic.price_matrix(n_tickers, years)
+    frames = [synthetic.ohlcv(prices, ticker, seed=i) for i, ticker in enumerate(prices.columns)]
+    holdings = synthetic.holdings(prices)
+    benchmark = synthetic.price_matrix(1, years, seed=1).iloc[:, 0]
+    weights = dict.fromkeys(prices.columns, 1.0)
+
+    n_headlines = min(MAX_HEADLINES, n_tickers * HEADLINES_PER_TICKER)
+    # Cold scoring needs a corpus nothing has seen: one per call (warm-up + timed runs + traced run)
+    cold_corpora = [synthetic.headlines(n_headlines, seed=1000 + i) for i in range(repeat + 2)]
+    warm_corpus = synthetic.headlines(n_headlines, seed=0)
+    scored = analyze_sentiment(warm_corpus)
+
+    pdf_holdings = holdings[:PDF_MAX_HOLDINGS]
+    pdf_prices = prices[[h["ticker"] for h in pdf_holdings]]
+    pdf_indicators = compute_indicators(pdf_prices, sma_windows=(50,))
+    pdf_frames = {
+        ticker: synthetic.ohlcv(pdf_prices, ticker)[["Adj Close"]].assign(
+            SMA_50=pdf_indicators["SMA_50"][ticker], RSI=pdf_indicators["RSI"][ticker]
+        )
+        for ticker in pdf_prices.columns
+    }
+
+    def technical_indicators():
+        for frame in frames:
+            calculate_technical_indicators(frame.copy())
+
+    def portfolio_model():
+        model = PortfolioModel(holdings)
+        model.frame()
+        return model.signal_counts(), model.mean_rsi, model.risk_buckets(), model.score
+
+    return {
+        "calculate_technical_indicators": technical_indicators,
+        "compute_indicators": lambda: compute_indicators(prices),
+        "backtest": lambda: run_backtest(prices),
+        "analyze_sentiment_cold": lambda: analyze_sentiment(cold_corpora.pop()),
+        "analyze_sentiment_warm": lambda: analyze_sentiment(warm_corpus),
+        "summarize_sentiment": lambda: summarize_sentiment(scored),
+        "portfolio_model": portfolio_model,
+        "portfolio_risk": lambda: analyze_risk(prices, weights, benchmark),
+        "pdf_report": lambda: build_portfolio_report(pdf_holdings, frames=pdf_frames),
+    }
+
+
+def measure(fn, repeat=3):
+    """Best wall time of `repeat` runs after a warm-up, and the peak traced allocation of one more run.
+
+    Time and memory come from separate runs because tracing allocations slows the code down.
+    Memory allocated in worker processes is not seen.
+    """
+    fn()
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(min(times), 6), "peak_mb": round(peak / 2 ** 20, 3)}
+
+
+def run_benchmarks(sizes=SIZES, stages=None, repeat=3, progress=print):
+    """Results as size -> stage -> {seconds, peak_mb}"""
+    # Score headlines against a throwaway cache so runs don't warm each other (or the app's cache)
+    cache_dir = tempfile.mkdtemp(prefix="marketpulse-bench-")
+    os.environ["MARKETPULSE_SENTIMENT_CACHE"] = os.path.join(cache_dir, "sentiment_cache.sqlite")
+
+    results = {}
+    for size in sizes:
+        n_tickers, years = SIZES[size]
+        for stage, fn in _stages(n_tickers, years, repeat).items():
+            if stages and stage not in stages:
+                continue
+            result = measure(fn, repeat)
+            results.setdefault(size, {})[stage] = result
+            progress(f"{size:10} {stage:32} {result['seconds']:10.4f}s {result['peak_mb']:10.1f} MB")
+    return results
+
+
+def build_report(results):
+    return {
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "machine": f"{platform.machine()} x{os.cpu_count()}",
+        "results": results,
+    }
+
+
+def regressions(report, baseline, threshold):
+    """(size, stage, metric) -> (before, after) for results that grew past threshold x baseline"""
+    found = {}
+    floors = {"seconds": MIN_REGRESSION_S, "peak_mb": MIN_REGRESSION_MB}
+    for size, stages in report["results"].items():
+        for stage, result in stages.items():
+            before = baseline.get("results", {}).get(size, {}).get(stage)
+            if before is None:
+                continue
+            for metric, floor in floors.items():
+                if result[metric] > before[metric] * threshold and result[metric] - before[metric] > floor:
+                    found[(size, stage, metric)] = (before[metric], result[metric])
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the analysis hot paths on synthetic data")
+    parser.add_argument("--sizes", nargs="+", choices=list(SIZES), default=list(SIZES))
+    parser.add_argument("--stages", nargs="+", help="Only run these stages")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--out", default=REPORT_PATH)
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown/growth ratio vs baseline")
+    args = parser.parse_args()
+
+    report = build_report(run_benchmarks(args.sizes, args.stages, args.repeat))
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.threshold)
+        for (size, stage, metric), (before, after) in found.items():
+            print(f"REGRESSION {size} {stage} {metric}: {before} -> {after}")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
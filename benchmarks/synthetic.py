@@ -0,0 +1,60 @@
+# benchmarks/synthetic.py
+
+import numpy as np
+import pandas as pd
+
+from utils.providers import synthetic_headlines
+
+TRADING_DAYS = 252
+
+
+def tickers(n):
+    return [f"SYN{i:04d}" for i in range(n)]
+
+
+def price_matrix(n_tickers, years, seed=0):
+    """Deterministic dates x tickers adjusted closes: geometric random walks with staggered listings"""
+    rng = np.random.default_rng(seed)
+    n_days = int(years * TRADING_DAYS)
+    drift = rng.normal(0.0003, 0.0002, n_tickers)
+    vol = rng.uniform(0.01, 0.03, n_tickers)
+    returns = rng.normal(drift, vol, (n_days, n_tickers))
+    values = 50 * np.exp(np.cumsum(returns, axis=0))
+    # A tenth of the tickers list partway through the window
+    late = rng.random(n_tickers) < 0.1
+    starts = np.where(late, rng.integers(0, max(1, n_days // 2), n_tickers), 0)
+    values[np.arange(n_days)[:, None] < starts] = np.nan
+    index = pd.bdate_range(end="2025-12-31", periods=n_days)
+    return pd.DataFrame(values, index=index, columns=tickers(n_tickers))
+
+
+def ohlcv(prices, ticker, seed=0):
+    """One ticker's OHLCV frame, shaped like what price_store returns"""
+    rng = np.random.default_rng(seed)
+    close = prices[ticker].dropna()
+    spread = close * rng.uniform(0.001, 0.02, len(close))
+    return pd.DataFrame({
+        "Open": close.shift(1).fillna(close),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Adj Close": close,
+        "Volume": rng.integers(100_000, 10_000_000, len(close)).astype(float),
+    }, index=close.index)
+
+
+def headlines(n, seed=0):
+    """n deterministic finance-style headlines; each seed gives a different corpus"""
+    return [f"{headline} (#{i} s{seed})" for i, headline in enumerate(synthetic_headlines(n, seed))]
+
+
+def holdings(prices, seed=0):
+    """Portfolio entries for every ticker in prices, with the app's recommendation labels"""
+    rng = np.random.default_rng(seed)
+    labels = ["BUY 🟢", "SELL 🔴", "HOLD 🟡"]
+    last = prices.ffill().iloc[-1]
+    return [
+        {"ticker": ticker, "price": float(last[ticker]), "rsi": float(rsi), "recommendation": labels[code],
+         "sentiment": "Neutral", "added_date": "2025-12-31"}
+        for ticker, rsi, code in zip(prices.columns, rng.uniform(10, 90, len(last)), rng.integers(0, 3, len(last)))
+    ]
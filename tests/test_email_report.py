@@ -0,0 +1,142 @@
+# tests/test_email_report.py
+
+import email
+import email.policy
+import smtplib
+import socket
+import threading
+
+import pytest
+
+from utils import email_report
+from utils.email_report import connect, send_reports_bulk
+
+# Test-only dependency: pip install aiosmtpd
+Controller = pytest.importorskip("aiosmtpd.controller").Controller
+AuthResult = pytest.importorskip("aiosmtpd.smtp").AuthResult
+
+SENDER = "reports@marketpulse.test"
+
+
+class Recorder:
+    """Accepts mail, except for scripted replies per recipient local part"""
+
+    def __init__(self):
+        self.messages = []
+        self.attempts = {}
+        self.lock = threading.Lock()
+
+    async def handle_DATA(self, server, session, envelope):
+        recipient = envelope.rcpt_tos[0]
+        with self.lock:
+            self.attempts[recipient] = self.attempts.get(recipient, 0) + 1
+            attempt = self.attempts[recipient]
+        if recipient.startswith("reject"):
+            return "550 Mailbox unavailable"
+        if recipient.startswith("flaky") and attempt == 1:
+            return "451 Try again later"
+        with self.lock:
+            self.messages.append(email.message_from_bytes(envelope.content, policy=email.policy.default))
+        return "250 OK"
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.fixture
+def server():
+    handler = Recorder()
+    handler.port = _free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=handler.port)
+    controller.start()
+    yield handler
+    controller.stop()
+
+
+@pytest.fixture
+def auth_server():
+    port = _free_port()
+    controller = Controller(Recorder(), hostname="127.0.0.1", port=port, auth_require_tls=False,
+                            auth_exclude_mechanism=["LOGIN"], authenticator=lambda *args: AuthResult(success=False, handled=False))
+    controller.start()
+    yield port
+    controller.stop()
+
+
+def _deliveries(tmp_path, recipients):
+    deliveries = []
+    for i, recipient in enumerate(recipients):
+        path = tmp_path / f"report_{i}.pdf"
+        path.write_bytes(b"%PDF-1.4 report for " + recipient.encode())
+        deliveries.append((recipient, str(path)))
+    return deliveries
+
+
+def _send(deliveries, port, password=None, **kwargs):
+    # The local test server speaks plain SMTP, so STARTTLS is explicitly turned off
+    return send_reports_bulk(deliveries, SENDER, password, host="127.0.0.1", port=port, use_ssl=False,
+                             starttls=False, backoff=0.01, **kwargs)
+
+
+def test_delivers_every_report_with_its_own_attachment(server, tmp_path, monkeypatch):
+    monkeypatch.setattr(email_report, "MESSAGES_PER_CONNECTION", 5)
+    recipients = [f"user{i}@example.test" for i in range(23)]
+    report = _send(_deliveries(tmp_path, recipients), server.port, workers=3)
+
+    assert report["sent"] == 23 and report["failed"] == [] and report["retries"] == 0
+    # Three workers reconnecting every 5 messages
+    assert 5 <= report["connections"] <= 7
+    attachments = {
+        msg["To"]: next(part for part in msg.iter_attachments()).get_payload(decode=True) for msg in server.messages
+    }
+    assert attachments == {r: b"%PDF-1.4 report for " + r.encode() for r in recipients}
+
+
+def test_permanent_rejection_is_not_retried(server, tmp_path):
+    report = _send(_deliveries(tmp_path, ["reject@example.test", "ok@example.test"]), server.port)
+    assert report["sent"] == 1 and report["retries"] == 0
+    assert [f["recipient"] for f in report["failed"]] == ["reject@example.test"]
+    assert server.attempts["reject@example.test"] == 1
+
+
+def test_transient_rejection_is_retried(server, tmp_path):
+    report = _send(_deliveries(tmp_path, ["flaky@example.test"]), server.port)
+    assert report["sent"] == 1 and report["retries"] == 1 and report["failed"] == []
+
+
+def test_login_failure_fails_everything_without_retrying(auth_server, tmp_path):
+    recipients = [f"user{i}@example.test" for i in range(10)]
+    report = _send(_deliveries(tmp_path, recipients), auth_server, password="wrong", workers=2)
+    assert report["sent"] == 0 and report["retries"] == 0 and report["connections"] == 0
+    assert sorted(f["recipient"] for f in report["failed"]) == sorted(recipients)
+
+
+def test_unexpected_errors_are_reported_not_dropped(server, tmp_path, monkeypatch):
+    build = email_report.build_message
+
+    def broken(sender, recipient, attachment, *args):
+        if recipient.startswith("bug"):
+            raise RuntimeError("boom")
+        return build(sender, recipient, attachment, *args)
+
+    monkeypatch.setattr(email_report, "build_message", broken)
+    recipients = ["bug@example.test"] + [f"user{i}@example.test" for i in range(5)]
+    report = _send(_deliveries(tmp_path, recipients), server.port, workers=1)
+    assert report["sent"] == 5
+    assert report["failed"] == [{"recipient": "bug@example.test", "error": "boom"}]
+
+
+def test_missing_attachment_fails_only_that_delivery(server, tmp_path):
+    deliveries = _deliveries(tmp_path, ["ok@example.test"]) + [("gone@example.test", str(tmp_path / "missing.pdf"))]
+    report = _send(deliveries, server.port, workers=1)
+    assert report["sent"] == 1
+    assert [f["recipient"] for f in report["failed"]] == ["gone@example.test"]
+
+
+def test_plain_connections_require_starttls_before_login(auth_server):
+    # The test server offers no STARTTLS, so credentials must never be sent in the clear
+    with pytest.raises(smtplib.SMTPNotSupportedError):
+        connect(SENDER, "secret", host="127.0.0.1", port=auth_server, use_ssl=False)
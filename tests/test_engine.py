@@ -0,0 +1,42 @@
+# tests/test_engine.py
+
+import pandas as pd
+import pytest
+
+from utils import engine
+from utils.result_cache import shared_cache
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    shared_cache.clear()
+    yield
+    shared_cache.clear()
+
+
+def _prices(last_close):
+    index = pd.bdate_range(end="2026-10-16", periods=60)
+    close = pd.Series(range(100, 160), index=index, dtype=float)
+    close.iloc[-1] = last_close
+    return pd.DataFrame({"Close": close, "Adj Close": close, "Volume": 1000.0})
+
+
+def test_intraday_price_updates_recompute_indicators(monkeypatch):
+    quotes = iter([_prices(159.0), _prices(120.0)])
+    monkeypatch.setattr(engine, "load_prices", lambda ticker, period: next(quotes))
+
+    before = engine.get_analysis_data("AAA", "1y")
+    # The price cache expires and the store hands back a moved last bar on the same date
+    shared_cache.invalidate(("prices", "AAA", "1y"))
+    after = engine.get_analysis_data("AAA", "1y")
+
+    assert after.index[-1] == before.index[-1]
+    assert after["Adj Close"].iloc[-1] == 120.0
+    assert after["RSI"].iloc[-1] < before["RSI"].iloc[-1]
+
+
+def test_unchanged_prices_share_one_indicator_frame(monkeypatch):
+    monkeypatch.setattr(engine, "load_prices", lambda ticker, period: _prices(159.0))
+    first = engine.get_analysis_data("AAA", "1y")
+    shared_cache.invalidate(("prices", "AAA", "1y"))
+    assert engine.get_analysis_data("AAA", "1y") is first
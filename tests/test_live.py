@@ -0,0 +1,86 @@
+# tests/test_live.py
+
+import threading
+import time
+
+import pandas as pd
+
+from utils import live
+from utils.live import LiveHub
+
+SESSION = pd.date_range("2026-10-16 09:30", periods=390, freq="min")
+
+
+class FakeFeed:
+    """Minute bars up to a movable clock; slow_tickers block until released"""
+
+    def __init__(self, minutes=30):
+        self.minutes = minutes
+        self.calls = []
+        self.slow_tickers = set()
+        self.release = threading.Event()
+        self.lock = threading.Lock()
+
+    def __call__(self, tickers, interval="1m", period="1d", start=None):
+        with self.lock:
+            self.calls.append((tuple(sorted(tickers)), start))
+        if self.slow_tickers & set(tickers):
+            assert self.release.wait(5)
+        index = SESSION[:self.minutes]
+        if start is not None:
+            index = index[index >= start]
+        close = 100 + SESSION.get_indexer(index).astype(float)
+        return {t: pd.DataFrame({"Close": close}, index=index) for t in tickers}
+
+
+def test_slow_fetch_does_not_block_other_sessions(monkeypatch):
+    feed = FakeFeed()
+    feed.slow_tickers = {"SLOW"}
+    monkeypatch.setattr(live, "download_intraday", feed)
+    hub = LiveHub(poll_seconds=0)
+
+    slow = threading.Thread(target=hub.poll, args=(["SLOW"],))
+    slow.start()
+    while not feed.calls:
+        time.sleep(0.01)
+
+    started = time.monotonic()
+    fast = hub.poll(["FAST"])
+    # SLOW is already being fetched, so this session neither waits for it nor fetches it again
+    again = hub.poll(["SLOW"])
+    assert time.monotonic() - started < 1
+    assert "FAST" in fast and again == {}
+    assert [call for call in feed.calls if "SLOW" in call[0]] == [(("SLOW",), None)]
+
+    feed.release.set()
+    slow.join(5)
+    assert hub.poll(["SLOW"])["SLOW"][1] is not None
+
+
+def test_polls_only_request_new_bars(monkeypatch):
+    feed = FakeFeed(minutes=30)
+    monkeypatch.setattr(live, "download_intraday", feed)
+    hub = LiveHub(poll_seconds=0)
+
+    bars, latest = hub.poll(["AAA", "BBB"])["AAA"]
+    assert feed.calls == [(("AAA", "BBB"), None)]
+    assert len(bars) == 30 and latest["price"] == 129
+
+    feed.minutes = 35
+    bars, latest = hub.poll(["AAA", "BBB"])["AAA"]
+    assert feed.calls[-1] == (("AAA", "BBB"), pd.Timestamp(SESSION[28]))
+    assert len(bars) == 35 and latest["price"] == 134
+
+
+def test_snapshots_are_not_changed_by_later_polls(monkeypatch):
+    feed = FakeFeed(minutes=30)
+    monkeypatch.setattr(live, "download_intraday", feed)
+    hub = LiveHub(poll_seconds=0, window=40)
+    bars, latest = hub.poll(["AAA"])["AAA"]
+    before = bars.copy()
+
+    # Enough new bars to wrap the ring buffer over every slot the snapshot came from
+    feed.minutes = 120
+    hub.poll(["AAA"])
+    pd.testing.assert_frame_equal(bars, before)
+    assert latest["price"] == 129 and latest["time"] == SESSION[29]
@@ -0,0 +1,60 @@
+# tests/test_metrics.py
+
+import socket
+import urllib.request
+
+import pytest
+
+from utils import metrics
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(metrics, "ENABLED", True)
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_serve_binds_loopback_by_default(monkeypatch):
+    monkeypatch.setattr(metrics, "_server", None)
+    server = metrics.serve(_free_port())
+    try:
+        assert server.server_address[0] == "127.0.0.1"
+        metrics.incr("cache_requests", cache="result", result="hit")
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics", timeout=5) as response:
+            assert b'marketpulse_cache_requests_total{cache="result",result="hit"} 1' in response.read()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_label_values_are_escaped():
+    metrics.incr("page_views", page='say "hi"\\now\nplease')
+    assert 'marketpulse_page_views_total{page="say \\"hi\\"\\\\now\\nplease"} 1' in metrics.prometheus_text()
+
+
+def test_event_log_rolls_over_at_its_size_cap(tmp_path, monkeypatch):
+    log = tmp_path / "metrics.jsonl"
+    monkeypatch.setattr(metrics, "METRICS_LOG", str(log))
+    monkeypatch.setattr(metrics, "METRICS_LOG_MAX_BYTES", 1000)
+    monkeypatch.setattr(metrics, "_log_file", None)
+    try:
+        for _ in range(100):
+            metrics.observe("stage_seconds", 0.01, stage="prices")
+            if (tmp_path / "metrics.jsonl.1").exists():
+                break
+        for _ in range(3):
+            metrics.observe("stage_seconds", 0.01, stage="after rollover")
+    finally:
+        if metrics._log_file is not None:
+            metrics._log_file.close()
+    assert 0 < log.stat().st_size < 1000
+    assert 1000 <= (tmp_path / "metrics.jsonl.1").stat().st_size < 1200
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["metrics.jsonl", "metrics.jsonl.1"]
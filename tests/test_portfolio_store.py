@@ -0,0 +1,34 @@
+# tests/test_portfolio_store.py
+
+import pytest
+
+from utils import portfolio_store
+
+
+@pytest.fixture(autouse=True)
+def database(tmp_path, monkeypatch):
+    monkeypatch.setattr(portfolio_store, "DB_PATH", str(tmp_path / "portfolios.sqlite"))
+
+
+def test_saving_again_updates_existing_holdings():
+    saved = portfolio_store.sync_portfolio("alice", [
+        {"ticker": "AAPL", "price": 150.0, "rsi": 45.0, "recommendation": "HOLD 🟡", "added_date": "2026-01-02"},
+        {"ticker": "MSFT", "price": 300.0, "rsi": 55.0, "recommendation": "HOLD 🟡", "added_date": "2026-01-02"},
+    ])
+    saved[0].update(price=160.0, rsi=25.0, recommendation="BUY 🟢")
+    resaved = portfolio_store.sync_portfolio("alice", saved)
+
+    assert [p["id"] for p in resaved] == [p["id"] for p in saved]
+    stored = portfolio_store.load_positions("alice")
+    assert len(stored) == 2
+    assert stored[0]["price"] == 160.0 and stored[0]["rsi"] == 25.0 and stored[0]["recommendation"] == "BUY 🟢"
+    assert stored[1]["price"] == 300.0
+
+
+def test_ids_from_another_portfolio_are_not_overwritten():
+    (theirs,) = portfolio_store.sync_portfolio("alice", [{"ticker": "AAPL", "price": 150.0}])
+    mine = portfolio_store.sync_portfolio("bob", [{**theirs, "price": 1.0}])
+
+    assert mine[0]["id"] != theirs["id"]
+    assert portfolio_store.load_positions("alice")[0]["price"] == 150.0
+    assert portfolio_store.load_positions("bob")[0]["price"] == 1.0
@@ -0,0 +1,101 @@
+# tests/test_price_store.py
+
+import datetime
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import price_store
+
+DATES = pd.bdate_range("2026-01-05", periods=60)
+
+
+class FakeProvider:
+    """Daily bars up to a movable last day; a dividend scales Adj Close before its ex-date"""
+
+    def __init__(self, days=40):
+        self.days = days
+        self.ex_date = None
+        self.calls = []
+
+    def __call__(self, ticker, start=None, period=None):
+        self.calls.append(start if start is not None else period)
+        index = DATES[:self.days]
+        close = pd.Series(np.linspace(100.0, 130.0, len(DATES))[:self.days], index=index)
+        adj = close.copy()
+        if self.ex_date is not None:
+            adj[adj.index < self.ex_date] *= 0.98
+        data = pd.DataFrame({"Close": close, "Adj Close": adj, "Volume": 1000})
+        return data if start is None else data[data.index >= pd.Timestamp(start)]
+
+
+@pytest.fixture
+def provider(tmp_path, monkeypatch):
+    fake = FakeProvider()
+    monkeypatch.setattr(price_store, "STORE_DIR", str(tmp_path))
+    monkeypatch.setattr(price_store, "REFRESH_INTERVAL", datetime.timedelta(0))
+    monkeypatch.setattr(price_store, "_download", fake)
+    return fake
+
+
+def test_stale_load_appends_new_bars_from_an_overlap_bar(provider):
+    price_store.load_prices("TEST", "max")
+    provider.days = 45
+    data = price_store.load_prices("TEST", "max")
+
+    assert provider.calls == ["max", DATES[38].date()]
+    assert len(data) == 45
+    pd.testing.assert_frame_equal(data, provider("TEST", period="max"), check_freq=False)
+
+
+def test_dividend_since_last_load_refetches_adjusted_history(provider):
+    price_store.load_prices("TEST", "max")
+    provider.days = 45
+    provider.ex_date = DATES[42]
+    data = price_store.load_prices("TEST", "max")
+
+    assert provider.calls == ["max", DATES[38].date(), "max"]
+    pd.testing.assert_frame_equal(data, provider("TEST", period="max"), check_freq=False)
+    assert data["Adj Close"].iloc[0] == pytest.approx(100.0 * 0.98)
+
+
+def test_bulk_stale_loads_also_catch_restatements(provider, monkeypatch):
+    monkeypatch.setattr(price_store, "_download_many",
+                        lambda tickers, **kwargs: {t: provider(t, **kwargs) for t in tickers})
+    price_store.load_many(["AAA", "BBB"], "max")
+    provider.days = 45
+    provider.ex_date = DATES[42]
+    data = price_store.load_many(["AAA", "BBB"], "max")
+
+    for ticker in ("AAA", "BBB"):
+        assert data[ticker]["Adj Close"].iloc[0] == pytest.approx(100.0 * 0.98)
+
+
+def test_bulk_download_does_not_hold_ticker_locks(provider, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+
+    def slow_bulk(tickers, **kwargs):
+        frames = {t: provider(t, **kwargs) for t in tickers}
+        started.set()
+        assert release.wait(5)
+        return frames
+
+    monkeypatch.setattr(price_store, "_download_many", slow_bulk)
+    bulk = threading.Thread(target=price_store.load_many, args=(["AAA", "BBB"], "max"))
+    bulk.start()
+    assert started.wait(5)
+
+    # A single-ticker load goes through while the bulk download is in flight...
+    provider.ex_date = DATES[30]
+    single = threading.Thread(target=price_store.load_prices, args=("AAA", "max"))
+    single.start()
+    single.join(5)
+    assert not single.is_alive()
+
+    # ...and the bulk load does not overwrite its newer bars with the older download
+    release.set()
+    bulk.join(5)
+    assert price_store.load_cached("AAA")["Adj Close"].iloc[0] == pytest.approx(100.0 * 0.98)
+    assert price_store.load_cached("BBB")["Adj Close"].iloc[0] == pytest.approx(100.0)
@@ -0,0 +1,78 @@
+# tests/test_providers.py
+
+import numpy as np
+import pandas as pd
+import pytest
+import yfinance
+
+from utils import providers
+from utils.providers import TokenBucket, YahooProvider
+
+
+class RecordingBucket(TokenBucket):
+    def __init__(self, capacity):
+        super().__init__(rate=1e6, capacity=capacity)
+        self.taken = []
+
+    def acquire(self, tokens=1):
+        self.taken.append(tokens)
+        return super().acquire(tokens)
+
+
+def _bars(tickers, empty=False):
+    index = pd.bdate_range(end="2025-12-31", periods=5)
+    fields = ["Open", "High", "Low", "Close", "Adj Close", "Volume"]
+    columns = pd.MultiIndex.from_product([tickers, fields])
+    values = np.full((len(index), len(columns)), np.nan) if empty else np.ones((len(index), len(columns)))
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(providers.time, "sleep", lambda seconds: None)
+
+
+def test_bulk_download_is_chunked_and_charged_per_request(monkeypatch):
+    calls = []
+
+    def download(tickers, **kwargs):
+        calls.append(list(tickers))
+        return _bars(tickers)
+
+    monkeypatch.setattr(yfinance, "download", download)
+    bucket = RecordingBucket(capacity=10)
+    tickers = [f"T{i:02d}" for i in range(25)]
+    frames = YahooProvider(bucket, chunk_size=10).download(tickers, period="1y")
+
+    assert [len(chunk) for chunk in calls] == [10, 10, 5]
+    assert bucket.taken == [1, 1, 1]
+    assert set(frames) == set(tickers) and all(len(frame) == 5 for frame in frames.values())
+
+
+def test_empty_response_is_retried(monkeypatch):
+    responses = iter([_bars(["AAA"], empty=True), pd.DataFrame(), _bars(["AAA"])])
+    monkeypatch.setattr(yfinance, "download", lambda tickers, **kwargs: next(responses))
+    bucket = RecordingBucket(capacity=10)
+    frames = YahooProvider(bucket).download(["AAA"], period="1y")
+    assert len(frames["AAA"]) == 5
+    assert bucket.taken == [1, 1, 1]
+
+
+def test_persistently_empty_response_gives_empty_frames(monkeypatch):
+    calls = []
+    monkeypatch.setattr(yfinance, "download", lambda tickers, **kwargs: calls.append(tickers) or pd.DataFrame())
+    frames = YahooProvider(RecordingBucket(capacity=10)).download(["AAA", "BBB"], period="1y")
+    assert len(calls) == providers.RETRIES + 1
+    assert all(frame.empty for frame in frames.values())
+
+
+def test_universe_load_fits_in_one_burst(monkeypatch):
+    monkeypatch.setattr(yfinance, "download", lambda tickers, **kwargs: _bars(tickers))
+    bucket = RecordingBucket(capacity=providers.RATE_BURST)
+    YahooProvider(bucket).download([f"T{i:03d}" for i in range(503)], period="1y")
+    assert sum(bucket.taken) <= providers.RATE_BURST
+
+
+def test_bucket_refuses_more_than_capacity():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, capacity=5).acquire(6)
@@ -0,0 +1,37 @@
+# tests/test_report_generator.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.report_generator import POOL_MIN_HOLDINGS, build_portfolio_report, render_charts
+
+
+def _frame(seed):
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end="2025-12-31", periods=120)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, len(index))))
+    return pd.DataFrame({
+        "Adj Close": close,
+        "SMA_50": pd.Series(close).rolling(50).mean().to_numpy(),
+        "RSI": rng.uniform(20, 80, len(index)),
+    }, index=index)
+
+
+def test_concurrent_inline_renders_match_serial():
+    frames = {f"T{i}": _frame(i) for i in range(8)}
+    expected = {ticker: render_charts(ticker, data) for ticker, data in frames.items()}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for _ in range(3):
+            results = dict(zip(frames, pool.map(render_charts, frames, frames.values())))
+            assert results == expected
+
+
+def test_concurrent_small_portfolio_reports():
+    # Below POOL_MIN_HOLDINGS the charts are drawn in the calling thread
+    holdings = [[{"ticker": f"T{i}{j}"} for j in range(POOL_MIN_HOLDINGS - 1)] for i in range(8)]
+    frames = {h["ticker"]: _frame(k) for k, h in enumerate(h for group in holdings for h in group)}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        pdfs = list(pool.map(lambda group: build_portfolio_report(group, frames=frames), holdings))
+    assert all(pdf.startswith(b"%PDF") for pdf in pdfs)
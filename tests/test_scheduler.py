@@ -0,0 +1,145 @@
+# tests/test_scheduler.py
+
+import datetime
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils import portfolio_store, scheduler
+from utils.portfolio_store import portfolio_slug
+from utils.scheduler import next_run, parse_cron, report_path
+
+
+@pytest.mark.parametrize("name, slug", [
+    ("default", "default"),
+    ("My Portfolio", "My-Portfolio"),
+    ("../../evil", "evil"),
+    ("a/b\\\\c", "a-b-c"),
+])
+def test_portfolio_slug(name, slug):
+    assert portfolio_slug(name) == slug
+
+
+def test_portfolio_slug_rejects_empty():
+    with pytest.raises(ValueError):
+        portfolio_slug("../..")
+
+
+def test_store_rejects_unsafe_names(tmp_path, monkeypatch):
+    monkeypatch.setattr(portfolio_store, "DB_PATH", str(tmp_path / "portfolios.sqlite"))
+    with pytest.raises(ValueError):
+        portfolio_store.sync_portfolio("../../evil", [{"ticker": "AAPL"}])
+    assert portfolio_store.list_users() == []
+
+
+@pytest.mark.parametrize("name", ["../../evil", "..", "/etc/passwd", "a/../../b", "evil"])
+def test_report_path_stays_in_out_dir(tmp_path, name):
+    out_dir = tmp_path / "reports" / "scheduled" / "run"
+    out_dir.mkdir(parents=True)
+    path = report_path(str(out_dir), name)
+    assert os.path.dirname(os.path.realpath(path)) == os.path.realpath(out_dir)
+    assert path.endswith(".pdf")
+
+
+def test_report_path_legacy_names_do_not_collide(tmp_path):
+    assert report_path(str(tmp_path), "../evil") != report_path(str(tmp_path), "evil")
+
+
+def _runs(expr, after, n):
+    runs = []
+    for _ in range(n):
+        after = next_run(expr, after)
+        runs.append(after)
+    return runs
+
+
+SUNDAY = datetime.datetime(2026, 10, 18, 12, 0)
+
+
+def test_weekdays_run_monday_to_friday():
+    runs = _runs("0 6 * * 1-5", SUNDAY, 5)
+    assert [run.strftime("%a") for run in runs] == ["Mon", "Tue", "Wed", "Thu", "Fri"]
+    assert all(run.hour == 6 and run.minute == 0 for run in runs)
+
+
+@pytest.mark.parametrize("weekday", ["0", "7"])
+def test_zero_and_seven_are_sunday(weekday):
+    runs = _runs(f"30 9 * * {weekday}", SUNDAY, 3)
+    assert [run.strftime("%a %d") for run in runs] == ["Sun 25", "Sun 01", "Sun 08"]
+
+
+def test_restricted_day_fields_match_either():
+    # The 1st of the month or any Friday
+    runs = _runs("0 0 1 * 5", datetime.datetime(2026, 10, 18), 4)
+    assert [run.date().isoformat() for run in runs] == ["2026-10-23", "2026-10-30", "2026-11-01", "2026-11-06"]
+
+
+def test_unrestricted_day_of_month_uses_weekday_only():
+    assert next_run("0 0 * * 3", SUNDAY).strftime("%a") == "Wed"
+
+
+@pytest.mark.parametrize("expr", ["60 * * * *", "* 24 * * *", "* * 0 * *", "* * 32 * *", "* * * 13 *",
+                                  "* * * * 8", "5-1 * * * *", "*/0 * * * *", "* * *"])
+def test_out_of_range_fields_are_rejected(expr):
+    with pytest.raises(ValueError):
+        parse_cron(expr)
+
+
+@pytest.fixture
+def jobs(tmp_path, monkeypatch):
+    """A scheduler with its own job store, threads instead of processes and a scripted report builder"""
+    monkeypatch.setattr(scheduler, "JOBS_DB", str(tmp_path / "jobs.sqlite"))
+    monkeypatch.setattr(scheduler, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(scheduler, "shared_frames", lambda tickers: {})
+    monkeypatch.setattr(scheduler, "render_all_charts", lambda frames: {})
+    builds = []
+    failures = {}
+
+    def build(run_id, name, holdings, frames, charts):
+        builds.append(name)
+        if failures.get(name, 0):
+            failures[name] -= 1
+            raise RuntimeError(f"{name} failed")
+        return f"{name}.pdf", 0.1
+
+    monkeypatch.setattr(scheduler, "_build_job", build)
+    return builds, failures
+
+
+def _statuses(run_id):
+    return {job["portfolio"]: (job["status"], job["attempts"]) for job in scheduler.job_timings(run_id)}
+
+
+def test_jobs_for_deleted_portfolios_are_skipped(jobs, monkeypatch):
+    monkeypatch.setattr(scheduler, "saved_portfolios", lambda: {"kept": [{"ticker": "AAPL"}]})
+    scheduler.enqueue_run("run", ["kept", "deleted"])
+    scheduler.execute_run("run")
+
+    assert _statuses("run") == {"kept": ("done", 1), "deleted": ("skipped", 0)}
+    assert scheduler.unfinished_runs() == []
+
+
+def test_failed_jobs_are_retried_up_to_the_attempt_limit(jobs, monkeypatch):
+    builds, failures = jobs
+    monkeypatch.setattr(scheduler, "saved_portfolios",
+                        lambda: {name: [{"ticker": "AAPL"}] for name in ("flaky", "broken", "fine")})
+    failures.update(flaky=1, broken=99)
+    scheduler.enqueue_run("run", ["flaky", "broken", "fine"])
+    scheduler.execute_run("run")
+
+    assert _statuses("run") == {
+        "flaky": ("done", 2), "broken": ("failed", scheduler.MAX_ATTEMPTS), "fine": ("done", 1),
+    }
+    assert builds.count("broken") == scheduler.MAX_ATTEMPTS
+    assert scheduler.unfinished_runs() == []
+
+
+def test_interrupted_failures_resume_with_attempts_left(jobs, monkeypatch):
+    monkeypatch.setattr(scheduler, "saved_portfolios", lambda: {"flaky": [{"ticker": "AAPL"}]})
+    scheduler.enqueue_run("run", ["flaky"])
+    with scheduler._connect() as conn:
+        conn.execute("UPDATE jobs SET status = 'failed', attempts = 1")
+    assert scheduler.unfinished_runs() == ["run"]
+    scheduler.execute_run("run")
+    assert _statuses("run") == {"flaky": ("done", 2)}
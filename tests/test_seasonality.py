@@ -0,0 +1,110 @@
+# tests/test_seasonality.py
+
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils import seasonality
+
+
+@pytest.fixture(autouse=True)
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(seasonality, "PROFILE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _history(years):
+    dates = pd.bdate_range("2000-01-03", periods=252 * years)
+    rng = np.random.default_rng(7)
+    closes = 100 * np.cumprod(1 + rng.normal(0.0004, 0.012, len(dates)))
+    return pd.DataFrame({"Adj Close": closes}, index=dates)
+
+
+def test_stats_match_a_full_recompute():
+    history = _history(3)
+    profile = seasonality.seasonality_profile("TEST", history)
+
+    daily = history["Adj Close"].pct_change().dropna()
+    for weekday, name in enumerate(seasonality.WEEKDAY_NAMES[:5]):
+        returns = daily[daily.index.weekday == weekday]
+        row = profile["weekday"].loc[name]
+        assert row["count"] == len(returns)
+        assert row["mean"] == pytest.approx(returns.mean())
+        assert row["std"] == pytest.approx(returns.std())
+        assert row["hit_rate"] == pytest.approx((returns > 0).mean())
+
+    month_ends = history["Adj Close"].groupby(history.index.to_period("M")).last()
+    monthly = month_ends.pct_change().dropna().iloc[:-1]
+    for month in (1, 6, 12):
+        returns = monthly[monthly.index.month == month]
+        row = profile["monthly"].loc[seasonality.MONTH_NAMES[month - 1]]
+        assert row["count"] == len(returns)
+        # Few enough returns to all fit in the sample, so the median is exact
+        assert row["median"] == pytest.approx(returns.median(), abs=1e-6)
+        assert row["std"] == pytest.approx(returns.std())
+
+
+def test_incremental_updates_match_one_batch():
+    history = _history(4)
+    seasonality.update_profile("BATCH", history)
+    for end in range(300, len(history) + 1, 137):
+        seasonality.update_profile("STEP", history.iloc[:end])
+    seasonality.update_profile("STEP", history)
+
+    batch = seasonality._load_state("BATCH")
+    step = seasonality._load_state("STEP")
+    for kind in ("monthly", "weekday"):
+        for key, bucket in batch[kind].items():
+            assert step[kind][key]["count"] == bucket["count"]
+            assert step[kind][key]["sum"] == pytest.approx(bucket["sum"])
+            assert step[kind][key]["sample"] == bucket["sample"]
+
+
+def test_profile_size_does_not_grow_with_history(profile_dir):
+    seasonality.update_profile("SHORT", _history(5))
+    seasonality.update_profile("LONG", _history(20))
+    short = os.path.getsize(profile_dir / "SHORT.json")
+    long = os.path.getsize(profile_dir / "LONG.json")
+    assert long < short * 1.5
+
+    weekday = seasonality._load_state("LONG")["weekday"]["0"]
+    assert weekday["count"] > seasonality.SAMPLE_SIZE
+    assert len(weekday["sample"]) == seasonality.SAMPLE_SIZE
+
+
+def test_old_profiles_with_raw_returns_are_rebuilt(profile_dir):
+    with open(profile_dir / "OLD.json", "w") as f:
+        json.dump({"first_date": "2000-01-03", "last_date": "2001-01-01", "monthly": {"1": [0.1]}}, f)
+    history = _history(2)
+    state = seasonality.update_profile("OLD", history)
+    assert state["version"] == seasonality.STATE_VERSION
+    assert state["weekday"]["0"]["count"] > 0
+
+
+def test_restated_history_rebuilds_the_profile():
+    history = _history(3)
+    seasonality.update_profile("SPLIT", history.iloc[:500])
+    # A 4:1 split restates every earlier adjusted close before the next update
+    restated = history.copy()
+    restated.loc[restated.index < history.index[600], "Adj Close"] /= 4
+    state = seasonality.update_profile("SPLIT", restated)
+
+    fresh = seasonality.update_profile("FRESH", restated)
+    for kind in ("monthly", "weekday"):
+        for key, stats in fresh["summary"][kind].items():
+            assert state["summary"][kind][key]["count"] == stats["count"]
+            assert state["summary"][kind][key]["mean"] == pytest.approx(stats["mean"])
+
+
+def test_universe_seasonality_builds_missing_profiles(monkeypatch):
+    history = _history(3)
+    monkeypatch.setattr(seasonality, "load_cached", lambda ticker: history if ticker == "AAA" else pd.DataFrame())
+    result = seasonality.universe_seasonality(["aaa", "BBB"], month=3)
+
+    expected = seasonality.seasonality_profile("CHECK", history)["monthly"].loc["Mar"]
+    assert result.loc["AAA", "count"] == expected["count"]
+    assert result.loc["AAA", "mean"] == pytest.approx(expected["mean"])
+    assert result.loc["BBB"].isna().all()
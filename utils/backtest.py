@@ -0,0 +1,218 @@
+# utils/backtest.py
+
+import argparse
+import datetime
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import RSI_WINDOW, price_matrix, rsi
+from utils.screener import RSI_OVERBOUGHT, RSI_OVERSOLD
+
+TRADING_DAYS = 252
+
+# Forward window a BUY/SELL call is judged over
+HORIZON = 20
+
+MODES = ("long_only", "long_short")
+
+# History behind the hit rate quoted on the About page
+TRACK_RECORD_PERIOD = "5y"
+TRACK_RECORD_TTL = 6 * 3600
+
+DEFAULT_GRID = {
+    "rsi_window": [7, 14, 21],
+    "oversold": [20, 25, 30],
+    "overbought": [70, 75, 80],
+}
+
+METRIC_COLUMNS = ["signals", "hits", "hit_rate", "buy_hit_rate", "sell_hit_rate", "total_return", "cagr",
+                  "buy_and_hold", "max_drawdown", "turnover", "exposure"]
+
+_worker_prices = None
+
+
+def _ffill(values):
+    """Forward-fill NaNs down each column; rows before a column's first value stay NaN"""
+    valid = ~np.isnan(values)
+    rows = np.maximum.accumulate(np.where(valid, np.arange(len(values))[:, None], 0), axis=0)
+    filled = np.take_along_axis(values, rows, axis=0)
+    filled[~np.maximum.accumulate(valid, axis=0)] = np.nan
+    return filled
+
+
+def signal_matrix(rsi_values, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT):
+    """+1 for BUY, -1 for SELL, 0 for HOLD (including RSI warm-up), same rule as the app"""
+    with np.errstate(invalid="ignore"):
+        return np.where(rsi_values < oversold, 1, np.where(rsi_values > overbought, -1, 0)).astype(np.int8)
+
+
+def position_matrix(signals, mode="long_only"):
+    """Position held after each bar's close: enter on BUY, leave (or go short) on SELL, HOLD keeps it"""
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}")
+    on_sell = -1.0 if mode == "long_short" else 0.0
+    state = np.where(signals == 1, 1.0, np.where(signals == -1, on_sell, np.nan))
+    return np.nan_to_num(_ffill(state), nan=0.0)
+
+
+def backtest_arrays(values, rsi_window=RSI_WINDOW, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT,
+                    mode="long_only", horizon=HORIZON, cost=0.0):
+    """Metrics per column of a dates x tickers price array, as a dict of metric -> 1-D array.
+
+    A position decided at a bar's close earns the next bar's return, so there is no lookahead.
+    Hit rate counts signal onsets only (the first bar of a BUY or SELL run): a BUY is a hit if
+    the price is higher `horizon` bars later, a SELL if it is lower.
+    """
+    filled = _ffill(values)
+    listed = ~np.isnan(filled)
+    signals = signal_matrix(rsi(values, rsi_window), oversold, overbought)
+    signals[~listed] = 0
+
+    # Signal accuracy
+    previous = np.vstack([np.zeros((1, signals.shape[1]), dtype=np.int8), signals[:-1]])
+    onset = (signals != 0) & (signals != previous)
+    forward = np.full(filled.shape, np.nan)
+    if horizon < len(filled):
+        forward[:-horizon] = filled[horizon:] / filled[:-horizon] - 1
+    judged = onset & ~np.isnan(forward)
+    hit = judged & (np.sign(forward) == signals)
+    buy, sell = judged & (signals == 1), judged & (signals == -1)
+    n_signals = judged.sum(axis=0)
+    n_hits = hit.sum(axis=0)
+
+    # Strategy returns
+    held = np.vstack([np.zeros((1, values.shape[1])), position_matrix(signals, mode)[:-1]])
+    daily = np.zeros(filled.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        daily[1:] = np.nan_to_num(filled[1:] / filled[:-1] - 1, nan=0.0, posinf=0.0, neginf=0.0)
+    trades = np.abs(np.diff(held, axis=0, prepend=0.0))
+    strategy = held * daily - cost * trades
+    equity = np.cumprod(1 + strategy, axis=0)
+    drawdown = equity / np.maximum.accumulate(equity, axis=0) - 1
+
+    bars = listed.sum(axis=0)
+    years = np.maximum(bars, 1) / TRADING_DAYS
+    first = filled[np.argmax(listed, axis=0), np.arange(values.shape[1])]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return {
+            "signals": n_signals,
+            "hits": n_hits,
+            "hit_rate": np.where(n_signals > 0, n_hits / n_signals, np.nan),
+            "buy_hit_rate": (hit & buy).sum(axis=0) / buy.sum(axis=0),
+            "sell_hit_rate": (hit & sell).sum(axis=0) / sell.sum(axis=0),
+            "total_return": equity[-1] - 1,
+            "cagr": equity[-1] ** (1 / years) - 1,
+            "buy_and_hold": filled[-1] / first - 1,
+            "max_drawdown": drawdown.min(axis=0),
+            "turnover": trades.sum(axis=0) / years,
+            "exposure": (held != 0).sum(axis=0) / np.maximum(bars, 1),
+        }
+
+
+def run_backtest(prices, rsi_window=RSI_WINDOW, oversold=RSI_OVERSOLD, overbought=RSI_OVERBOUGHT,
+                 mode="long_only", horizon=HORIZON, cost=0.0):
+    """Replay the RSI rule over a dates x tickers price matrix; one row of metrics per ticker.
+
+    cost is charged per unit of position change (0.001 = 10 bps per side).
+    """
+    metrics = backtest_arrays(prices.to_numpy(dtype=float), rsi_window, oversold, overbought, mode, horizon, cost)
+    return pd.DataFrame(metrics, index=prices.columns)[METRIC_COLUMNS]
+
+
+def summarize(results):
+    """One row of metrics for a whole universe: hit rate pooled over every signal, the rest averaged"""
+    summary = results.drop(columns=["signals", "hits"]).mean()
+    summary["signals"] = int(results["signals"].sum())
+    summary["hit_rate"] = results["hits"].sum() / summary["signals"] if summary["signals"] else np.nan
+    return summary
+
+
+def signal_track_record(universe="Popular", period=TRACK_RECORD_PERIOD):
+    """Pooled hit rate of the RSI signal over a universe, with the dates and signal count behind it.
+
+    Cached for the day in the shared result cache; returns None when there is no price data.
+    """
+    from utils.price_store import load_many
+    from utils.result_cache import shared_cache
+    from utils.screener import load_universe
+
+    def compute():
+        prices = price_matrix(load_many(load_universe(universe), period))
+        if prices.empty:
+            return None
+        summary = summarize(run_backtest(prices))
+        return {
+            "universe": universe,
+            "tickers": prices.shape[1],
+            "start": str(prices.index[0].date()),
+            "end": str(prices.index[-1].date()),
+            "signals": int(summary["signals"]),
+            "hit_rate": float(summary["hit_rate"]),
+        }
+
+    key = ("track_record", universe, period, datetime.date.today())
+    return shared_cache.get_or_compute(key, compute, ttl=TRACK_RECORD_TTL)
+
+
+def _init_worker(prices):
+    global _worker_prices
+    _worker_prices = prices
+
+
+def _run_params(params):
+    return {**params, **summarize(run_backtest(_worker_prices, **params)).to_dict()}
+
+
+def sweep(prices, grid=None, workers=None, **fixed):
+    """Backtest every combination in grid (param -> values) in parallel; one summary row per combination.
+
+    The price matrix is shipped to each worker once, not once per combination.
+    """
+    grid = grid or DEFAULT_GRID
+    combos = [{**fixed, **dict(zip(grid, values))} for values in itertools.product(*grid.values())]
+    workers = min(workers or os.cpu_count() or 1, len(combos))
+    if workers <= 1:
+        _init_worker(prices)
+        rows = [_run_params(params) for params in combos]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(prices,)) as pool:
+            rows = list(pool.map(_run_params, combos))
+    results = pd.DataFrame(rows).astype({"signals": int})
+    return results.sort_values("total_return", ascending=False, ignore_index=True)
+
+
+def main():
+    from utils.price_store import load_many
+    from utils.screener import load_universe
+
+    parser = argparse.ArgumentParser(description="Backtest the RSI BUY/SELL/HOLD signal")
+    parser.add_argument("--universe", default="Popular", help='"Popular", "S&P 500" or a file of tickers')
+    parser.add_argument("--period", default="10y")
+    parser.add_argument("--mode", choices=MODES, default="long_only")
+    parser.add_argument("--horizon", type=int, default=HORIZON)
+    parser.add_argument("--cost", type=float, default=0.0)
+    parser.add_argument("--sweep", action="store_true", help="Sweep RSI window and thresholds")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    prices = price_matrix(load_many(load_universe(args.universe), args.period))
+    if prices.empty:
+        raise SystemExit("No price data")
+    settings = dict(mode=args.mode, horizon=args.horizon, cost=args.cost)
+    with pd.option_context("display.width", 200, "display.max_columns", 20, "display.float_format", "{:.3f}".format):
+        if args.sweep:
+            print(sweep(prices, workers=args.workers, **settings).to_string())
+        else:
+            results = run_backtest(prices, **settings)
+            print(results.to_string())
+            print()
+            print(summarize(results).to_string())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# utils/chart_data.py
+
+import numpy as np
+
+# Roughly two points per horizontal pixel of a wide chart; more is invisible
+DEFAULT_POINTS = 1500
+
+# Above this many points per trace, render with WebGL instead of SVG
+WEBGL_THRESHOLD = 1000
+
+
+def lttb_indices(y, n_out, x=None):
+    """Largest-Triangle-Three-Buckets: indices of n_out points that preserve the series' shape.
+
+    NaNs (e.g. indicator warm-up) are skipped. The first and last valid points are always kept.
+    """
+    valid = np.flatnonzero(~np.isnan(y))
+    if len(valid) <= n_out or n_out < 3:
+        return valid
+    xs = valid.astype(float) if x is None else np.asarray(x, dtype=float)[valid]
+    ys = y[valid]
+
+    # Bucket boundaries over the interior points
+    edges = np.linspace(1, len(valid) - 1, n_out - 1).astype(int)
+    picked = np.empty(n_out, dtype=int)
+    picked[0] = 0
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = edges[i + 1], edges[i + 2] if i + 2 < len(edges) else len(valid)
+        # Average of the next bucket is the third triangle vertex
+        avg_x = xs[next_start:next_end].mean()
+        avg_y = ys[next_start:next_end].mean()
+        area = np.abs(
+            (xs[prev] - avg_x) * (ys[start:end] - ys[prev])
+            - (xs[prev] - xs[start:end]) * (avg_y - ys[prev])
+        )
+        prev = start + int(np.argmax(area))
+        picked[i + 1] = prev
+    picked[-1] = len(valid) - 1
+    return valid[picked]
+
+
+def downsample(frame, columns, n_out=DEFAULT_POINTS):
+    """Rows of frame to plot so every column keeps its shape within a shared point budget.
+
+    Each column gets an equal share of n_out; the union of their picks becomes one shared
+    x-axis so overlaid traces line up exactly.
+    """
+    if len(frame) <= n_out:
+        return frame
+    per_series = max(3, n_out // len(columns))
+    keep = np.unique(np.concatenate([
+        lttb_indices(frame[c].to_numpy(dtype=float), per_series) for c in columns
+    ]))
+    return frame.iloc[keep]
+
+
+def chart_frame(data, columns, n_out=DEFAULT_POINTS):
+    """Downsampled columns plus one x payload (ISO dates) shared by every trace"""
+    sampled = downsample(data, columns, n_out)
+    x = sampled.index.strftime("%Y-%m-%d").to_numpy()
+    return x, sampled
+
+
+def line_trace(x, y, name, color, **kwargs):
+    """Scatter line, switching to WebGL (Scattergl) for long series"""
+    import plotly.graph_objects as go
+
+    trace_type = go.Scattergl if len(x) > WEBGL_THRESHOLD else go.Scatter
+    return trace_type(x=x, y=y, name=name, mode="lines", line=dict(color=color), **kwargs)
@@ -1,17 +1,178 @@
+import os
+import queue
 import smtplib
+import ssl
+import threading
+import time
 from email.message import EmailMessage
 
-def send_report_via_email(sender_email, app_password, recipient_email, attachment_path):
+SMTP_HOST = os.environ.get("MARKETPULSE_SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.environ.get("MARKETPULSE_SMTP_PORT", "465"))
+SMTP_SSL = os.environ.get("MARKETPULSE_SMTP_SSL", "1") == "1"
+# Without implicit SSL, upgrade with STARTTLS before logging in; only turn off for local test servers
+SMTP_STARTTLS = os.environ.get("MARKETPULSE_SMTP_STARTTLS", "1") == "1"
+
+# Reconnect after this many messages; providers cap messages per session
+MESSAGES_PER_CONNECTION = 90
+
+SUBJECT = "Your MarketPulse Report"
+BODY = "Attached is your MarketPulse stock analysis report."
+
+
+def build_message(sender_email, recipient_email, attachment, filename="MarketPulse_Report.pdf"):
     msg = EmailMessage()
-    msg["Subject"] = "Your MarketPulse Report"
+    msg["Subject"] = SUBJECT
     msg["From"] = sender_email
     msg["To"] = recipient_email
-    msg.set_content("Attached is your MarketPulse stock analysis report.")
+    msg.set_content(BODY)
+    msg.add_attachment(attachment, maintype="application", subtype="pdf", filename=filename)
+    return msg
 
-    with open(attachment_path, "rb") as f:
-        file_data = f.read()
-        msg.add_attachment(file_data, maintype="application", subtype="pdf", filename="MarketPulse_Report.pdf")
 
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465) as smtp:
+def connect(sender_email, app_password, host=SMTP_HOST, port=SMTP_PORT, use_ssl=SMTP_SSL,
+            starttls=SMTP_STARTTLS, timeout=30):
+    """Open an SMTP connection, logging in when a password is given.
+
+    Plain connections are upgraded with STARTTLS before anything is sent unless starttls
+    is off; a server that doesn't offer it raises SMTPNotSupportedError.
+    """
+    if use_ssl:
+        smtp = smtplib.SMTP_SSL(host, port, timeout=timeout, context=ssl.create_default_context())
+    else:
+        smtp = smtplib.SMTP(host, port, timeout=timeout)
+        if starttls:
+            try:
+                smtp.ehlo()
+                smtp.starttls(context=ssl.create_default_context())
+                smtp.ehlo()
+            except (smtplib.SMTPException, OSError):
+                _close(smtp)
+                raise
+    if app_password:
         smtp.login(sender_email, app_password)
+    return smtp
+
+
+def send_report_via_email(sender_email, app_password, recipient_email, attachment_path,
+                          host=SMTP_HOST, port=SMTP_PORT, use_ssl=SMTP_SSL, starttls=SMTP_STARTTLS):
+    with open(attachment_path, "rb") as f:
+        msg = build_message(sender_email, recipient_email, f.read())
+
+    with connect(sender_email, app_password, host, port, use_ssl, starttls) as smtp:
         smtp.send_message(msg)
+
+
+def _close(smtp):
+    try:
+        smtp.quit()
+    except (smtplib.SMTPException, OSError):
+        pass
+
+
+def _retryable(error):
+    """Dropped connections and 4xx replies are worth retrying; bad credentials and 5xx rejections aren't"""
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+
+def send_reports_bulk(deliveries, sender_email, app_password, host=SMTP_HOST, port=SMTP_PORT,
+                      use_ssl=SMTP_SSL, starttls=SMTP_STARTTLS, workers=4, retries=3, backoff=1.0):
+    """Send many report emails over a few long-lived authenticated connections.
+
+    deliveries is a list of (recipient_email, attachment_path). Each of the `workers`
+    threads holds one connection (so workers is the concurrency limit) and reconnects
+    after MESSAGES_PER_CONNECTION messages or a dropped connection. Dropped connections
+    and 4xx replies are retried with exponential backoff; refused recipients and other 5xx
+    rejections fail at once, and a login failure fails every remaining delivery.
+    Attachments are read as each message is built, so only in-flight ones are in memory.
+    Returns a report with sent/failed counts, failures, timing and throughput.
+    """
+    started = time.monotonic()
+    jobs = queue.Queue()
+    for delivery in deliveries:
+        jobs.put(delivery)
+
+    lock = threading.Lock()
+    report = {"sent": 0, "failed": [], "retries": 0, "connections": 0}
+    login_failed = threading.Event()
+
+    def fail(recipient, error):
+        with lock:
+            report["failed"].append({"recipient": recipient, "error": str(error)})
+
+    def send(smtp, sent_on_connection, recipient, path):
+        """Deliver one message; returns the connection to reuse (None once dropped) and its message count"""
+        with open(path, "rb") as f:
+            msg = build_message(sender_email, recipient, f.read())
+        for attempt in range(retries + 1):
+            try:
+                if smtp is None or sent_on_connection >= MESSAGES_PER_CONNECTION:
+                    if smtp is not None:
+                        _close(smtp)
+                        smtp = None
+                    smtp = connect(sender_email, app_password, host, port, use_ssl, starttls)
+                    sent_on_connection = 0
+                    with lock:
+                        report["connections"] += 1
+                smtp.send_message(msg)
+                with lock:
+                    report["sent"] += 1
+                return smtp, sent_on_connection + 1
+            except smtplib.SMTPRecipientsRefused as e:
+                fail(recipient, e)
+                return smtp, sent_on_connection
+            except (smtplib.SMTPException, OSError) as e:
+                # Drop the connection; a retry starts a fresh one
+                if smtp is not None:
+                    _close(smtp)
+                smtp = None
+                if isinstance(e, smtplib.SMTPAuthenticationError):
+                    login_failed.set()
+                if not _retryable(e) or attempt == retries:
+                    fail(recipient, e)
+                    return None, 0
+                with lock:
+                    report["retries"] += 1
+                time.sleep(backoff * 2 ** attempt)
+
+    def worker():
+        smtp = None
+        sent_on_connection = 0
+        while not login_failed.is_set():
+            try:
+                recipient, path = jobs.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                smtp, sent_on_connection = send(smtp, sent_on_connection, recipient, path)
+            except Exception as e:
+                # Anything unexpected fails this delivery, not the rest of the queue
+                fail(recipient, e)
+                if smtp is not None:
+                    _close(smtp)
+                smtp = None
+        if smtp is not None:
+            _close(smtp)
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, min(workers, len(deliveries))))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Whatever is still queued (after a login failure, or if a worker died) is reported, not dropped
+    reason = "Not sent: SMTP login failed" if login_failed.is_set() else "Not sent: worker stopped"
+    while True:
+        try:
+            recipient, _ = jobs.get_nowait()
+        except queue.Empty:
+            break
+        fail(recipient, reason)
+
+    elapsed = time.monotonic() - started
+    report["seconds"] = round(elapsed, 3)
+    report["per_second"] = round(report["sent"] / elapsed, 1) if elapsed > 0 else 0.0
+    return report
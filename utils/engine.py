@@ -0,0 +1,178 @@
+# utils/engine.py
+
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from utils import metrics
+from utils.indicators import evaluate
+from utils.news_ingest import gather_headlines
+from utils.price_store import load_many, load_prices
+from utils.result_cache import shared_cache
+from utils.screener import recommendation
+from utils.sentiment_scorer import score_headlines
+
+# How long shared results stay fresh for every session in this process
+PRICE_TTL = 300
+SENTIMENT_TTL = 900
+
+# What the Analysis charts and PDF report draw; anything else is computed on request
+ANALYSIS_INDICATORS = ("RSI", "SMA_20", "SMA_50")
+
+
+def get_headlines(ticker):
+    """Get headlines from Yahoo Finance (and Reddit when configured) within the news deadline"""
+    return gather_headlines(ticker)["headlines"]
+
+
+def analyze_sentiment(headlines):
+    """Analyze sentiment of headlines"""
+    results = []
+
+    for headline, compound in zip(headlines, score_headlines(headlines)):
+        if compound >= 0.05:
+            label = "Positive"
+        elif compound <= -0.05:
+            label = "Negative"
+        else:
+            label = "Neutral"
+
+        results.append({
+            'headline': headline,
+            'score': compound,
+            'label': label
+        })
+
+    return results
+
+
+def summarize_sentiment(results):
+    """Summarize overall sentiment"""
+    if not results:
+        return 0, "Neutral"
+
+    avg_score = sum(r['score'] for r in results) / len(results)
+
+    if avg_score >= 0.05:
+        label = "Positive"
+    elif avg_score <= -0.05:
+        label = "Negative"
+    else:
+        label = "Neutral"
+
+    return avg_score, label
+
+
+def calculate_technical_indicators(data, indicators=ANALYSIS_INDICATORS):
+    """Add the requested indicator columns (see utils.indicators) to an OHLCV frame"""
+    sources = {"price": data[['Adj Close']]}
+    if {"High", "Low", "Close"} <= set(data.columns):
+        sources.update(high=data[['High']], low=data[['Low']], close=data[['Close']])
+    with metrics.timer("stage_seconds", stage="indicators"):
+        values = evaluate(indicators, **sources)
+    for name, column in values.items():
+        data[name] = column[:, 0]
+
+    return data
+
+
+def get_prices(ticker, period):
+    """Load prices once per process for all sessions asking for the same ticker and period"""
+    return shared_cache.get_or_compute(("prices", ticker, period), lambda: load_prices(ticker, period), ttl=PRICE_TTL)
+
+
+def get_analysis_data(ticker, period, indicators=ANALYSIS_INDICATORS):
+    """Prices with indicators, shared across sessions until the prices they came from change"""
+    prices = get_prices(ticker, period)
+    if prices.empty:
+        return prices
+    as_of = prices.index[-1]
+    # Today's bar keeps moving until the close, so its values are part of the key, not just its date
+    last_bar = prices.iloc[-1].to_numpy(dtype=float).tobytes()
+    indicators = tuple(indicators)
+    return shared_cache.get_or_compute(
+        ("indicators", ticker, period, indicators, as_of, last_bar),
+        lambda: calculate_technical_indicators(prices.copy(), indicators), ttl=PRICE_TTL
+    )
+
+
+def get_headline_sentiment(ticker, as_of):
+    """Headlines and their sentiment, shared across sessions for a few minutes"""
+    def compute():
+        headlines = get_headlines(ticker)
+        return headlines, analyze_sentiment(headlines) if headlines else []
+    return shared_cache.get_or_compute(("sentiment", ticker, as_of), compute, ttl=SENTIMENT_TTL)
+
+
+@metrics.timed("stage_seconds", stage="analyze_ticker")
+def analyze_ticker(ticker, period="1y", with_sentiment=True, indicators=ANALYSIS_INDICATORS):
+    """Run fetch, indicators, sentiment and recommendation for one ticker.
+
+    Returns None when there is no price data, otherwise a dict with the latest metrics,
+    the indicator frame under "data" and the scored headlines under "headlines".
+    indicators are the columns added to "data"; RSI is always included.
+    """
+    ticker = ticker.upper()
+    data = get_analysis_data(ticker, period, dict.fromkeys(("RSI", *indicators)))
+    if data.empty:
+        return None
+
+    current_rsi = data['RSI'].iloc[-1] if not pd.isna(data['RSI'].iloc[-1]) else 50
+    result = {
+        "ticker": ticker,
+        "period": period,
+        "as_of": str(data.index[-1].date()),
+        "price": float(data['Adj Close'].iloc[-1]),
+        "change_pct": float(data['Adj Close'].pct_change().iloc[-1] * 100),
+        "rsi": float(current_rsi),
+        "rsi_status": "Oversold" if current_rsi < 30 else "Overbought" if current_rsi > 70 else "Normal",
+        "volume": float(data['Volume'].iloc[-1]) if 'Volume' in data.columns else 0.0,
+        "recommendation": recommendation(current_rsi),
+        "sentiment": "N/A",
+        "sentiment_score": None,
+        "articles": 0,
+        "headlines": [],
+        "data": data,
+    }
+
+    if with_sentiment:
+        headlines, results = get_headline_sentiment(ticker, data.index[-1])
+        if headlines:
+            avg_sentiment, sentiment_label = summarize_sentiment(results)
+            result.update(sentiment=sentiment_label, sentiment_score=float(avg_sentiment),
+                          articles=len(headlines), headlines=results)
+    return result
+
+
+def to_record(result):
+    """Flat JSON-safe view of an analyze_ticker result (no price frame)"""
+    record = {k: v for k, v in result.items() if k != "data"}
+    for key, value in record.items():
+        if isinstance(value, float) and math.isnan(value):
+            record[key] = None
+    return record
+
+
+def analyze_watchlist(tickers, period="1y", with_sentiment=True, workers=8):
+    """Analyze every ticker concurrently and return one record per ticker.
+
+    Prices for the whole list are loaded with one bulk request first so the per-ticker
+    workers only hit the local store. Failures are reported in the record's "error" field.
+    """
+    tickers = list(dict.fromkeys(t.strip().upper() for t in tickers if t.strip()))
+    load_many(tickers, period)
+
+    def run(ticker):
+        started = time.monotonic()
+        try:
+            result = analyze_ticker(ticker, period, with_sentiment)
+            record = to_record(result) if result else {"ticker": ticker, "error": "No data found"}
+        except Exception as e:
+            record = {"ticker": ticker, "error": str(e)}
+        record["seconds"] = round(time.monotonic() - started, 3)
+        return record
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run, tickers))
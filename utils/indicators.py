@@ -0,0 +1,305 @@
+# utils/indicators.py
+
+import functools
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils import metrics
+
+SMA_WINDOWS = (20, 50, 200)
+RSI_WINDOW = 14
+BB_WINDOW = 20
+BB_WIDTH = 2
+MACD_FAST, MACD_SLOW, MACD_SIGNAL = 12, 26, 9
+ATR_WINDOW = 14
+
+
+def price_matrix(frames, column="Adj Close"):
+    """Align per-ticker OHLCV frames into one dates x tickers price matrix"""
+    columns = {ticker: frame[column] for ticker, frame in frames.items() if not frame.empty}
+    if not columns:
+        return pd.DataFrame()
+    return pd.DataFrame(columns).sort_index()
+
+
+def _listed_and_filled(values):
+    """Forward-fill gaps after each column's first valid price; leave pre-listing rows NaN"""
+    valid = ~np.isnan(values)
+    listed = np.maximum.accumulate(valid, axis=0)
+    rows = np.where(valid, np.arange(len(values))[:, None], 0)
+    rows = np.maximum.accumulate(rows, axis=0)
+    filled = np.take_along_axis(values, rows, axis=0)
+    filled[~listed] = np.nan
+    return filled, listed
+
+
+def _prefix_sums(values):
+    """Cumulative sums, valid counts and nonzero counts down axis 0, each with a leading zero row"""
+    valid = ~np.isnan(values)
+    zeroed = np.where(valid, values, 0.0)
+    zeros = np.zeros((1, values.shape[1]))
+    return (
+        np.vstack([zeros, np.cumsum(zeroed, axis=0)]),
+        np.vstack([zeros.astype(np.int64), np.cumsum(valid, axis=0)]),
+        np.vstack([zeros.astype(np.int64), np.cumsum(zeroed != 0, axis=0)]),
+    )
+
+
+def _window_sums(prefix, window):
+    """Rolling sums of `window` rows from _prefix_sums output, NaN unless the whole window is valid.
+
+    Windows that contain only zeros come out as exactly 0 so ratios like RSI's
+    gain/loss hit the same 0 and inf cases as pandas instead of cumsum residue.
+    """
+    sums, counts, nonzero = prefix
+    out = np.full((sums.shape[0] - 1, sums.shape[1]), np.nan)
+    if window > len(out):
+        return out
+    window_sum = sums[window:] - sums[:-window]
+    window_sum[(nonzero[window:] - nonzero[:-window]) == 0] = 0.0
+    window_sum[(counts[window:] - counts[:-window]) < window] = np.nan
+    out[window - 1:] = window_sum
+    return out
+
+
+def _rolling_sum(values, window):
+    """Rolling sum down axis 0, NaN unless the whole window is valid"""
+    return _window_sums(_prefix_sums(values), window)
+
+
+def rolling_mean(values, window):
+    """Simple moving average of every column, matching pandas rolling(window).mean()"""
+    return _rolling_sum(values, window) / window
+
+
+def ewm_mean(values, alpha):
+    """Exponential moving average of every column, like pandas ewm(alpha=alpha, adjust=False).mean()"""
+    return pd.DataFrame(values).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+
+
+def rsi(values, window=RSI_WINDOW):
+    """RSI of every column using the same simple-average gain/loss rule as the Analysis tab"""
+    name = f"RSI_{window}"
+    return evaluate([name], price=values)[name]
+
+
+@metrics.timed("stage_seconds", stage="indicators")
+def compute_indicators(prices, sma_windows=SMA_WINDOWS, rsi_window=RSI_WINDOW):
+    """Compute RSI and SMAs for a dates x tickers price matrix; the SMAs share one set of prefix sums.
+
+    Tickers may start on different dates: rows before a ticker's first price stay NaN and
+    each column behaves as if it had been computed on its own history.
+    Returns a dict of indicator name -> DataFrame shaped like prices.
+    """
+    names = {"RSI": f"RSI_{rsi_window}", **{f"SMA_{w}": f"SMA_{w}" for w in sma_windows}}
+    values = evaluate(names.values(), price=prices.to_numpy(dtype=float))
+    return {
+        name: pd.DataFrame(values[node], index=prices.index, columns=prices.columns)
+        for name, node in names.items()
+    }
+
+
+# --- indicator graph ------------------------------------------------------------------
+#
+# Every indicator and intermediate is a node that declares the nodes it reads. evaluate()
+# walks the graph from the requested names, so each node runs at most once per call and
+# only what was asked for (and what it needs) is computed. Sources are the raw price arrays.
+
+SOURCES = ("price", "close", "high", "low")
+
+_REGISTRY = []
+
+
+def indicator(pattern, *inputs):
+    """Register the decorated function as the node for names matching pattern.
+
+    pattern and inputs may hold integer parameters such as "SMA_{window}"; the function
+    gets the input arrays positionally and the parameters as keyword arguments.
+    """
+    parts = re.split(r"\{(\w+)\}", pattern)
+    regex = re.compile("".join(
+        re.escape(part) if i % 2 == 0 else f"(?P<{part}>\\d+)" for i, part in enumerate(parts)
+    ) + "$")
+
+    def register(fn):
+        _REGISTRY.append((regex, inputs, fn))
+        return fn
+    return register
+
+
+def _node(name):
+    for regex, inputs, fn in _REGISTRY:
+        match = regex.match(name)
+        if match:
+            params = {key: int(value) for key, value in match.groupdict().items()}
+            return [source.format(**params) for source in inputs], functools.partial(fn, **params)
+    raise KeyError(f"Unknown indicator: {name}")
+
+
+def resolve(names, sources=SOURCES):
+    """Nodes needed for names in evaluation order, as (name, inputs, fn); each appears once"""
+    order, done = [], set(sources)
+
+    def visit(name, path):
+        if name in done:
+            return
+        if name in SOURCES:
+            raise KeyError(f"{path[0]} needs {name!r} prices")
+        if name in path:
+            raise ValueError(f"Indicator cycle: {' -> '.join(path + (name,))}")
+        inputs, fn = _node(name)
+        for source in inputs:
+            visit(source, path + (name,))
+        done.add(name)
+        order.append((name, inputs, fn))
+
+    for name in names:
+        visit(name, ())
+    return order
+
+
+def evaluate(names, **sources):
+    """Compute the named indicators from dates x tickers source arrays (price, close, high, low).
+
+    price is the adjusted close most indicators read; close, high and low are only needed
+    by range-based indicators such as ATR. Returns a dict of name -> array.
+    """
+    names = list(names)
+    values = {key: np.asarray(value, dtype=float) for key, value in sources.items() if value is not None}
+    order = resolve(names, values)
+    for name, inputs, fn in order:
+        values[name] = fn(*(values[source] for source in inputs))
+    metrics.incr("indicator_nodes", len(order))
+    return {name: values[name] for name in names}
+
+
+@indicator("listed", "price")
+def _listed(price):
+    return np.maximum.accumulate(~np.isnan(price), axis=0)
+
+
+@indicator("filled", "price")
+def _filled(price):
+    return _listed_and_filled(price)[0]
+
+
+@indicator("delta", "filled", "listed")
+def _delta(filled, listed):
+    delta = np.full(filled.shape, np.nan)
+    delta[1:] = filled[1:] - filled[:-1]
+    # pandas treats the first diff of a series as no move, so do the same at each listing date
+    return np.where(listed & np.isnan(delta), 0.0, delta)
+
+
+@indicator("gain", "delta", "listed")
+def _gain(delta, listed):
+    return np.where(listed, np.where(delta > 0, delta, 0.0), np.nan)
+
+
+@indicator("loss", "delta", "listed")
+def _loss(delta, listed):
+    return np.where(listed, np.where(delta < 0, -delta, 0.0), np.nan)
+
+
+@indicator("avg_gain_{window}", "gain")
+def _avg_gain(gain, window):
+    return rolling_mean(gain, window)
+
+
+@indicator("avg_loss_{window}", "loss")
+def _avg_loss(loss, window):
+    return rolling_mean(loss, window)
+
+
+@indicator("RSI_{window}", "avg_gain_{window}", "avg_loss_{window}")
+def _rsi(avg_gain, avg_loss, window):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+@indicator("RSI", f"RSI_{RSI_WINDOW}")
+def _rsi_default(values):
+    return values
+
+
+@indicator("price_sums", "filled")
+def _price_sums(filled):
+    return _prefix_sums(filled)
+
+
+@indicator("price_square_sums", "filled")
+def _price_square_sums(filled):
+    return _prefix_sums(filled ** 2)
+
+
+@indicator("SMA_{window}", "price_sums")
+def _sma(sums, window):
+    return _window_sums(sums, window) / window
+
+
+@indicator("STD_{window}", "price_square_sums", "SMA_{window}")
+def _std(square_sums, mean, window):
+    """Rolling sample standard deviation, like pandas rolling(window).std()"""
+    if window < 2:
+        return np.full(mean.shape, np.nan)
+    variance = (_window_sums(square_sums, window) - window * mean ** 2) / (window - 1)
+    return np.sqrt(np.maximum(variance, 0.0))
+
+
+@indicator("BB_UPPER_{window}", "SMA_{window}", "STD_{window}")
+def _bb_upper(mean, std, window):
+    return mean + BB_WIDTH * std
+
+
+@indicator("BB_LOWER_{window}", "SMA_{window}", "STD_{window}")
+def _bb_lower(mean, std, window):
+    return mean - BB_WIDTH * std
+
+
+@indicator("EMA_{span}", "filled")
+def _ema(filled, span):
+    return ewm_mean(filled, 2 / (span + 1))
+
+
+@indicator("MACD", f"EMA_{MACD_FAST}", f"EMA_{MACD_SLOW}")
+def _macd(fast, slow):
+    return fast - slow
+
+
+@indicator("MACD_SIGNAL", "MACD")
+def _macd_signal(macd):
+    return ewm_mean(macd, 2 / (MACD_SIGNAL + 1))
+
+
+@indicator("MACD_HIST", "MACD", "MACD_SIGNAL")
+def _macd_hist(macd, signal):
+    return macd - signal
+
+
+@indicator("TR", "high", "low", "close")
+def _true_range(high, low, close):
+    """Largest of the bar's range and its gaps from the previous close"""
+    previous = np.full(close.shape, np.nan)
+    previous[1:] = close[:-1]
+    return np.fmax(high - low, np.fmax(np.abs(high - previous), np.abs(low - previous)))
+
+
+@indicator("ATR_{window}", "TR")
+def _atr(true_range, window):
+    # Wilder's smoothing
+    return ewm_mean(true_range, 1 / window)
+
+
+@indicator("ATR", f"ATR_{ATR_WINDOW}")
+def _atr_default(values):
+    return values
+
+
+def latest_values(prices, indicators):
+    """Last price and indicator values per ticker as a tickers x fields table"""
+    latest = pd.DataFrame({"price": prices.ffill().iloc[-1]})
+    for name, frame in indicators.items():
+        latest[name] = frame.iloc[-1]
+    return latest
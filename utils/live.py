@@ -0,0 +1,182 @@
+# utils/live.py
+
+import math
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils import metrics
+from utils.price_store import download_intraday
+from utils.streaming import StreamingIndicators
+
+# One regular session of minute bars; older bars fall out of the ring buffer
+WINDOW = 390
+POLL_SECONDS = 5
+# Stop polling (and free) a symbol nobody has asked about for this long
+IDLE_SECONDS = 600
+
+LIVE_SMA_WINDOWS = (20,)
+
+
+class LiveSeries:
+    """The last WINDOW minute bars of one symbol in fixed-size ring buffers, with streaming indicators.
+
+    Only bars newer than the last one seen are folded in. The newest bar of each poll may still
+    be forming, so it is held as `pending` and only folded in once a later bar arrives.
+    """
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self.count = 0
+        self.times = np.empty(window, dtype="datetime64[ns]")
+        self.closes = np.full(window, np.nan)
+        self.rsi = np.full(window, np.nan)
+        self.sma = np.full(window, np.nan)
+        self.indicators = StreamingIndicators(sma_windows=LIVE_SMA_WINDOWS)
+        self.last_time = None
+        self.pending = None
+
+    def _append(self, when, price):
+        slot = self.count % self.window
+        values = self.indicators.update(price)
+        self.times[slot] = when
+        self.closes[slot] = price
+        self.rsi[slot] = values["RSI"]
+        self.sma[slot] = values[f"SMA_{LIVE_SMA_WINDOWS[0]}"]
+        self.count += 1
+        self.last_time = when
+
+    def ingest(self, bars):
+        """Fold new closed bars from an intraday frame; returns how many were added"""
+        if "Close" not in bars.columns or bars.empty:
+            return 0
+        closes = bars["Close"].to_numpy(dtype=float)
+        times = bars.index.to_numpy(dtype="datetime64[ns]")
+        keep = ~np.isnan(closes)
+        if self.last_time is not None:
+            keep &= times > self.last_time
+        closes, times = closes[keep], times[keep]
+        if not len(closes):
+            return 0
+        for when, price in zip(times[:-1], closes[:-1].tolist()):
+            self._append(when, price)
+        self.pending = (times[-1], closes[-1])
+        return len(closes) - 1
+
+    def frame(self):
+        """Buffered bars oldest first, plus the pending bar, as Close/RSI/SMA_20 columns"""
+        n = min(self.count, self.window)
+        order = (np.arange(n) + self.count - n) % self.window
+        frame = pd.DataFrame({
+            "Close": self.closes[order],
+            "RSI": self.rsi[order],
+            f"SMA_{LIVE_SMA_WINDOWS[0]}": self.sma[order],
+        }, index=pd.DatetimeIndex(self.times[order]))
+        if self.pending is not None and (self.last_time is None or self.pending[0] > self.last_time):
+            frame.loc[pd.Timestamp(self.pending[0]), "Close"] = self.pending[1]
+        return frame
+
+    def latest(self, frame=None):
+        """Last price, its bar time, change over the window and the latest indicator values"""
+        frame = self.frame() if frame is None else frame
+        if frame.empty:
+            return None
+        first = frame["Close"].iloc[0]
+        price = frame["Close"].iloc[-1]
+        values = self.indicators.values()
+        return {
+            "time": frame.index[-1],
+            "price": price,
+            "change_pct": (price / first - 1) * 100 if first else math.nan,
+            "rsi": values["RSI"],
+            "sma": values[f"SMA_{LIVE_SMA_WINDOWS[0]}"],
+        }
+
+    def snapshot(self):
+        """(bars, latest) copied out of the buffers, safe to read after the series moves on"""
+        frame = self.frame()
+        return frame, self.latest(frame)
+
+
+class LiveHub:
+    """Minute-bar series shared by every session in the process.
+
+    A symbol is polled at most once per poll_seconds however many sessions watch it, and all
+    due symbols share one bulk request. Symbols nobody has asked about for idle_seconds are
+    dropped, so memory is bounded by the symbols in use times the ring-buffer window.
+    """
+
+    def __init__(self, window=WINDOW, poll_seconds=POLL_SECONDS, idle_seconds=IDLE_SECONDS):
+        self.window = window
+        self.poll_seconds = poll_seconds
+        self.idle_seconds = idle_seconds
+        self._series = {}
+        self._polled = {}
+        self._seen = {}
+        self._inflight = set()
+        self._lock = threading.Lock()
+
+    def poll(self, tickers):
+        """Bring the given symbols up to date if due and return ticker -> (bars, latest).
+
+        The download runs outside the hub's lock, and symbols another session is already
+        fetching are skipped, so a slow request never holds up other sessions' fragments.
+        Snapshots are taken under the lock, so another session's poll can't tear them.
+        """
+        tickers = list(dict.fromkeys(t.upper() for t in tickers if t))
+        now = time.monotonic()
+        with self._lock:
+            for ticker in tickers:
+                self._seen[ticker] = now
+            self._evict(now)
+            due = [t for t in tickers
+                   if t not in self._inflight and now - self._polled.get(t, -math.inf) >= self.poll_seconds]
+            self._inflight.update(due)
+            # Symbols with history only need bars from their last folded one onward
+            since = {t: self._series[t].last_time if t in self._series else None for t in due}
+        try:
+            bars = self._fetch(since) if due else {}
+        finally:
+            with self._lock:
+                self._inflight.difference_update(due)
+                for ticker in due:
+                    self._polled[ticker] = now
+                    if ticker in bars and ticker in self._seen:
+                        series = self._series.get(ticker)
+                        if series is None:
+                            series = self._series[ticker] = LiveSeries(self.window)
+                        metrics.incr("live_bars", series.ingest(bars[ticker]))
+        with self._lock:
+            return {t: self._series[t].snapshot() for t in tickers if t in self._series}
+
+    def _fetch(self, since):
+        """ticker -> new bars, one bulk request per distinct start (usually one for all of them)"""
+        groups = {}
+        for ticker, last_time in since.items():
+            groups.setdefault(last_time, []).append(ticker)
+        bars = {}
+        for last_time, tickers in groups.items():
+            try:
+                with metrics.timer("stage_seconds", stage="live_poll"):
+                    start = None if last_time is None else pd.Timestamp(last_time)
+                    frames = download_intraday(tickers, start=start)
+            except Exception:
+                metrics.incr("live_poll_errors")
+                continue
+            bars.update({t: frames.get(t, pd.DataFrame()) for t in tickers})
+        return bars
+
+    def _evict(self, now):
+        for ticker in [t for t, seen in self._seen.items() if now - seen > self.idle_seconds]:
+            self._seen.pop(ticker, None)
+            self._polled.pop(ticker, None)
+            self._series.pop(ticker, None)
+
+    def symbols(self):
+        with self._lock:
+            return sorted(self._series)
+
+
+hub = LiveHub()
@@ -0,0 +1,239 @@
+# utils/metrics.py
+
+import functools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Off unless asked for; every call below returns straight away when disabled
+ENABLED = os.environ.get("MARKETPULSE_METRICS", "0") == "1"
+METRICS_LOG = os.environ.get("MARKETPULSE_METRICS_LOG", os.path.join("reports", "metrics.jsonl"))
+# The log rolls over to METRICS_LOG + ".1" at this size, so at most two files are kept
+METRICS_LOG_MAX_BYTES = int(os.environ.get("MARKETPULSE_METRICS_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+PROMETHEUS_PATH = os.path.join("reports", "metrics.prom")
+# /metrics is for a local scraper; set MARKETPULSE_METRICS_HOST=0.0.0.0 to expose it on every interface
+METRICS_HOST = os.environ.get("MARKETPULSE_METRICS_HOST", "127.0.0.1")
+PREFIX = "marketpulse_"
+
+# Latency histogram bucket upper bounds, in seconds
+BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_log_file = None
+_server = None
+
+
+def enable(on=True):
+    global ENABLED
+    ENABLED = on
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _log(event):
+    """Append one structured event to the JSON log (caller holds _lock)"""
+    global _log_file
+    try:
+        if _log_file is None:
+            os.makedirs(os.path.dirname(METRICS_LOG) or ".", exist_ok=True)
+            _log_file = open(METRICS_LOG, "a", buffering=1)
+        _log_file.write(json.dumps(event) + "\n")
+        if _log_file.tell() >= METRICS_LOG_MAX_BYTES:
+            _log_file.close()
+            _log_file = None
+            os.replace(METRICS_LOG, METRICS_LOG + ".1")
+    except OSError:
+        pass
+
+
+def incr(name, value=1, **labels):
+    """Add to a counter, e.g. incr("cache_requests", cache="result", result="hit")"""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def observe(name, seconds, **labels):
+    """Record one latency sample in a histogram and the JSON log"""
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        hist = _histograms.get(key)
+        if hist is None:
+            hist = _histograms[key] = {"buckets": [0] * len(BUCKETS), "sum": 0.0, "count": 0}
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                hist["buckets"][i] += 1
+                break
+        hist["sum"] += seconds
+        hist["count"] += 1
+        _log({"time": time.time(), "metric": name, "labels": labels, "seconds": round(seconds, 6)})
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class _NoTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_TIMER = _NoTimer()
+
+
+def timer(name, **labels):
+    """Context manager that records its block's wall time, e.g. with timer("stage_seconds", stage="vader")"""
+    if not ENABLED:
+        return _NO_TIMER
+    return _Timer(name, labels)
+
+
+def timed(name, **labels):
+    """Decorator form of timer()"""
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return fn(*args, **kwargs)
+            with _Timer(name, labels):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- export -------------------------------------------------------------------------
+
+def _quantile(hist, q):
+    """Upper bound of the bucket holding the q-th sample (inf when it's past the last bucket)"""
+    target = q * hist["count"]
+    seen = 0
+    for bound, n in zip(BUCKETS, hist["buckets"]):
+        seen += n
+        if seen >= target:
+            return bound
+    return float("inf")
+
+
+def snapshot():
+    """Every counter and histogram as JSON-ready dicts"""
+    with _lock:
+        counters = [{"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(_counters.items())]
+        histograms = [{"name": name, "labels": dict(labels), "count": h["count"], "sum": round(h["sum"], 6),
+                       "mean": h["sum"] / h["count"], "p50": _quantile(h, 0.5), "p95": _quantile(h, 0.95),
+                       "buckets": list(h["buckets"])}
+                      for (name, labels), h in sorted(_histograms.items())]
+    return {"enabled": ENABLED, "buckets": list(BUCKETS), "counters": counters, "histograms": histograms}
+
+
+def _escape(value):
+    """A label value escaped as the text format requires: backslash, double quote and newline"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(labels, **extra):
+    pairs = list(labels.items()) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def prometheus_text():
+    """Metrics in the Prometheus text exposition format"""
+    snap = snapshot()
+    lines = []
+    typed = set()
+    for c in snap["counters"]:
+        name = PREFIX + c["name"] + ("" if c["name"].endswith("_total") else "_total")
+        if name not in typed:
+            lines.append(f"# TYPE {name} counter")
+            typed.add(name)
+        lines.append(f"{name}{_labels(c['labels'])} {c['value']}")
+    for h in snap["histograms"]:
+        name = PREFIX + h["name"]
+        if name not in typed:
+            lines.append(f"# TYPE {name} histogram")
+            typed.add(name)
+        cumulative = 0
+        for bound, n in zip(BUCKETS, h["buckets"]):
+            cumulative += n
+            lines.append(f"{name}_bucket{_labels(h['labels'], le=bound)} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(h['labels'], le='+Inf')} {h['count']}")
+        lines.append(f"{name}_sum{_labels(h['labels'])} {h['sum']}")
+        lines.append(f"{name}_count{_labels(h['labels'])} {h['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path=PROMETHEUS_PATH):
+    """Write the Prometheus text to a file (e.g. for node_exporter's textfile collector)"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        f.write(prometheus_text())
+    os.replace(tmp, path)
+    return path
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") not in ("", "/metrics"):
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port=None, host=None):
+    """Serve /metrics on a background thread, once per process.
+
+    port defaults to MARKETPULSE_METRICS_PORT and host to METRICS_HOST (loopback only).
+    """
+    global _server
+    port = port or os.environ.get("MARKETPULSE_METRICS_PORT")
+    if not port:
+        return None
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer((host or METRICS_HOST, int(port)), _MetricsHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server
@@ -0,0 +1,125 @@
+# utils/news_ingest.py
+
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import metrics
+from utils.providers import get_provider
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+SUBREDDITS = ["stocks", "investing", "SecurityAnalysis", "ValueInvesting"]
+
+# Whole-request budget for collecting headlines; slow sources are dropped, not waited on
+DEFAULT_DEADLINE = 5.0
+MAX_HEADLINES_PER_SOURCE = 10
+
+# Shared by every session in the process so connections to Yahoo stay warm
+_executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix="news")
+
+
+@functools.lru_cache(maxsize=1)
+def http_session():
+    """Process-wide requests session with a connection pool sized for the fetch workers"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": USER_AGENT})
+    return session
+
+
+@metrics.timed("external_call_seconds", call="yahoo_news")
+def fetch_yahoo_news_page(ticker, timeout=DEFAULT_DEADLINE):
+    """Headlines scraped from the Yahoo Finance quote news page"""
+    from bs4 import BeautifulSoup
+
+    response = http_session().get(f"https://finance.yahoo.com/quote/{ticker}/news", timeout=timeout)
+    if response.status_code != 200:
+        return []
+    soup = BeautifulSoup(response.content, "html.parser")
+    headlines = [item.get_text().strip() for item in soup.find_all("h3", class_="Mb(5px)")]
+    return [h for h in headlines if h][:MAX_HEADLINES_PER_SOURCE]
+
+
+@metrics.timed("external_call_seconds", call="yahoo_search")
+def fetch_yahoo_search(ticker, timeout=DEFAULT_DEADLINE):
+    """Headlines from the Yahoo Finance search API"""
+    response = http_session().get(
+        "https://query1.finance.yahoo.com/v1/finance/search", params={"q": ticker}, timeout=timeout
+    )
+    news_items = response.json().get("news", [])[:MAX_HEADLINES_PER_SOURCE]
+    return [item["title"] for item in news_items if "title" in item]
+
+
+@functools.lru_cache(maxsize=4)
+def reddit_client(client_id, client_secret):
+    """One praw client per set of credentials, reused across calls"""
+    import praw
+
+    return praw.Reddit(
+        client_id=client_id,
+        client_secret=client_secret,
+        user_agent="MarketPulse/1.0",
+        timeout=int(DEFAULT_DEADLINE),
+    )
+
+
+@metrics.timed("external_call_seconds", call="reddit")
+def fetch_subreddit(ticker, subreddit, client_id, client_secret, limit=5):
+    """Post titles mentioning ticker in one subreddit"""
+    reddit = reddit_client(client_id, client_secret)
+    return [post.title for post in reddit.subreddit(subreddit).search(ticker, limit=limit)]
+
+
+def reddit_credentials():
+    """Reddit API credentials from the environment, or None if not configured"""
+    client_id = os.environ.get("REDDIT_CLIENT_ID")
+    client_secret = os.environ.get("REDDIT_CLIENT_SECRET")
+    if client_id and client_secret:
+        return client_id, client_secret
+    return None
+
+
+@metrics.timed("stage_seconds", stage="headlines")
+def gather_headlines(ticker, deadline=DEFAULT_DEADLINE, credentials=None, subreddits=SUBREDDITS):
+    """Fetch headlines from every source concurrently and return what arrived before the deadline.
+
+    Returns {"headlines": [...], "sources": {source: "ok" | "error" | "timeout"}, "elapsed": seconds}.
+    Headlines keep source order and are de-duplicated.
+    """
+    started = time.monotonic()
+    credentials = credentials or reddit_credentials()
+
+    sources = get_provider().news_sources(ticker, deadline, credentials, subreddits)
+    futures = {_executor.submit(fetch): source for source, fetch in sources.items()}
+
+    done, pending = wait(futures, timeout=deadline)
+    for future in pending:
+        future.cancel()
+
+    sources = {}
+    by_source = {}
+    for future, source in futures.items():
+        if future in pending:
+            sources[source] = "timeout"
+        elif future.exception() is not None:
+            sources[source] = "error"
+        else:
+            sources[source] = "ok"
+            by_source[source] = future.result()
+        metrics.incr("headline_fetches", source=source.split("/")[0], status=sources[source])
+
+    headlines = []
+    seen = set()
+    for source in futures.values():
+        for headline in by_source.get(source, []):
+            if headline not in seen:
+                seen.add(headline)
+                headlines.append(headline)
+
+    return {"headlines": headlines, "sources": sources, "elapsed": time.monotonic() - started}
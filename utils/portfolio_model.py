@@ -0,0 +1,212 @@
+# utils/portfolio_model.py
+
+import numpy as np
+import pandas as pd
+
+from utils.screener import RSI_OVERBOUGHT, RSI_OVERSOLD
+
+# Recommendation categories; code -1 means missing
+RECOMMENDATIONS = ("BUY 🟢", "SELL 🔴", "HOLD 🟡")
+_SIGNALS = ("BUY", "SELL", "HOLD")
+
+_TEXT_FIELDS = ("ticker", "sentiment", "added_date")
+
+
+def _code(label):
+    if not label:
+        return -1
+    for code, signal in enumerate(_SIGNALS):
+        if signal in label:
+            return code
+    return -1
+
+
+class PortfolioModel:
+    """Holdings kept as growable column arrays with running aggregates.
+
+    Adding or removing a holding updates the arrays and the signal counts, RSI sum and risk
+    buckets in place, so metrics never rescan the rows. The DataFrame view is built only when
+    something asks for it after a change.
+    """
+
+    def __init__(self, positions=(), capacity=16):
+        self._n = 0
+        self._ids = np.full(capacity, -1, dtype=np.int64)
+        self._price = np.full(capacity, np.nan)
+        self._rsi = np.full(capacity, np.nan)
+        self._codes = np.full(capacity, -1, dtype=np.int8)
+        self._text = {field: np.empty(capacity, dtype=object) for field in _TEXT_FIELDS}
+
+        self._signal_counts = np.zeros(len(RECOMMENDATIONS), dtype=np.int64)
+        self._rsi_sum = 0.0
+        self._rsi_count = 0
+        self._high_risk = 0
+        self._low_risk = 0
+        self._frame = None
+
+        for position in positions:
+            self.add(position)
+
+    @classmethod
+    def from_frame(cls, frame):
+        """Model from a DataFrame with the portfolio store's columns"""
+        return cls(frame.replace({np.nan: None}).to_dict("records"))
+
+    def __len__(self):
+        return self._n
+
+    def __iter__(self):
+        return iter(self.records())
+
+    # --- mutation -----------------------------------------------------------------------
+
+    def _grow(self):
+        capacity = len(self._price) * 2
+        self._ids = np.resize(self._ids, capacity)
+        self._price = np.resize(self._price, capacity)
+        self._rsi = np.resize(self._rsi, capacity)
+        self._codes = np.resize(self._codes, capacity)
+        for field, column in self._text.items():
+            grown = np.empty(capacity, dtype=object)
+            grown[:self._n] = column[:self._n]
+            self._text[field] = grown
+
+    def _tally(self, i, sign):
+        """Add (sign=1) or remove (sign=-1) row i's contribution to the running aggregates"""
+        if self._codes[i] >= 0:
+            self._signal_counts[self._codes[i]] += sign
+        rsi = self._rsi[i]
+        if rsi == rsi:
+            self._rsi_sum += sign * rsi
+            self._rsi_count += sign
+            self._high_risk += sign * (rsi > RSI_OVERBOUGHT)
+            self._low_risk += sign * (rsi < RSI_OVERSOLD)
+
+    def add(self, position):
+        """Append a holding dict (ticker, price, rsi, recommendation, ...)"""
+        if self._n == len(self._price):
+            self._grow()
+        i = self._n
+        self._ids[i] = -1 if position.get("id") is None else position["id"]
+        self._price[i] = np.nan if position.get("price") is None else position["price"]
+        self._rsi[i] = np.nan if position.get("rsi") is None else position["rsi"]
+        self._codes[i] = _code(position.get("recommendation"))
+        for field, column in self._text.items():
+            column[i] = position.get(field)
+        self._n += 1
+        self._tally(i, 1)
+        self._frame = None
+
+    def remove(self, index):
+        """Drop the holding at index and return it as a dict"""
+        if not 0 <= index < self._n:
+            raise IndexError(index)
+        removed = self.record(index)
+        self._tally(index, -1)
+        last = self._n - 1
+        for column in (self._ids, self._price, self._rsi, self._codes, *self._text.values()):
+            column[index:last] = column[index + 1:self._n]
+        for column in self._text.values():
+            column[last] = None
+        self._n = last
+        self._frame = None
+        return removed
+
+    def reprice(self, quotes):
+        """Overwrite price, RSI and recommendation from a ticker-indexed quotes frame in one pass.
+
+        Holdings missing from quotes keep their values. Aggregates are recounted with array operations.
+        """
+        n = self._n
+        matched = quotes.reindex(pd.Index(self._text["ticker"][:n]))
+        found = matched["price"].notna().to_numpy()
+        self._price[:n] = np.where(found, matched["price"].to_numpy(dtype=float), self._price[:n])
+        self._rsi[:n] = np.where(found, matched["rsi"].to_numpy(dtype=float), self._rsi[:n])
+        codes = pd.Categorical(matched["recommendation"], categories=RECOMMENDATIONS).codes
+        self._codes[:n] = np.where(found, codes, self._codes[:n])
+        self._recount()
+        self._frame = None
+
+    def _recount(self):
+        codes = self._codes[:self._n]
+        rsi = self._rsi[:self._n]
+        rsi = rsi[~np.isnan(rsi)]
+        self._signal_counts = np.bincount(codes[codes >= 0], minlength=len(RECOMMENDATIONS)).astype(np.int64)
+        self._rsi_sum = float(rsi.sum())
+        self._rsi_count = len(rsi)
+        self._high_risk = int((rsi > RSI_OVERBOUGHT).sum())
+        self._low_risk = int((rsi < RSI_OVERSOLD).sum())
+
+    def clear(self):
+        self.__init__()
+
+    # --- views --------------------------------------------------------------------------
+
+    def record(self, i):
+        code = self._codes[i]
+        return {
+            "id": None if self._ids[i] < 0 else int(self._ids[i]),
+            "ticker": self._text["ticker"][i],
+            "price": None if self._price[i] != self._price[i] else float(self._price[i]),
+            "rsi": None if self._rsi[i] != self._rsi[i] else float(self._rsi[i]),
+            "recommendation": RECOMMENDATIONS[code] if code >= 0 else None,
+            "sentiment": self._text["sentiment"][i],
+            "added_date": self._text["added_date"][i],
+        }
+
+    def records(self):
+        """Holdings as the list-of-dicts shape the store and report builder take"""
+        return [self.record(i) for i in range(self._n)]
+
+    def frame(self):
+        """Holdings as a DataFrame with a categorical recommendation column, cached until the next change"""
+        if self._frame is None:
+            n = self._n
+            self._frame = pd.DataFrame({
+                "ticker": self._text["ticker"][:n],
+                "price": self._price[:n],
+                "rsi": self._rsi[:n],
+                "recommendation": pd.Categorical.from_codes(self._codes[:n], categories=RECOMMENDATIONS),
+                "sentiment": self._text["sentiment"][:n],
+                "added_date": self._text["added_date"][:n],
+            })
+        return self._frame
+
+    # --- aggregates ---------------------------------------------------------------------
+
+    def signal_counts(self):
+        """Recommendation label -> number of holdings"""
+        return dict(zip(RECOMMENDATIONS, self._signal_counts.tolist()))
+
+    @property
+    def buy_signals(self):
+        return int(self._signal_counts[0])
+
+    @property
+    def sell_signals(self):
+        return int(self._signal_counts[1])
+
+    @property
+    def mean_rsi(self):
+        return self._rsi_sum / self._rsi_count if self._rsi_count else float("nan")
+
+    def risk_buckets(self):
+        """Holdings per RSI risk bucket; holdings without an RSI count as medium"""
+        high, low = int(self._high_risk), int(self._low_risk)
+        return {"high": high, "medium": self._n - high - low, "low": low}
+
+    @property
+    def score(self):
+        """Portfolio score out of 10, weighting low-risk holdings highest"""
+        if not self._n:
+            return 0.0
+        buckets = self.risk_buckets()
+        return (buckets["low"] * 10 + buckets["medium"] * 5 + buckets["high"] * 2) / self._n
+
+
+def session_portfolio(state, key="portfolio"):
+    """The PortfolioModel kept in a session-state mapping, created on first use"""
+    model = state.get(key)
+    if model is None:
+        model = state[key] = PortfolioModel()
+    return model
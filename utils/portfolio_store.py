@@ -0,0 +1,182 @@
+# utils/portfolio_store.py
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import threading
+
+import pandas as pd
+
+DB_PATH = os.environ.get("MARKETPULSE_PORTFOLIO_DB", os.path.join("data", "portfolios.sqlite"))
+
+COLUMNS = ["id", "ticker", "price", "rsi", "recommendation", "sentiment", "added_date"]
+
+# Portfolio names also name report files, so they're limited to characters safe in a path
+NAME_MAX = 64
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9_-]+")
+
+_local = threading.local()
+
+
+def _connection():
+    """One connection per thread; WAL keeps readers unblocked while another session writes"""
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "path", None) != DB_PATH:
+        directory = os.path.dirname(DB_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(DB_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS positions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id TEXT NOT NULL,
+                ticker TEXT NOT NULL,
+                price REAL,
+                rsi REAL,
+                recommendation TEXT,
+                sentiment TEXT,
+                added_date TEXT
+            );
+            CREATE INDEX IF NOT EXISTS positions_user_ticker ON positions (user_id, ticker);
+        """)
+        _local.conn, _local.path = conn, DB_PATH
+    return conn
+
+
+def portfolio_slug(name):
+    """A path-safe portfolio name: letters, digits, "_" and "-", with other runs turned into "-" """
+    slug = _UNSAFE_NAME.sub("-", str(name)).strip("-")[:NAME_MAX].strip("-")
+    if not slug:
+        raise ValueError(f"Portfolio name {name!r} has no letters or digits")
+    return slug
+
+
+def _checked(user_id):
+    if user_id != portfolio_slug(user_id):
+        raise ValueError(f"Unsafe portfolio name {user_id!r}; use portfolio_slug() first")
+    return user_id
+
+
+def _row(user_id, position):
+    return (
+        _checked(user_id),
+        position["ticker"],
+        None if position.get("price") is None else float(position["price"]),
+        None if position.get("rsi") is None else float(position["rsi"]),
+        position.get("recommendation"),
+        position.get("sentiment"),
+        position.get("added_date"),
+    )
+
+
+_INSERT = ("INSERT INTO positions (user_id, ticker, price, rsi, recommendation, sentiment, added_date) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+# Saves an existing holding in place; the user_id check keeps one portfolio from writing another's rows
+_UPSERT = ("INSERT INTO positions (id, user_id, ticker, price, rsi, recommendation, sentiment, added_date) "
+           "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+           "ON CONFLICT(id) DO UPDATE SET ticker = excluded.ticker, price = excluded.price, rsi = excluded.rsi, "
+           "recommendation = excluded.recommendation, sentiment = excluded.sentiment, "
+           "added_date = excluded.added_date "
+           "WHERE positions.user_id = excluded.user_id")
+
+
+def add_position(user_id, position):
+    """Append one position and return its id"""
+    conn = _connection()
+    with conn:
+        return conn.execute(_INSERT, _row(user_id, position)).lastrowid
+
+
+def add_positions(user_id, positions):
+    """Append many positions in one transaction"""
+    conn = _connection()
+    with conn:
+        conn.executemany(_INSERT, [_row(user_id, p) for p in positions])
+
+
+def delete_position(user_id, position_id):
+    conn = _connection()
+    with conn:
+        conn.execute("DELETE FROM positions WHERE user_id = ? AND id = ?", (user_id, position_id))
+
+
+def delete_ticker(user_id, ticker):
+    """Remove every position a user holds in ticker"""
+    conn = _connection()
+    with conn:
+        conn.execute("DELETE FROM positions WHERE user_id = ? AND ticker = ?", (user_id, ticker))
+
+
+def load_portfolio(user_id):
+    """A user's positions as a DataFrame, in the order they were added"""
+    return pd.read_sql_query(
+        f"SELECT {', '.join(COLUMNS)} FROM positions WHERE user_id = ? ORDER BY id",
+        _connection(), params=(user_id,)
+    )
+
+
+def load_positions(user_id):
+    """A user's positions as the list-of-dicts shape the app keeps in session state"""
+    return load_portfolio(user_id).to_dict("records")
+
+
+def sync_portfolio(user_id, positions):
+    """Make the stored portfolio match positions: insert new rows, update kept ones, delete removed ones.
+
+    Positions whose "id" is already stored for this user are updated in place, so repriced
+    values are saved too. Returns positions with ids filled in.
+    """
+    _checked(user_id)
+    conn = _connection()
+    synced = []
+    with conn:
+        stored = {row[0] for row in conn.execute("SELECT id FROM positions WHERE user_id = ?", (user_id,))}
+        kept = set()
+        for position in positions:
+            position = dict(position)
+            if position.get("id") in stored:
+                kept.add(position["id"])
+                conn.execute(_UPSERT, (int(position["id"]), *_row(user_id, position)))
+            else:
+                position["id"] = conn.execute(_INSERT, _row(user_id, position)).lastrowid
+            synced.append(position)
+        removed = stored - kept
+        if removed:
+            conn.executemany("DELETE FROM positions WHERE user_id = ? AND id = ?", [(user_id, i) for i in removed])
+    return synced
+
+
+def list_users():
+    return [row[0] for row in _connection().execute("SELECT DISTINCT user_id FROM positions ORDER BY user_id")]
+
+
+def load_all():
+    """Every saved portfolio as user_id -> list of positions, in one query"""
+    frame = pd.read_sql_query(f"SELECT user_id, {', '.join(COLUMNS)} FROM positions ORDER BY user_id, id", _connection())
+    return {user: group.drop(columns="user_id").to_dict("records") for user, group in frame.groupby("user_id")}
+
+
+def import_json(path, user_id):
+    """Append positions from an old reports/portfolio.json-style file"""
+    with open(path) as f:
+        positions = json.load(f)
+    add_positions(user_id, positions)
+    return len(positions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a saved portfolio JSON file into the portfolio database")
+    parser.add_argument("json_path")
+    parser.add_argument("--user", default="default")
+    args = parser.parse_args()
+    user = portfolio_slug(args.user)
+    print(f"Imported {import_json(args.json_path, user)} positions for {user} into {DB_PATH}")
+
+
+if __name__ == "__main__":
+    main()
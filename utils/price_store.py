@@ -0,0 +1,247 @@
+# utils/price_store.py
+
+import datetime
+import json
+import os
+import threading
+
+import pandas as pd
+
+from utils import metrics
+from utils.providers import get_provider
+
+# One Parquet file per ticker plus a small JSON sidecar describing what it covers
+STORE_DIR = os.environ.get("MARKETPULSE_PRICE_DIR", os.path.join("data", "prices"))
+
+# Don't ask Yahoo again for a ticker we refreshed this recently
+REFRESH_INTERVAL = datetime.timedelta(minutes=15)
+
+# A dividend or split rewrites Adj Close for every earlier bar; an overlap bar that moved
+# by more than this relative amount means the cached history is out of date
+RESTATEMENT_TOLERANCE = 1e-6
+
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5),
+    "10y": pd.DateOffset(years=10),
+}
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def _ticker_lock(ticker):
+    """One lock per ticker so concurrent loads of the same symbol share a single download"""
+    with _locks_guard:
+        if ticker not in _locks:
+            _locks[ticker] = threading.Lock()
+        return _locks[ticker]
+
+
+def _paths(ticker):
+    safe = ticker.upper().replace("/", "_")
+    base = os.path.join(STORE_DIR, safe)
+    return base + ".parquet", base + ".json"
+
+
+def period_start(period, today=None):
+    """First calendar date covered by a yfinance-style period string (None for 'max')"""
+    today = pd.Timestamp(today or datetime.date.today())
+    if period == "max":
+        return None
+    if period == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1)
+    if period not in PERIOD_OFFSETS:
+        raise ValueError(f"Unsupported period: {period}")
+    return today - PERIOD_OFFSETS[period]
+
+
+def _download(ticker, **kwargs):
+    return get_provider().download([ticker], **kwargs)[ticker]
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(ticker, data, meta):
+    """Write the frame and sidecar atomically so readers never see a half-written file"""
+    os.makedirs(STORE_DIR, exist_ok=True)
+    data_path, meta_path = _paths(ticker)
+    tmp_data = f"{data_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    tmp_meta = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    data.to_parquet(tmp_data)
+    with open(tmp_meta, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_data, data_path)
+    os.replace(tmp_meta, meta_path)
+
+
+def load_cached(ticker):
+    """Return whatever history is on disk for a ticker without touching the network"""
+    data_path, _ = _paths(ticker)
+    try:
+        return pd.read_parquet(data_path)
+    except (OSError, ValueError):
+        return pd.DataFrame()
+
+
+def _plan(ticker, start, now):
+    """Decide what a ticker needs: "fresh" (use disk), "stale" (append new bars) or "cold" (fetch the window)"""
+    _, meta_path = _paths(ticker)
+    cached = load_cached(ticker)
+    meta = _read_meta(meta_path)
+
+    covered_from = pd.Timestamp(meta["covered_from"]) if meta.get("covered_from") else None
+    if cached.empty or (start is not None and (covered_from is None or covered_from > start)) \
+            or (start is None and not meta.get("complete")):
+        return "cold", cached, meta
+
+    fetched_at = datetime.datetime.fromisoformat(meta["fetched_at"]) if meta.get("fetched_at") else None
+    if fetched_at is not None and now - fetched_at < REFRESH_INTERVAL:
+        return "fresh", cached, meta
+    return "stale", cached, meta
+
+
+def _overlap_start(cached):
+    """Where a stale download starts: the last complete cached bar, so there is a settled bar to compare"""
+    return cached.index[-2 if len(cached) > 1 else -1]
+
+
+def _fetch_kwargs(mode, cached, start):
+    if mode == "stale":
+        return {"start": _overlap_start(cached).date()}
+    return {"start": start.date()} if start is not None else {"period": "max"}
+
+
+def _restated(cached, fresh):
+    """True if the provider has re-adjusted bars we already hold since they were cached"""
+    overlap = _overlap_start(cached)
+    if overlap not in fresh.index:
+        return False
+    old, new = cached.at[overlap, "Adj Close"], fresh.at[overlap, "Adj Close"]
+    if pd.isna(old) or pd.isna(new):
+        return False
+    return abs(new / old - 1) > RESTATEMENT_TOLERANCE
+
+
+def _apply(ticker, mode, cached, meta, fresh, start, now):
+    """Merge downloaded bars into the cached history and persist the result"""
+    meta["fetched_at"] = now.isoformat()
+    if mode == "cold":
+        if fresh.empty:
+            return cached
+        data = fresh if cached.empty else fresh.combine_first(cached)
+        meta["covered_from"] = str(start.date()) if start is not None else str(data.index[0].date())
+        meta["complete"] = meta.get("complete", False) or start is None
+    elif fresh.empty:
+        data = cached
+    elif _restated(cached, fresh):
+        # Adjusted closes changed under us, so none of the cached history can be kept
+        metrics.incr("price_restatements")
+        window = {"period": "max"} if meta.get("complete") else {"start": meta["covered_from"]}
+        data = _download(ticker, **window)
+        if data.empty:
+            return cached
+    else:
+        # The last cached bar may have been a partial session, so the new download wins on overlap
+        data = pd.concat([cached[cached.index < fresh.index[0]], fresh])
+    _write(ticker, data, meta)
+    return data
+
+
+def _refresh(ticker, start):
+    """Bring the on-disk history for ticker up to date and make sure it reaches back to start"""
+    now = datetime.datetime.now()
+    mode, cached, meta = _plan(ticker, start, now)
+    metrics.incr("cache_requests", cache="price_store", result=mode)
+    if mode == "fresh":
+        return cached
+    fresh = _download(ticker, **_fetch_kwargs(mode, cached, start))
+    return _apply(ticker, mode, cached, meta, fresh, start, now)
+
+
+def _trim(data, start):
+    if data.empty or start is None:
+        return data.copy()
+    return data[data.index >= start].copy()
+
+
+def load_prices(ticker, period="1y"):
+    """Load daily OHLCV for ticker over period, downloading only bars missing from the local store"""
+    ticker = ticker.upper()
+    start = period_start(period)
+    with metrics.timer("stage_seconds", stage="prices"), _ticker_lock(ticker):
+        data = _refresh(ticker, start)
+    return _trim(data, start)
+
+
+def _download_many(tickers, **kwargs):
+    """One bulk provider request for many tickers, as per-ticker frames"""
+    return get_provider().download(tickers, **kwargs)
+
+
+def download_intraday(tickers, interval="1m", period="1d", start=None):
+    """Recent intraday bars for many tickers in one request; nothing is written to the store.
+
+    With start, only bars from that time on are requested instead of the whole period.
+    """
+    window = {"period": period} if start is None else {"start": start}
+    return _download_many(sorted({t.upper() for t in tickers}), interval=interval, **window)
+
+
+def load_many(tickers, period="1y"):
+    """Load many tickers at once: warm ones come from disk, the rest share bulk downloads.
+
+    Cold tickers are fetched in one request for the whole period and stale ones in one
+    request from the oldest last-cached date. Ticker locks are held only while planning
+    and writing, not through the downloads. Returns a dict of ticker -> OHLCV frame.
+    """
+    tickers = sorted({t.upper() for t in tickers})
+    start = period_start(period)
+    now = datetime.datetime.now()
+    results = {}
+    plans = {}
+    groups = {"cold": [], "stale": []}
+    for ticker in tickers:
+        with _ticker_lock(ticker):
+            plans[ticker] = mode, cached, _ = _plan(ticker, start, now)
+        metrics.incr("cache_requests", cache="price_store", result=mode)
+        if mode == "fresh":
+            results[ticker] = cached
+        else:
+            groups[mode].append(ticker)
+
+    for mode, group in groups.items():
+        if not group:
+            continue
+        if mode == "stale":
+            kwargs = {"start": min(_overlap_start(plans[t][1]) for t in group).date()}
+        else:
+            kwargs = _fetch_kwargs(mode, None, start)
+        downloaded = _download_many(group, **kwargs)
+        for ticker in group:
+            with _ticker_lock(ticker):
+                # Another load may have written this ticker while we were downloading:
+                # keep its data if it is now fresh, otherwise merge ours into what it wrote
+                current, cached, meta = _plan(ticker, start, now)
+                if current == "fresh":
+                    results[ticker] = cached
+                elif current == "cold" and mode == "stale":
+                    # The store lost what the stale download was meant to extend
+                    results[ticker] = _refresh(ticker, start)
+                else:
+                    fresh = downloaded.get(ticker, pd.DataFrame())
+                    results[ticker] = _apply(ticker, mode, cached, meta, fresh, start, now)
+
+    return {ticker: _trim(data, start) for ticker, data in results.items()}
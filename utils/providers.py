@@ -0,0 +1,315 @@
+# utils/providers.py
+
+import datetime
+import functools
+import os
+import threading
+import time
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from utils import metrics
+
+# "yahoo" (default), "local" or "synthetic"
+PROVIDER = os.environ.get("MARKETPULSE_PROVIDER", "yahoo")
+DATA_DIR = os.environ.get("MARKETPULSE_DATA_DIR", os.path.join("data", "market"))
+SYNTHETIC_SEED = int(os.environ.get("MARKETPULSE_SYNTHETIC_SEED", "0"))
+
+# Outbound requests per second, with bursts up to RATE_BURST
+RATE_LIMIT = float(os.environ.get("MARKETPULSE_RATE_LIMIT", "2"))
+RATE_BURST = int(os.environ.get("MARKETPULSE_RATE_BURST", "10"))
+RETRIES = int(os.environ.get("MARKETPULSE_RETRIES", "3"))
+# Tickers per bulk request; each request costs one token whatever its size
+BULK_CHUNK = int(os.environ.get("MARKETPULSE_BULK_CHUNK", "100"))
+BACKOFF = 0.5
+
+SYNTHETIC_EPOCH = pd.Timestamp("2000-01-03")
+
+_SUBJECTS = ["Shares", "The stock", "Investors", "Analysts", "The company", "Revenue", "Earnings", "Guidance",
+             "The chipmaker", "The retailer", "The bank", "Management", "Traders", "The board", "Sales"]
+_VERBS = ["soar", "plunge", "beat", "miss", "rally", "slump", "surge", "tumble", "climb", "slide", "jump",
+          "disappoint", "impress", "stall", "recover", "crash", "rebound", "weaken", "strengthen", "stabilize"]
+_OBJECTS = ["after strong earnings", "on weak guidance", "amid lawsuit fears", "as demand booms",
+            "despite upbeat forecast", "on record revenue", "after downgrade", "after upgrade",
+            "amid layoffs", "on buyback news", "as margins shrink", "on product recall", "ahead of the Fed",
+            "as costs rise", "on takeover talk", "after CEO exit", "on dividend hike", "amid supply issues"]
+
+
+def normalize(data):
+    """Flatten yfinance-style output to a tz-naive, date-indexed OHLCV frame"""
+    if data is None or data.empty:
+        return pd.DataFrame()
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.get_level_values(0)
+    data = data.loc[:, ~data.columns.duplicated()]
+    if data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+    data.index.name = "Date"
+    if "Adj Close" not in data.columns and "Close" in data.columns:
+        data["Adj Close"] = data["Close"]
+    return data.dropna(how="all").sort_index()
+
+
+def _window_start(start=None, period=None):
+    """First date a download should cover, from yfinance's start/period arguments"""
+    if start is not None:
+        return pd.Timestamp(start)
+    if period is None:
+        return None
+    from utils.price_store import period_start
+
+    return period_start(period)
+
+
+class EmptyResponse(Exception):
+    """A request that came back without any data; retried like any other failure"""
+
+
+# --- rate limiting --------------------------------------------------------------------
+
+class TokenBucket:
+    """Blocking token bucket: `rate` tokens per second, holding at most `capacity`"""
+
+    def __init__(self, rate=RATE_LIMIT, capacity=RATE_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Take tokens, sleeping until they are available; returns the seconds waited"""
+        if tokens > self.capacity:
+            raise ValueError(f"Cannot take {tokens} tokens from a bucket holding at most {self.capacity}")
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+def with_retries(fn, retries=RETRIES, backoff=BACKOFF, bucket=None, cost=1):
+    """Call fn through the rate limiter, retrying failures with exponential backoff"""
+    for attempt in range(retries + 1):
+        if bucket is not None:
+            waited = bucket.acquire(cost)
+            if waited:
+                metrics.observe("rate_limit_wait_seconds", waited)
+        try:
+            return fn()
+        except Exception:
+            if attempt == retries:
+                raise
+            metrics.incr("provider_retries")
+            time.sleep(backoff * 2 ** attempt)
+
+
+# --- providers ------------------------------------------------------------------------
+
+class YahooProvider:
+    """Live data: yfinance for bars, Yahoo Finance and Reddit for headlines"""
+
+    name = "yahoo"
+
+    def __init__(self, bucket=None, chunk_size=BULK_CHUNK):
+        self.bucket = bucket or TokenBucket()
+        self.chunk_size = chunk_size
+
+    def download(self, tickers, **kwargs):
+        """Bulk requests of at most chunk_size tickers, split back into per-ticker frames"""
+        frames = {}
+        for i in range(0, len(tickers), self.chunk_size):
+            frames.update(self._download_chunk(tickers[i:i + self.chunk_size], **kwargs))
+        return frames
+
+    def _download_chunk(self, tickers, **kwargs):
+        import yfinance as yf
+
+        def fetch():
+            with metrics.timer("external_call_seconds", call="yf.download"):
+                data = yf.download(tickers, group_by="ticker", auto_adjust=False, progress=False,
+                                   threads=True, **kwargs)
+            # yfinance reports most failures (throttling included) as an empty frame, not an error
+            if data is None or data.dropna(how="all").empty:
+                raise EmptyResponse(f"No data for {', '.join(tickers)}")
+            return data
+
+        # The limiter paces bulk requests, so a chunk costs one token however many tickers it holds
+        try:
+            data = with_retries(fetch, bucket=self.bucket)
+        except EmptyResponse:
+            metrics.incr("provider_empty_responses")
+            return {ticker: pd.DataFrame() for ticker in tickers}
+        frames = {}
+        for ticker in tickers:
+            if isinstance(data.columns, pd.MultiIndex):
+                if ticker not in data.columns.get_level_values(0):
+                    frames[ticker] = pd.DataFrame()
+                    continue
+                frame = data[ticker].copy()
+            else:
+                frame = data.copy()
+            frames[ticker] = normalize(frame)
+        return frames
+
+    def news_sources(self, ticker, deadline, credentials=None, subreddits=()):
+        """Source name -> zero-argument fetcher returning headlines"""
+        from utils.news_ingest import fetch_subreddit, fetch_yahoo_news_page, fetch_yahoo_search
+
+        # One retry at most: the caller drops whatever misses its deadline anyway
+        def limited(fn, *args):
+            return lambda: with_retries(lambda: fn(*args), retries=1, bucket=self.bucket)
+
+        sources = {
+            "yahoo_news": limited(fetch_yahoo_news_page, ticker, deadline),
+            "yahoo_search": limited(fetch_yahoo_search, ticker, deadline),
+        }
+        if credentials:
+            for subreddit in subreddits:
+                sources[f"reddit/{subreddit}"] = limited(fetch_subreddit, ticker, subreddit, *credentials)
+        return sources
+
+
+class LocalProvider:
+    """Bars and headlines from a directory, for offline runs and replaying captured data.
+
+    Layout: <dir>/<TICKER>.parquet or .csv (daily, with a Date column or index),
+    <dir>/intraday/<TICKER>.parquet or .csv, and <dir>/headlines/<TICKER>.txt (one per line).
+    """
+
+    name = "local"
+
+    def __init__(self, directory=DATA_DIR):
+        self.directory = directory
+
+    def _read(self, ticker, subdir=""):
+        base = os.path.join(self.directory, subdir, ticker.upper().replace("/", "_"))
+        if os.path.exists(base + ".parquet"):
+            data = pd.read_parquet(base + ".parquet")
+        elif os.path.exists(base + ".csv"):
+            data = pd.read_csv(base + ".csv")
+        else:
+            return pd.DataFrame()
+        if "Date" in data.columns:
+            data = data.set_index(pd.to_datetime(data.pop("Date")))
+        return normalize(data)
+
+    def download(self, tickers, interval="1d", start=None, period=None, **kwargs):
+        frames = {}
+        first = _window_start(start, period)
+        for ticker in tickers:
+            data = self._read(ticker, "" if interval == "1d" else "intraday")
+            if first is not None and not data.empty:
+                data = data[data.index >= first]
+            frames[ticker] = data
+        return frames
+
+    def news_sources(self, ticker, deadline, credentials=None, subreddits=()):
+        path = os.path.join(self.directory, "headlines", f"{ticker.upper()}.txt")
+
+        def read():
+            try:
+                with open(path) as f:
+                    return [line.strip() for line in f if line.strip()]
+            except OSError:
+                return []
+        return {"local": read}
+
+
+def synthetic_headlines(n, seed=0):
+    """n deterministic finance-style headlines"""
+    rng = np.random.default_rng(seed)
+    picks = zip(rng.integers(0, len(_SUBJECTS), n), rng.integers(0, len(_VERBS), n),
+                rng.integers(0, len(_OBJECTS), n))
+    return [f"{_SUBJECTS[s]} {_VERBS[v]} {_OBJECTS[o]}" for s, v, o in picks]
+
+
+class SyntheticProvider:
+    """Deterministic random-walk OHLCV and generated headlines, with no network access.
+
+    A ticker's daily history is a fixed function of (seed, ticker) generated forward from
+    SYNTHETIC_EPOCH, so repeated and incremental downloads agree with each other.
+    Intraday requests return today's 1-minute session up to the current minute.
+    """
+
+    name = "synthetic"
+
+    def __init__(self, seed=SYNTHETIC_SEED):
+        self.seed = seed
+
+    def _rng(self, ticker, *extra):
+        return np.random.default_rng([self.seed, zlib.crc32(ticker.upper().encode()), *extra])
+
+    def _daily(self, ticker, end):
+        dates = pd.bdate_range(SYNTHETIC_EPOCH, end)
+        rng = self._rng(ticker)
+        drift, vol = rng.normal(0.0003, 0.0002), rng.uniform(0.01, 0.03)
+        returns = rng.normal(drift, vol, len(dates))
+        close = rng.uniform(20, 300) * np.exp(np.cumsum(returns))
+        spread = close * rng.uniform(0.001, 0.02, len(dates))
+        open_ = np.concatenate([[close[0]], close[:-1]]) * (1 + rng.normal(0, vol / 4, len(dates)))
+        return pd.DataFrame({
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread,
+            "Low": np.minimum(open_, close) - spread,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(100_000, 20_000_000, len(dates)).astype(float),
+        }, index=pd.DatetimeIndex(dates, name="Date"))
+
+    def _intraday(self, ticker, now):
+        session = pd.Timestamp(now.date())
+        if now.weekday() >= 5 or now.time() < datetime.time(9, 30):
+            session = pd.bdate_range(end=session - pd.Timedelta(days=1), periods=1)[0]
+            now = session + pd.Timedelta(hours=16)
+        daily = self._daily(ticker, session)
+        anchor = daily["Close"].iloc[-2] if len(daily) > 1 else daily["Close"].iloc[-1]
+        minutes = pd.date_range(session + pd.Timedelta(hours=9, minutes=30),
+                                min(now, session + pd.Timedelta(hours=15, minutes=59)), freq="min")
+        rng = self._rng(ticker, session.toordinal())
+        close = anchor * np.exp(np.cumsum(rng.normal(0, 0.0008, 390)))[:len(minutes)]
+        return pd.DataFrame({
+            "Open": close, "High": close, "Low": close, "Close": close, "Adj Close": close,
+            "Volume": rng.integers(1_000, 100_000, len(minutes)).astype(float),
+        }, index=pd.DatetimeIndex(minutes, name="Date"))
+
+    def download(self, tickers, interval="1d", start=None, period=None, **kwargs):
+        now = pd.Timestamp(datetime.datetime.now()).floor("min")
+        first = _window_start(start, period)
+        frames = {}
+        for ticker in tickers:
+            if interval == "1d":
+                data = self._daily(ticker, now.normalize())
+                frames[ticker] = data if first is None else data[data.index >= first]
+            else:
+                data = self._intraday(ticker, now)
+                frames[ticker] = data if start is None else data[data.index >= pd.Timestamp(start)]
+        return frames
+
+    def news_sources(self, ticker, deadline, credentials=None, subreddits=()):
+        seed = [self.seed, zlib.crc32(ticker.upper().encode()), datetime.date.today().toordinal()]
+        return {"synthetic": lambda: synthetic_headlines(10, seed=seed)}
+
+
+PROVIDERS = {
+    "yahoo": YahooProvider,
+    "local": LocalProvider,
+    "synthetic": SyntheticProvider,
+}
+
+
+@functools.lru_cache(maxsize=1)
+def get_provider():
+    """The configured provider (MARKETPULSE_PROVIDER), created once per process"""
+    if PROVIDER not in PROVIDERS:
+        raise ValueError(f"Unknown provider {PROVIDER!r}; expected one of {', '.join(PROVIDERS)}")
+    return PROVIDERS[PROVIDER]()
@@ -1,9 +1,89 @@
+import functools
+import io
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
 from fpdf import FPDF
 from datetime import datetime
 
+from utils import metrics
+
+LOGO_PATH = "assets/MPLogo4.jpg"
+
+# Charts for small portfolios are quicker to draw inline than to ship to worker processes
+POOL_MIN_HOLDINGS = 4
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def logo_bytes():
+    """The header logo, decoded and shrunk to its printed size once per process"""
+    from PIL import Image
+
+    with Image.open(LOGO_PATH) as im:
+        im.thumbnail((600, 600))
+        buf = io.BytesIO()
+        im.convert("RGB").save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+
+def _new_figure():
+    # Figure objects rather than pyplot, whose global figure registry isn't thread-safe
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(8, 2.6), dpi=100)
+    ax = fig.subplots()
+    fig.subplots_adjust(left=0.08, right=0.98, top=0.88, bottom=0.12)
+    return fig, ax
+
+
+@functools.lru_cache(maxsize=1)
+def _worker_figure():
+    """One reusable figure per pool worker; building a new one per chart dominates render time"""
+    return _new_figure()
+
+
+def render_charts(ticker, data, figure=None):
+    """Price/MA50 and RSI charts for one ticker as PNG bytes.
+
+    figure is a (fig, ax) pair to redraw on. Only pool workers pass one, since each runs one
+    chart at a time; inline callers get a fresh figure so concurrent builds never share axes.
+    """
+    fig, ax = figure or _new_figure()
+    charts = []
+    for columns, title in ((["Adj Close", "SMA_50"], f"{ticker} Price & 50-day MA"), (["RSI"], f"{ticker} RSI")):
+        ax.clear()
+        for column in columns:
+            ax.plot(data.index, data[column], label=column, linewidth=1.2)
+        if columns == ["RSI"]:
+            ax.axhline(70, color="red", linestyle="--", linewidth=0.8)
+            ax.axhline(30, color="green", linestyle="--", linewidth=0.8)
+        ax.set_title(title, fontsize=10)
+        ax.legend(fontsize=8, loc="upper left")
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png")
+        charts.append(buf.getvalue())
+    return tuple(charts)
+
+
+def _render_in_worker(ticker, data):
+    return render_charts(ticker, data, _worker_figure())
+
+
+def _chart_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+        return _pool
+
+
 class PDF(FPDF):
     def header(self):
-        self.image("assets/MPLogo.jpg", x=75, y=10, w=60)
+        self.image(io.BytesIO(logo_bytes()), x=75, y=10, w=60)
         self.set_y(35)
         self.set_font("Helvetica", "B", 14)
         self.cell(0, 10, "MarketPulse Stock Report", ln=True, align="C")
@@ -11,9 +91,9 @@ class PDF(FPDF):
         self.cell(0, 10, f"Generated on {datetime.today().strftime('%Y-%m-%d')}", ln=True, align="C")
         self.ln(5)
 
-    def add_stock_section(self, ticker, sentiment_label, sentiment_score, timeframe, score, score_explanations):
+    def add_stock_section(self, ticker, sentiment_label, sentiment_score, timeframe, score, score_explanations, charts=None):
         self.set_font("Helvetica", "B", 12)
-        self.cell(0, 10, f"📊 {ticker} Summary", ln=True)
+        self.cell(0, 10, f"{ticker} Summary", ln=True)
         self.set_font("Helvetica", "", 10)
 
         # Timeframe
@@ -28,23 +108,88 @@ class PDF(FPDF):
         self.set_font("Helvetica", "", 10)
 
         for explanation in score_explanations:
-            self.multi_cell(0, 6, f"- {explanation}")
+            self.multi_cell(0, 6, f"- {explanation}", new_x="LMARGIN", new_y="NEXT")
         self.ln(3)
 
-        # Charts (RSI + MA50)
-        try:
-            self.image(f"reports/{ticker}_ma.png", w=170)
+        # Charts (RSI + MA50), embedded straight from memory
+        if charts:
+            ma_png, rsi_png = charts
+            self.image(io.BytesIO(ma_png), w=170)
             self.ln(3)
-            self.image(f"reports/{ticker}_rsi.png", w=170)
+            self.image(io.BytesIO(rsi_png), w=170)
             self.ln(5)
-        except:
-            self.multi_cell(0, 6, "⚠️ Chart export failed or missing.")
+        else:
+            self.multi_cell(0, 6, "Chart data missing.", new_x="LMARGIN", new_y="NEXT")
             self.ln(3)
 
     def add_text(self, text):
         self.set_font("Helvetica", "", 10)
-        self.multi_cell(0, 6, text)
+        self.multi_cell(0, 6, text, new_x="LMARGIN", new_y="NEXT")
         self.ln(2)
 
     def save(self, path):
         self.output(path)
+
+
+def marketpulse_score(price, sma_50, rsi, sentiment_label):
+    """Score a holding out of 3 with one explanation per check"""
+    checks = [
+        (price > sma_50, f"Price {price:.2f} is {'above' if price > sma_50 else 'below'} its 50-day average {sma_50:.2f}"),
+        (rsi < 70, f"RSI {rsi:.1f} is {'not ' if rsi < 70 else ''}overbought"),
+        (sentiment_label == "Positive", f"News sentiment is {sentiment_label}"),
+    ]
+    return sum(1 for passed, _ in checks if passed), [text for _, text in checks]
+
+
+@metrics.timed("stage_seconds", stage="pdf_charts")
+def render_all_charts(frames):
+    """Charts for every ticker in frames, in the shared process pool when there are enough of them"""
+    if len(frames) >= POOL_MIN_HOLDINGS:
+        return dict(zip(frames, _chart_pool().map(_render_in_worker, frames.keys(), frames.values())))
+    return {ticker: render_charts(ticker, data) for ticker, data in frames.items()}
+
+
+@metrics.timed("stage_seconds", stage="pdf")
+def build_portfolio_report(holdings, period="1y", frames=None, charts=None):
+    """Render a full portfolio report and return the PDF as bytes.
+
+    holdings are portfolio entries (dicts with at least "ticker"). Each ticker's charts are
+    drawn to in-memory PNGs, in a shared process pool for larger portfolios, so nothing
+    is written to disk and concurrent builds don't step on each other. Callers building
+    many reports can pass precomputed frames (ticker -> Adj Close/SMA_50/RSI) and charts.
+    """
+    holdings = list({h["ticker"]: h for h in holdings}.values())
+    if frames is None:
+        from utils.engine import get_analysis_data
+
+        frames = {}
+        for holding in holdings:
+            data = get_analysis_data(holding["ticker"], period)
+            if not data.empty:
+                frames[holding["ticker"]] = data[["Adj Close", "SMA_50", "RSI"]]
+    else:
+        frames = {h["ticker"]: frames[h["ticker"]] for h in holdings if h["ticker"] in frames}
+    if charts is None:
+        charts = render_all_charts(frames)
+
+    pdf = PDF()
+    pdf.set_auto_page_break(auto=True, margin=15)
+    pdf.add_page()
+    rsis = [rsi for rsi in (frames[t]["RSI"].iloc[-1] for t in frames) if rsi == rsi]
+    pdf.add_text(
+        f"Holdings: {len(holdings)}\n"
+        f"Average RSI: {sum(rsis) / len(rsis):.1f}" if rsis else f"Holdings: {len(holdings)}"
+    )
+
+    for holding in holdings:
+        ticker = holding["ticker"]
+        sentiment = holding.get("sentiment") or "N/A"
+        if ticker not in frames:
+            pdf.add_stock_section(ticker, sentiment, "-", period, 0, ["No price data available."])
+            continue
+        latest = frames[ticker].iloc[-1]
+        score, explanations = marketpulse_score(latest["Adj Close"], latest["SMA_50"], latest["RSI"], sentiment)
+        pdf.add_stock_section(
+            ticker, sentiment, holding.get("sentiment_score", "-"), period, score, explanations, charts.get(ticker)
+        )
+    return bytes(pdf.output())
@@ -0,0 +1,69 @@
+# utils/repricer.py
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils import metrics
+from utils.engine import PRICE_TTL
+from utils.indicators import compute_indicators, price_matrix
+from utils.price_store import load_many
+from utils.result_cache import shared_cache
+from utils.screener import RSI_OVERBOUGHT, RSI_OVERSOLD
+
+# Enough history for RSI to settle
+REPRICE_PERIOD = "3mo"
+
+QUOTE_COLUMNS = ["price", "rsi", "recommendation", "as_of"]
+
+# Repricing is mostly waiting on the download; two workers keep one slow portfolio from queuing the rest
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="reprice")
+_inflight = {}
+_lock = threading.Lock()
+
+
+def reprice(tickers, period=REPRICE_PERIOD):
+    """Latest price, RSI and recommendation for every ticker from one bulk load and one indicator pass.
+
+    Returns a frame indexed by ticker; tickers without data are left out. A missing RSI counts
+    as 50 (HOLD), the same as analyze_ticker.
+    """
+    with metrics.timer("stage_seconds", stage="reprice"):
+        prices = price_matrix(load_many(tickers, period))
+        if prices.empty:
+            return pd.DataFrame(columns=QUOTE_COLUMNS)
+        rsi = compute_indicators(prices, sma_windows=())["RSI"].iloc[-1].fillna(50.0).to_numpy()
+        filled = prices.ffill()
+        quotes = pd.DataFrame({
+            "price": filled.iloc[-1].to_numpy(),
+            "rsi": rsi,
+            "recommendation": np.select([rsi < RSI_OVERSOLD, rsi > RSI_OVERBOUGHT], ["BUY 🟢", "SELL 🔴"], "HOLD 🟡"),
+            "as_of": str(prices.index[-1].date()),
+        }, index=prices.columns)
+        return quotes[quotes["price"].notna()]
+
+
+def reprice_async(tickers, period=REPRICE_PERIOD):
+    """Start repricing on a worker thread and return its Future.
+
+    Sessions asking for the same tickers share one running job, and finished results are
+    reused from the shared cache until prices are due for a refresh.
+    """
+    key = (tuple(sorted({t.upper() for t in tickers})), period)
+    with _lock:
+        future = _inflight.get(key)
+        if future is not None:
+            return future
+        future = _inflight[key] = _executor.submit(
+            shared_cache.get_or_compute, ("reprice",) + key, lambda: reprice(key[0], period), PRICE_TTL
+        )
+    # Outside the lock: the callback runs right here if the job already finished
+    future.add_done_callback(lambda _: _forget(key))
+    return future
+
+
+def _forget(key):
+    with _lock:
+        _inflight.pop(key, None)
@@ -0,0 +1,114 @@
+# utils/result_cache.py
+
+import threading
+import time
+from collections import OrderedDict
+
+from utils import metrics
+
+
+class _InFlight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    """Thread-safe TTL + LRU cache with single-flight computation per key.
+
+    Streamlit runs every session in a thread of the same process, so one module-level
+    instance is shared by all users. Concurrent callers asking for the same key while it
+    is being computed wait for that computation instead of starting their own.
+    """
+
+    def __init__(self, maxsize=256, ttl=900):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def get(self, key, default=None):
+        """Return a live cached value without computing anything"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def get_or_compute(self, key, compute, ttl=None):
+        """Return the cached value for key, computing it at most once across concurrent callers"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] >= time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    metrics.incr("cache_requests", cache="result", result="hit")
+                    return entry[1]
+                del self._entries[key]
+
+            call = self._inflight.get(key)
+            if call is not None:
+                self.coalesced += 1
+                metrics.incr("cache_requests", cache="result", result="coalesced")
+                leader = False
+            else:
+                call = self._inflight[key] = _InFlight()
+                self.misses += 1
+                metrics.incr("cache_requests", cache="result", result="miss")
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+        except BaseException as e:
+            call.error = e
+            raise
+        else:
+            self.set(key, call.value, ttl)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.done.set()
+        return call.value
+
+    def set(self, key, value, ttl=None):
+        """Store a value, evicting the least recently used entries past maxsize"""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+            }
+
+
+# Process-wide cache shared by every Streamlit session
+shared_cache = ResultCache()
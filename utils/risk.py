@@ -0,0 +1,166 @@
+# utils/risk.py
+
+import os
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from utils import metrics
+from utils.backtest import TRADING_DAYS
+from utils.engine import PRICE_TTL
+from utils.indicators import price_matrix
+from utils.price_store import load_many
+from utils.result_cache import shared_cache
+
+BENCHMARK = os.environ.get("MARKETPULSE_BENCHMARK", "SPY")
+RISK_PERIOD = "1y"
+CONFIDENCE = 0.95
+
+# Fewer overlapping days than this and a correlation or beta isn't worth reporting
+MIN_OVERLAP = 20
+
+# Results are keyed by as-of date, so the TTL only bounds how long old dates linger
+RISK_TTL = 24 * 3600
+
+HOLDING_COLUMNS = ["weight", "volatility", "beta", "var_historical", "observations"]
+
+
+def returns_matrix(prices):
+    """Daily simple returns of a dates x tickers price frame, NaN before a ticker lists"""
+    filled = prices.ffill().to_numpy(dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        returns = filled[1:] / filled[:-1] - 1
+    returns[~np.isfinite(returns)] = np.nan
+    return returns
+
+
+def pairwise_moments(x, y):
+    """Pairwise-complete covariance between every column of x and every column of y.
+
+    Each pair uses only the rows where both columns have data, like DataFrame.corr, but
+    as a handful of matrix products instead of a loop over pairs. Returns
+    (overlap, covariance, x variance, y variance), each shaped (x columns, y columns).
+    """
+    mx, my = ~np.isnan(x), ~np.isnan(y)
+    # Centring first keeps the sum-of-squares formulas from cancelling
+    with np.errstate(invalid="ignore"):
+        x0 = np.where(mx, x - np.nanmean(np.where(mx, x, np.nan), axis=0), 0.0)
+        y0 = np.where(my, y - np.nanmean(np.where(my, y, np.nan), axis=0), 0.0)
+    mx, my = mx.astype(float), my.astype(float)
+
+    n = mx.T @ my
+    sx, sy = x0.T @ my, mx.T @ y0
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cov = (x0.T @ y0 - sx * sy / n) / (n - 1)
+        var_x = ((x0 ** 2).T @ my - sx ** 2 / n) / (n - 1)
+        var_y = (mx.T @ (y0 ** 2) - sy ** 2 / n) / (n - 1)
+    return n, cov, var_x, var_y
+
+
+def risk_arrays(returns, weights, benchmark=None, confidence=CONFIDENCE):
+    """Risk metrics for a dates x holdings returns array and its portfolio weights.
+
+    The portfolio return each day is the weighted mean over the holdings that traded that
+    day. Volatilities are annualized; VaRs are one-day losses as positive fractions.
+    benchmark is a 1-D returns array on the same dates, or None to skip betas.
+    """
+    valid = ~np.isnan(returns)
+    n_obs = valid.sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        held = valid @ weights
+        portfolio = np.where(held > 0, np.nan_to_num(returns) @ weights / held, np.nan)
+    scale = np.sqrt(TRADING_DAYS)
+    z = NormalDist().inv_cdf(1 - confidence)
+
+    overlap, cov, var_a, var_b = pairwise_moments(returns, returns)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        corr = cov / np.sqrt(var_a * var_b)
+    corr[overlap < MIN_OVERLAP] = np.nan
+    np.fill_diagonal(corr, np.where(n_obs >= MIN_OVERLAP, 1.0, np.nan))
+    off_diagonal = corr[~np.eye(len(corr), dtype=bool)]
+
+    columns = np.column_stack([returns, portfolio])
+    if benchmark is None:
+        betas = np.full(columns.shape[1], np.nan)
+    else:
+        overlap, cov, _, var_b = pairwise_moments(columns, benchmark[:, None])
+        with np.errstate(invalid="ignore", divide="ignore"):
+            betas = np.where(overlap[:, 0] >= MIN_OVERLAP, cov[:, 0] / var_b[:, 0], np.nan)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        std = np.nanstd(columns, axis=0, ddof=1)
+        var_historical = -np.nanquantile(columns, 1 - confidence, axis=0)
+        series = portfolio[~np.isnan(portfolio)]
+        return {
+            "volatility": std[:-1] * scale,
+            "beta": betas[:-1],
+            "var_historical": var_historical[:-1],
+            "observations": n_obs,
+            "correlation": corr,
+            "portfolio": {
+                "volatility": std[-1] * scale,
+                "beta": betas[-1],
+                "var_historical": var_historical[-1],
+                "var_parametric": -(series.mean() + z * std[-1]) if len(series) > 1 else np.nan,
+                "mean_correlation": np.nanmean(off_diagonal) if np.isfinite(off_diagonal).any() else np.nan,
+                "observations": len(series),
+            },
+        }
+
+
+def analyze_risk(prices, weights, benchmark=None, confidence=CONFIDENCE):
+    """Risk report for a dates x tickers price frame.
+
+    weights maps ticker -> portfolio weight; benchmark is a price Series on any dates.
+    Returns holdings (one row per ticker), correlation, and portfolio (a dict of metrics).
+    """
+    tickers = [t for t in prices.columns if weights.get(t, 0) > 0]
+    prices = prices[tickers]
+    bench = None
+    if benchmark is not None and not benchmark.dropna().empty:
+        bench = benchmark.reindex(prices.index).ffill().to_numpy(dtype=float)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            bench = bench[1:] / bench[:-1] - 1
+
+    w = np.array([weights[t] for t in tickers], dtype=float)
+    w = w / w.sum() if w.sum() else w
+    result = risk_arrays(returns_matrix(prices), w, bench, confidence)
+    holdings = pd.DataFrame({"weight": w, **{c: result[c] for c in HOLDING_COLUMNS[1:]}}, index=prices.columns)
+    return {
+        "as_of": str(prices.index[-1].date()) if len(prices) else None,
+        "holdings": holdings[HOLDING_COLUMNS],
+        "correlation": pd.DataFrame(result["correlation"], index=prices.columns, columns=prices.columns),
+        "portfolio": result["portfolio"],
+    }
+
+
+def holding_weights(tickers):
+    """Equal weight per position, so a ticker held twice counts twice"""
+    counts = pd.Series([t.upper() for t in tickers]).value_counts(normalize=True)
+    return counts.sort_index().to_dict()
+
+
+def portfolio_risk(tickers, period=RISK_PERIOD, benchmark=BENCHMARK, confidence=CONFIDENCE):
+    """Risk report for the positions in tickers, from one bulk price load.
+
+    Prices are shared for PRICE_TTL; the report itself is cached per holdings set and
+    as-of date, so reruns and other sessions with the same portfolio reuse it.
+    """
+    weights = holding_weights(tickers)
+    symbols = tuple(sorted(set(weights) | ({benchmark} if benchmark else set())))
+    prices = shared_cache.get_or_compute(
+        ("risk_prices", symbols, period), lambda: price_matrix(load_many(symbols, period)), ttl=PRICE_TTL
+    )
+    if prices.empty:
+        return None
+    as_of = str(prices.index[-1].date())
+
+    def compute():
+        with metrics.timer("stage_seconds", stage="risk"):
+            held = [t for t in weights if t in prices.columns]
+            bench = prices[benchmark] if benchmark in prices.columns else None
+            return analyze_risk(prices[held], weights, bench, confidence)
+
+    key = ("risk", tuple(weights.items()), period, benchmark, confidence, as_of)
+    return shared_cache.get_or_compute(key, compute, ttl=RISK_TTL)
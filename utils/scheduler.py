@@ -0,0 +1,306 @@
+# utils/scheduler.py
+
+import argparse
+import datetime
+import os
+import sqlite3
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from utils.indicators import compute_indicators, price_matrix
+from utils.portfolio_store import load_all, portfolio_slug
+from utils.price_store import load_many
+from utils.report_generator import build_portfolio_report, render_all_charts
+
+JOBS_DB = os.environ.get("MARKETPULSE_JOBS_DB", os.path.join("data", "jobs.sqlite"))
+OUTPUT_DIR = os.path.join("reports", "scheduled")
+
+DEFAULT_CRON = "0 6 * * 1-5"
+REPORT_PERIOD = "1y"
+
+# A failed report is rebuilt until it has been attempted this many times
+MAX_ATTEMPTS = 3
+
+
+def saved_portfolios():
+    """Every saved portfolio as name -> list of holdings"""
+    return load_all()
+
+
+# --- cron ---------------------------------------------------------------------------
+
+def _cron_field(field, low, high):
+    """Expand one cron field ("*", "1-5", "*/15", "1,15") into the set of values it allows"""
+    values = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step = part.split("/")
+            step = int(step)
+            if step < 1:
+                raise ValueError(f"Cron step must be positive: {field!r}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start, end = (int(v) for v in part.split("-"))
+        else:
+            start = end = int(part)
+        if not low <= start <= end <= high:
+            raise ValueError(f"Cron field {field!r} is outside {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+def parse_cron(expr):
+    """Parse "minute hour day-of-month month day-of-week" into allowed-value sets.
+
+    Day-of-week is 0-7 with both 0 and 7 meaning Sunday. As in standard cron, when both
+    day fields are restricted (neither starts with "*"), a day matching either one runs.
+    Returns (minutes, hours, days, months, weekdays, either_day).
+    """
+    fields = expr.split()
+    if len(fields) != 5:
+        raise ValueError(f"Expected 5 cron fields, got: {expr!r}")
+    bounds = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+    minutes, hours, days, months, weekdays = (_cron_field(f, low, high) for f, (low, high) in zip(fields, bounds))
+    weekdays = {day % 7 for day in weekdays}
+    either_day = not fields[2].startswith("*") and not fields[4].startswith("*")
+    return minutes, hours, days, months, weekdays, either_day
+
+
+def _day_matches(day, days, weekdays, either_day):
+    # datetime counts Monday as 0, cron counts Sunday as 0
+    in_days, in_weekdays = day.day in days, (day.weekday() + 1) % 7 in weekdays
+    return (in_days or in_weekdays) if either_day else (in_days and in_weekdays)
+
+
+def next_run(expr, after):
+    """First minute strictly after `after` that matches the cron expression"""
+    minutes, hours, days, months, weekdays, either_day = parse_cron(expr)
+    candidate = after.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+    # Long enough for "29 Feb" to come round
+    limit = candidate + datetime.timedelta(days=366 * 8)
+    while candidate < limit:
+        if candidate.month not in months or not _day_matches(candidate, days, weekdays, either_day):
+            candidate = (candidate + datetime.timedelta(days=1)).replace(hour=0, minute=0)
+            continue
+        if candidate.hour not in hours:
+            candidate = (candidate + datetime.timedelta(hours=1)).replace(minute=0)
+            continue
+        if candidate.minute in minutes:
+            return candidate
+        candidate += datetime.timedelta(minutes=1)
+    raise ValueError(f"Cron expression never matches: {expr!r}")
+
+
+# --- job store ----------------------------------------------------------------------
+
+def _connect():
+    directory = os.path.dirname(JOBS_DB)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(JOBS_DB, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            run_id TEXT NOT NULL,
+            portfolio TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            started_at TEXT,
+            finished_at TEXT,
+            seconds REAL,
+            output TEXT,
+            error TEXT,
+            PRIMARY KEY (run_id, portfolio)
+        );
+        CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status);
+    """)
+    return conn
+
+
+def enqueue_run(run_id, portfolios):
+    """Create one pending job per portfolio; re-enqueueing an existing run is a no-op"""
+    with _connect() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO jobs (run_id, portfolio) VALUES (?, ?)",
+            [(run_id, name) for name in portfolios]
+        )
+
+
+def unfinished_runs():
+    """Runs with jobs still to do: never completed (e.g. the process died mid-run) or failed with attempts left"""
+    with _connect() as conn:
+        # Anything left "running" belongs to a worker that no longer exists
+        conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END WHERE status = 'running'",
+            (MAX_ATTEMPTS,)
+        )
+        rows = conn.execute(
+            "SELECT DISTINCT run_id FROM jobs WHERE status = 'pending' OR (status = 'failed' AND attempts < ?) "
+            "ORDER BY run_id", (MAX_ATTEMPTS,)
+        ).fetchall()
+    return [row[0] for row in rows]
+
+
+def job_timings(run_id):
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT portfolio, status, attempts, seconds, output, error FROM jobs WHERE run_id = ? ORDER BY portfolio",
+            (run_id,)
+        ).fetchall()
+    keys = ["portfolio", "status", "attempts", "seconds", "output", "error"]
+    return [dict(zip(keys, row)) for row in rows]
+
+
+# --- execution ----------------------------------------------------------------------
+
+def shared_frames(tickers, period=REPORT_PERIOD):
+    """Prices and indicators for the union of all holdings, computed once per ticker"""
+    prices = price_matrix(load_many(tickers, period))
+    if prices.empty:
+        return {}
+    indicators = compute_indicators(prices, sma_windows=(50,))
+    frames = {}
+    for ticker in prices.columns:
+        frame = prices[[ticker]].rename(columns={ticker: "Adj Close"})
+        frame["SMA_50"] = indicators["SMA_50"][ticker]
+        frame["RSI"] = indicators["RSI"][ticker]
+        frames[ticker] = frame.dropna(subset=["Adj Close"])
+    return frames
+
+
+def report_path(out_dir, name):
+    """Where a portfolio's PDF goes: its slug under out_dir, never anywhere else.
+
+    Names saved before slugs were enforced get a hash suffix so two of them can't collide.
+    """
+    try:
+        filename = portfolio_slug(name)
+    except ValueError:
+        filename = "portfolio"
+    if filename != name:
+        filename = f"{filename}-{zlib.crc32(name.encode()):08x}"
+    path = os.path.join(out_dir, f"{filename}.pdf")
+    if os.path.dirname(os.path.realpath(path)) != os.path.realpath(out_dir):
+        raise ValueError(f"Report path for {name!r} escapes {out_dir}")
+    return path
+
+
+def _build_job(run_id, name, holdings, frames, charts):
+    started = time.monotonic()
+    pdf = build_portfolio_report(holdings, REPORT_PERIOD, frames=frames, charts=charts)
+    out_dir = os.path.join(OUTPUT_DIR, run_id.replace(":", "-"))
+    os.makedirs(out_dir, exist_ok=True)
+    path = report_path(out_dir, name)
+    with open(path, "wb") as f:
+        f.write(pdf)
+    return path, time.monotonic() - started
+
+
+def _runnable(run_id, portfolios):
+    """Pending jobs plus failed ones with attempts left; jobs for deleted portfolios are marked skipped"""
+    with _connect() as conn:
+        names = [row[0] for row in conn.execute(
+            "SELECT portfolio FROM jobs WHERE run_id = ? AND (status = 'pending' OR (status = 'failed' AND attempts < ?))",
+            (run_id, MAX_ATTEMPTS)
+        )]
+        missing = [name for name in names if name not in portfolios]
+        conn.executemany(
+            "UPDATE jobs SET status = 'skipped', finished_at = ?, error = 'Portfolio no longer exists' "
+            "WHERE run_id = ? AND portfolio = ?",
+            [(datetime.datetime.now().isoformat(), run_id, name) for name in missing]
+        )
+    return [name for name in names if name in portfolios]
+
+
+def execute_run(run_id, workers=None):
+    """Build every pending report in a run; shared tickers are fetched, computed and charted once.
+
+    Failed reports are rebuilt until they have had MAX_ATTEMPTS attempts.
+    """
+    portfolios = saved_portfolios()
+    runnable = _runnable(run_id, portfolios)
+    if not runnable:
+        return job_timings(run_id)
+
+    tickers = sorted({h["ticker"] for name in runnable for h in portfolios[name]})
+    frames = shared_frames(tickers)
+    charts = render_all_charts(frames)
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        while runnable:
+            futures = {}
+            for name in runnable:
+                holdings = portfolios[name]
+                held = {h["ticker"] for h in holdings}
+                with _connect() as conn:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', attempts = attempts + 1, started_at = ? "
+                        "WHERE run_id = ? AND portfolio = ?",
+                        (datetime.datetime.now().isoformat(), run_id, name)
+                    )
+                future = pool.submit(
+                    _build_job, run_id, name, holdings,
+                    {t: frames[t] for t in held if t in frames}, {t: charts[t] for t in held if t in charts}
+                )
+                futures[future] = name
+
+            for future in as_completed(futures):
+                name = futures[future]
+                finished = datetime.datetime.now().isoformat()
+                with _connect() as conn:
+                    try:
+                        path, seconds = future.result()
+                        conn.execute(
+                            "UPDATE jobs SET status = 'done', finished_at = ?, seconds = ?, output = ?, error = NULL "
+                            "WHERE run_id = ? AND portfolio = ?",
+                            (finished, round(seconds, 3), path, run_id, name)
+                        )
+                    except Exception as e:
+                        conn.execute(
+                            "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? "
+                            "WHERE run_id = ? AND portfolio = ?",
+                            (finished, str(e), run_id, name)
+                        )
+            runnable = _runnable(run_id, portfolios)
+    return job_timings(run_id)
+
+
+def run_once(run_id=None, workers=None):
+    run_id = run_id or datetime.datetime.now().strftime("%Y-%m-%dT%H:%M")
+    enqueue_run(run_id, saved_portfolios())
+    return execute_run(run_id, workers)
+
+
+def run_forever(cron=DEFAULT_CRON, workers=None):
+    """Resume any interrupted runs, then regenerate all reports on the cron schedule"""
+    for run_id in unfinished_runs():
+        print(f"Resuming run {run_id}")
+        execute_run(run_id, workers)
+    while True:
+        due = next_run(cron, datetime.datetime.now())
+        time.sleep(max(0.0, (due - datetime.datetime.now()).total_seconds()))
+        run_id = due.strftime("%Y-%m-%dT%H:%M")
+        jobs = run_once(run_id, workers)
+        done = [j for j in jobs if j["status"] == "done"]
+        print(f"Run {run_id}: {len(done)}/{len(jobs)} reports built")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regenerate reports for every saved portfolio on a schedule")
+    parser.add_argument("--cron", default=DEFAULT_CRON, help="minute hour day month weekday (0 or 7 = Sunday)")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--once", action="store_true", help="Build all reports now and exit")
+    args = parser.parse_args()
+
+    if args.once:
+        for job in run_once(workers=args.workers):
+            print(f"{job['portfolio']:24} {job['status']:8} {job['seconds'] or 0:.2f}s {job['output'] or job['error'] or ''}")
+    else:
+        run_forever(args.cron, args.workers)
+
+
+if __name__ == "__main__":
+    main()
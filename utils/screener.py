@@ -0,0 +1,124 @@
+# utils/screener.py
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from utils.indicators import compute_indicators, price_matrix
+from utils.price_store import load_many
+
+RSI_OVERSOLD = 30
+RSI_OVERBOUGHT = 70
+
+# A 50/200 crossover counts as fresh if it happened within this many bars
+CROSS_LOOKBACK = 5
+
+# Below this many tickers a process pool costs more than it saves
+POOL_MIN_TICKERS = 200
+
+UNIVERSE_DIR = os.path.join("data", "universes")
+SP500_URL = "https://raw.githubusercontent.com/datasets/s-and-p-500-companies/main/data/constituents.csv"
+
+UNIVERSES = {
+    "Popular": ["AAPL", "TSLA", "GOOGL", "AMZN", "MSFT", "NVDA", "META", "NFLX", "JPM", "BRK-B"],
+}
+
+RESULT_COLUMNS = ["ticker", "price", "change_pct", "rsi", "signal", "sma_20", "sma_50", "sma_200",
+                  "trend", "cross", "bars_since_cross"]
+
+
+def recommendation(rsi):
+    """The app's BUY/SELL/HOLD rule for a single RSI value"""
+    if rsi < RSI_OVERSOLD:
+        return "BUY 🟢"
+    if rsi > RSI_OVERBOUGHT:
+        return "SELL 🔴"
+    return "HOLD 🟡"
+
+
+def _sp500():
+    """S&P 500 constituents, downloaded once and kept under data/universes"""
+    path = os.path.join(UNIVERSE_DIR, "sp500.csv")
+    if not os.path.exists(path):
+        from utils.news_ingest import http_session
+
+        response = http_session().get(SP500_URL, timeout=10)
+        response.raise_for_status()
+        os.makedirs(UNIVERSE_DIR, exist_ok=True)
+        with open(path, "w") as f:
+            f.write(response.text)
+    symbols = pd.read_csv(path)["Symbol"]
+    return symbols.str.replace(".", "-", regex=False).tolist()
+
+
+def load_universe(name):
+    """Tickers for a named universe ("Popular", "S&P 500") or a text file with one ticker per line"""
+    if name in UNIVERSES:
+        return list(UNIVERSES[name])
+    if name == "S&P 500":
+        return _sp500()
+    with open(name) as f:
+        return [line.strip().upper() for line in f if line.strip() and not line.startswith("#")]
+
+
+def _screen_block(prices):
+    """Indicators and signals for one block of price-matrix columns"""
+    indicators = compute_indicators(prices)
+    values = prices.ffill()
+    last, prev = values.iloc[-1], values.iloc[-2] if len(values) > 1 else values.iloc[-1]
+    rsi = indicators["RSI"].iloc[-1]
+    sma_20, sma_50, sma_200 = (indicators[f"SMA_{w}"].iloc[-1] for w in (20, 50, 200))
+
+    # Golden/death cross: sign change of SMA_50 - SMA_200 within the lookback window
+    spread = np.sign((indicators["SMA_50"] - indicators["SMA_200"]).to_numpy()[-(CROSS_LOOKBACK + 1):])
+    crossed_up = (spread[:-1] < 0) & (spread[1:] > 0)
+    crossed_down = (spread[:-1] > 0) & (spread[1:] < 0)
+    crossed = crossed_up | crossed_down
+    # Index of the most recent crossing row, counted back from the last bar
+    last_cross = np.where(crossed.any(axis=0), crossed.shape[0] - 1 - np.argmax(crossed[::-1], axis=0), -1)
+    cols = np.arange(prices.shape[1])
+    cross = np.where(last_cross < 0, "", np.where(crossed_up[np.maximum(last_cross, 0), cols], "Golden cross", "Death cross"))
+    bars_since = np.where(last_cross < 0, np.nan, crossed.shape[0] - 1 - last_cross)
+
+    result = pd.DataFrame({
+        "ticker": prices.columns,
+        "price": last.to_numpy(),
+        "change_pct": ((last / prev - 1) * 100).to_numpy(),
+        "rsi": rsi.to_numpy(),
+        "signal": np.select(
+            [rsi.to_numpy() < RSI_OVERSOLD, rsi.to_numpy() > RSI_OVERBOUGHT], ["BUY 🟢", "SELL 🔴"], "HOLD 🟡"
+        ),
+        "sma_20": sma_20.to_numpy(),
+        "sma_50": sma_50.to_numpy(),
+        "sma_200": sma_200.to_numpy(),
+        "trend": np.where(sma_200.isna().to_numpy(), "", np.where(last > sma_200, "Above SMA 200", "Below SMA 200")),
+        "cross": cross,
+        "bars_since_cross": bars_since,
+    })
+    return result
+
+
+def screen(tickers, period="1y", workers=None):
+    """Apply the RSI and SMA crossover rules to a universe and return one row per ticker.
+
+    Prices come from the local store with bulk downloads for anything missing; the
+    indicator math runs on column blocks of the price matrix in a process pool when the
+    universe is large. Tickers without data are left out.
+    """
+    frames = load_many(tickers, period)
+    prices = price_matrix(frames)
+    if prices.empty:
+        return pd.DataFrame(columns=RESULT_COLUMNS)
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and prices.shape[1] >= POOL_MIN_TICKERS:
+        blocks = [prices.iloc[:, cols] for cols in np.array_split(np.arange(prices.shape[1]), workers)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_screen_block, blocks))
+        result = pd.concat(results, ignore_index=True)
+    else:
+        result = _screen_block(prices)
+
+    return result.sort_values("rsi", ignore_index=True)
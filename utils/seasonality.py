@@ -0,0 +1,215 @@
+# utils/seasonality.py
+
+import json
+import math
+import os
+import random
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.price_store import RESTATEMENT_TOLERANCE, load_cached
+
+PROFILE_DIR = os.environ.get("MARKETPULSE_SEASONALITY_DIR", os.path.join("data", "seasonality"))
+
+MONTH_NAMES = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+WEEKDAY_NAMES = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+STAT_COLUMNS = ["mean", "median", "hit_rate", "std", "count"]
+
+# Profiles keep running totals per bucket plus this many returns for the median,
+# so their size and update cost stay flat however much history they cover
+SAMPLE_SIZE = 128
+STATE_VERSION = 2
+
+_lock = threading.Lock()
+
+
+def _path(ticker):
+    return os.path.join(PROFILE_DIR, ticker.upper().replace("/", "_") + ".json")
+
+
+def _empty_bucket():
+    return {"count": 0, "sum": 0.0, "sum_sq": 0.0, "hits": 0, "sample": []}
+
+
+def _empty_state():
+    return {
+        "version": STATE_VERSION,
+        "first_date": None,
+        "last_date": None,
+        "last_close": None,
+        "last_month": None,
+        "last_month_close": None,
+        "monthly": {str(m): _empty_bucket() for m in range(1, 13)},
+        "weekday": {str(d): _empty_bucket() for d in range(7)},
+        "summary": {},
+    }
+
+
+def _load_state(ticker):
+    try:
+        with open(_path(ticker)) as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return _empty_state()
+    # Profiles from before running summaries held every return; rebuild them from the price store
+    return state if state.get("version") == STATE_VERSION else _empty_state()
+
+
+def _save_state(ticker, state):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    tmp = f"{_path(ticker)}.{os.getpid()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, _path(ticker))
+
+
+def _add(bucket, ret):
+    """Fold one return into a bucket's running totals and its bounded median sample"""
+    bucket["count"] += 1
+    bucket["sum"] += ret
+    bucket["sum_sq"] += ret * ret
+    bucket["hits"] += ret > 0
+    # Reservoir sampling: every return so far is equally likely to be in the sample.
+    # Seeded by the count so rebuilding a profile gives the same sample.
+    if len(bucket["sample"]) < SAMPLE_SIZE:
+        bucket["sample"].append(round(ret, 6))
+    else:
+        slot = random.Random(bucket["count"]).randrange(bucket["count"])
+        if slot < SAMPLE_SIZE:
+            bucket["sample"][slot] = round(ret, 6)
+
+
+def _stats(bucket):
+    """Mean, median, hit rate, dispersion and sample size for one bucket of returns.
+
+    The median comes from the bucket's sample, so it is exact up to SAMPLE_SIZE returns.
+    """
+    n = bucket["count"]
+    if not n:
+        return {"mean": None, "median": None, "hit_rate": None, "std": None, "count": 0}
+    mean = bucket["sum"] / n
+    variance = (bucket["sum_sq"] - n * mean * mean) / (n - 1) if n > 1 else 0.0
+    return {
+        "mean": mean,
+        "median": float(np.median(bucket["sample"])),
+        "hit_rate": bucket["hits"] / n,
+        "std": math.sqrt(max(variance, 0.0)),
+        "count": n,
+    }
+
+
+def _fold(state, closes):
+    """Fold returns for bars after the last folded date; months fold in once they are complete"""
+    if state["last_date"] is not None:
+        closes = closes[closes.index > pd.Timestamp(state["last_date"])]
+    if closes.empty:
+        return state
+
+    # Daily returns by weekday, continuing from the last folded close
+    prev = np.concatenate([[np.nan if state["last_close"] is None else state["last_close"]], closes.to_numpy()[:-1]])
+    daily = closes.to_numpy() / prev - 1
+    for weekday, ret in zip(closes.index.weekday, daily.tolist()):
+        if not np.isnan(ret):
+            _add(state["weekday"][str(weekday)], ret)
+
+    # Month-end closes for months that have finished (a later month has started). The last
+    # folded close is included so a month that was still open at the previous update closes now.
+    month_closes = closes
+    if state["last_date"] is not None:
+        month_closes = pd.concat([pd.Series([state["last_close"]], index=[pd.Timestamp(state["last_date"])]), closes])
+    periods = month_closes.index.to_period("M")
+    month_ends = month_closes.groupby(periods).last()
+    current_month = periods[-1]
+    last_month = pd.Period(state["last_month"], freq="M") if state["last_month"] else None
+    for month, close in month_ends.items():
+        if month >= current_month or (last_month is not None and month <= last_month):
+            continue
+        if state["last_month_close"] is not None:
+            _add(state["monthly"][str(month.month)], float(close / state["last_month_close"] - 1))
+        state["last_month"] = str(month)
+        state["last_month_close"] = float(close)
+
+    if state["first_date"] is None:
+        state["first_date"] = str(closes.index[0].date())
+    state["last_date"] = str(closes.index[-1].date())
+    state["last_close"] = float(closes.iloc[-1])
+    state["summary"] = {
+        "monthly": {m: _stats(b) for m, b in state["monthly"].items()},
+        "weekday": {d: _stats(b) for d, b in state["weekday"].items()},
+    }
+    return state
+
+
+def _restated(state, closes):
+    """True if closes no longer agree with the last close folded into the profile.
+
+    A dividend or split rewrites every earlier Adj Close, so returns folded in on the old
+    basis can't be continued from.
+    """
+    if state["last_date"] is None:
+        return False
+    last_date = pd.Timestamp(state["last_date"])
+    if last_date not in closes.index:
+        return closes.index[-1] > last_date
+    return abs(closes.at[last_date] / state["last_close"] - 1) > RESTATEMENT_TOLERANCE
+
+
+def update_profile(ticker, history=None):
+    """Fold any new bars into a ticker's seasonality profile and persist it.
+
+    history defaults to whatever the local price store already holds, so no network
+    call is made. If it reaches further back than the saved profile, or its prices were
+    restated since the last update, the profile is rebuilt.
+    """
+    ticker = ticker.upper()
+    if history is None:
+        history = load_cached(ticker)
+    if history.empty:
+        return _empty_state()
+    closes = history["Adj Close"].dropna()
+
+    with _lock:
+        state = _load_state(ticker)
+        if state["first_date"] is not None and \
+                (closes.index[0] < pd.Timestamp(state["first_date"]) or _restated(state, closes)):
+            state = _empty_state()
+        last_date = state["last_date"]
+        state = _fold(state, closes)
+        if state["last_date"] != last_date:
+            _save_state(ticker, state)
+    return state
+
+
+def _summary_frame(summary, names, first_key):
+    rows = {names[int(key) - first_key]: stats for key, stats in summary.items()}
+    frame = pd.DataFrame.from_dict(rows, orient="index", columns=STAT_COLUMNS)
+    return frame[frame["count"] > 0]
+
+
+def seasonality_profile(ticker, history=None):
+    """Month-of-year and day-of-week return profiles for one ticker as DataFrames"""
+    state = update_profile(ticker, history)
+    summary = state.get("summary") or {}
+    return {
+        "monthly": _summary_frame(summary.get("monthly", {}), MONTH_NAMES, 1),
+        "weekday": _summary_frame(summary.get("weekday", {}), WEEKDAY_NAMES, 0),
+    }
+
+
+def universe_seasonality(tickers, month=None, kind="monthly"):
+    """Profile stats for one month (or weekday) across a universe of tickers.
+
+    Each profile is first brought up to date from the local price store, so tickers never
+    opened in Analysis are included; ones with no stored prices come back as NaN rows.
+    month is 1-12 for kind="monthly" or 0-6 for kind="weekday" and defaults to today.
+    """
+    today = pd.Timestamp.today()
+    if month is None:
+        month = today.month if kind == "monthly" else today.weekday()
+    rows = {}
+    for ticker in tickers:
+        stats = update_profile(ticker).get("summary", {}).get(kind, {}).get(str(month))
+        rows[ticker.upper()] = stats or {}
+    return pd.DataFrame.from_dict(rows, orient="index", columns=STAT_COLUMNS).reindex(list(rows))
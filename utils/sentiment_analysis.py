@@ -1,23 +1,13 @@
 # utils/sentiment_analysis.py
 
-import requests
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-
-# Initialize sentiment engine once
-analyzer = SentimentIntensityAnalyzer()
+from utils.news_ingest import gather_headlines
+from utils.sentiment_scorer import score_headlines
 
 
 def get_yahoo_finance_headlines(ticker):
     """Get top Yahoo Finance headlines for the stock."""
-    url = f"https://query1.finance.yahoo.com/v1/finance/search?q={ticker}"
-    headers = {"User-Agent": "Mozilla/5.0"}
-
     try:
-        response = requests.get(url, headers=headers)
-        results = response.json()
-        news_items = results.get("news", [])[:10]  # Top 10 headlines
-        headlines = [item['title'] for item in news_items if 'title' in item]
-        return headlines
+        return gather_headlines(ticker)["headlines"]
     except Exception as e:
         return []
 
@@ -25,8 +15,7 @@ def get_yahoo_finance_headlines(ticker):
 def analyze_sentiment(headlines):
     """Returns scores and labels for a list of headlines."""
     results = []
-    for text in headlines:
-        score = analyzer.polarity_scores(text)['compound']
+    for text, score in zip(headlines, score_headlines(headlines)):
         label = (
             "Positive" if score > 0.2 else
             "Negative" if score < -0.2 else
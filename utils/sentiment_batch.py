@@ -0,0 +1,120 @@
+# utils/sentiment_batch.py
+
+import argparse
+import itertools
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from utils.sentiment_scorer import get_analyzer
+
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+CHUNK_SIZE = 2000
+
+
+def _init_worker():
+    # Load the lexicon once per worker instead of once per chunk
+    get_analyzer()
+
+
+def _score_chunk(headlines):
+    analyzer = get_analyzer()
+    return [analyzer.polarity_scores(h)["compound"] for h in headlines]
+
+
+def _chunks(records, size):
+    it = iter(records)
+    while True:
+        chunk = list(itertools.islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def score_corpus(records, workers=None, chunk_size=CHUNK_SIZE):
+    """Score (ticker, date, headline) records across a process pool, yielding (record, compound) in input order.
+
+    Only a couple of chunks per worker are in flight at once, so arbitrarily large
+    corpora (e.g. a generator over a CSV) stream through in bounded memory.
+    """
+    workers = workers or os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        for chunk in _chunks(records, chunk_size):
+            pending.append((chunk, pool.submit(_score_chunk, [r[2] for r in chunk])))
+            if len(pending) >= workers * 2:
+                chunk, future = pending.popleft()
+                yield from zip(chunk, future.result())
+        while pending:
+            chunk, future = pending.popleft()
+            yield from zip(chunk, future.result())
+
+
+def backfill_sentiment(records, workers=None, chunk_size=CHUNK_SIZE, progress=None):
+    """Score a headline corpus and aggregate it per ticker and day.
+
+    Returns (daily, report): daily has one row per (ticker, date) with headline count,
+    mean score and positive/negative counts; report has totals and headlines per second.
+    progress, if given, is called with the running report after every chunk.
+    """
+    started = time.monotonic()
+    totals = {}
+    count = 0
+    for (ticker, date, _), compound in score_corpus(records, workers, chunk_size):
+        key = (ticker.upper(), str(date)[:10])
+        agg = totals.get(key)
+        if agg is None:
+            agg = totals[key] = [0, 0.0, 0, 0]
+        agg[0] += 1
+        agg[1] += compound
+        agg[2] += compound >= POSITIVE_THRESHOLD
+        agg[3] += compound <= NEGATIVE_THRESHOLD
+        count += 1
+        if progress is not None and count % chunk_size == 0:
+            progress(_report(count, started))
+
+    daily = pd.DataFrame(
+        [(t, d, n, s / n, pos, neg) for (t, d), (n, s, pos, neg) in totals.items()],
+        columns=["ticker", "date", "headlines", "score", "positive", "negative"],
+    ).sort_values(["ticker", "date"], ignore_index=True)
+    return daily, _report(count, started)
+
+
+def _report(count, started):
+    elapsed = time.monotonic() - started
+    return {
+        "headlines": count,
+        "seconds": round(elapsed, 3),
+        "headlines_per_second": round(count / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def _read_csv_records(path):
+    for frame in pd.read_csv(path, usecols=["ticker", "date", "headline"], chunksize=50_000):
+        yield from frame[["ticker", "date", "headline"]].astype(str).itertuples(index=False, name=None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill daily headline sentiment from a CSV of ticker,date,headline")
+    parser.add_argument("headlines_csv")
+    parser.add_argument("--out", default="reports/sentiment_daily.csv")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    daily, report = backfill_sentiment(
+        _read_csv_records(args.headlines_csv), args.workers, args.chunk_size,
+        progress=lambda r: print(f"{r['headlines']:,} headlines, {r['headlines_per_second']:,.0f}/s"),
+    )
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    daily.to_csv(args.out, index=False)
+    print(f"Scored {report['headlines']:,} headlines in {report['seconds']}s "
+          f"({report['headlines_per_second']:,.0f}/s) -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
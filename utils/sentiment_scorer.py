@@ -0,0 +1,102 @@
+# utils/sentiment_scorer.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from utils import metrics
+
+CACHE_PATH = os.environ.get("MARKETPULSE_SENTIMENT_CACHE", os.path.join("data", "sentiment_cache.sqlite"))
+MEMO_SIZE = 50_000
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+_local = threading.local()
+
+stats = {"memo_hits": 0, "disk_hits": 0, "scored": 0}
+
+
+def get_analyzer():
+    """The process-wide VADER analyzer, loaded on first use"""
+    global _analyzer
+    if _analyzer is None:
+        with _analyzer_lock:
+            if _analyzer is None:
+                from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+                _analyzer = SentimentIntensityAnalyzer()
+    return _analyzer
+
+
+def headline_key(headline):
+    return hashlib.sha1(headline.encode("utf-8")).hexdigest()
+
+
+def _connection():
+    """One SQLite connection per thread; WAL lets sessions read while another writes"""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        directory = os.path.dirname(CACHE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(CACHE_PATH, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, compound REAL NOT NULL)")
+        _local.conn = conn
+    return conn
+
+
+def _remember(key, compound):
+    with _memo_lock:
+        _memo[key] = compound
+        _memo.move_to_end(key)
+        while len(_memo) > MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+@metrics.timed("stage_seconds", stage="vader")
+def score_headlines(headlines):
+    """VADER compound scores for headlines, in order, reusing every score seen before"""
+    keys = [headline_key(h) for h in headlines]
+    scores = {}
+
+    with _memo_lock:
+        for key in keys:
+            if key in _memo:
+                _memo.move_to_end(key)
+                scores[key] = _memo[key]
+    stats["memo_hits"] += len(scores)
+    metrics.incr("cache_requests", len(scores), cache="sentiment", result="memo_hit")
+
+    missing = list({key for key in keys if key not in scores})
+    if missing:
+        conn = _connection()
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(f"SELECT key, compound FROM scores WHERE key IN ({placeholders})", chunk).fetchall()
+            for key, compound in rows:
+                scores[key] = compound
+                _remember(key, compound)
+            stats["disk_hits"] += len(rows)
+            metrics.incr("cache_requests", len(rows), cache="sentiment", result="disk_hit")
+
+    new_scores = []
+    for headline, key in zip(headlines, keys):
+        if key not in scores:
+            compound = get_analyzer().polarity_scores(headline)["compound"]
+            scores[key] = compound
+            _remember(key, compound)
+            new_scores.append((key, compound))
+    if new_scores:
+        stats["scored"] += len(new_scores)
+        metrics.incr("cache_requests", len(new_scores), cache="sentiment", result="miss")
+        conn = _connection()
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO scores (key, compound) VALUES (?, ?)", new_scores)
+
+    return [scores[key] for key in keys]
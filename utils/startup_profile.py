@@ -0,0 +1,122 @@
+# utils/startup_profile.py
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+
+# Third-party modules the app used to import eagerly, plus each page module
+PROFILED_MODULES = [
+    "streamlit", "numpy", "pandas", "requests", "yfinance", "plotly.graph_objects", "plotly.express",
+    "bs4", "vaderSentiment.vaderSentiment", "PIL.Image", "matplotlib.pyplot", "fpdf", "praw",
+    "views.home", "views.analysis", "views.portfolio", "views.reports", "views.about",
+]
+
+TIMINGS_LOG = os.path.join("reports", "startup_timings.jsonl")
+REPORT_PATH = os.path.join("reports", "startup_profile.json")
+
+# Ignore regressions smaller than this many milliseconds; they're mostly noise
+MIN_REGRESSION_MS = 20
+
+_lock = threading.Lock()
+_first_paint = None
+render_stats = {}
+
+
+def record_render(page, seconds):
+    """Track script run time per page; the first run in a process is logged as first paint"""
+    global _first_paint
+    with _lock:
+        stats = render_stats.setdefault(page, {"runs": 0, "total": 0.0, "max": 0.0})
+        stats["runs"] += 1
+        stats["total"] += seconds
+        stats["max"] = max(stats["max"], seconds)
+        if _first_paint is not None:
+            return
+        _first_paint = {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "page": page, "seconds": round(seconds, 4)}
+    try:
+        os.makedirs(os.path.dirname(TIMINGS_LOG), exist_ok=True)
+        with open(TIMINGS_LOG, "a") as f:
+            f.write(json.dumps(_first_paint) + "\n")
+    except OSError:
+        pass
+
+
+def import_time_ms(module):
+    """Cold cumulative import time of module in a fresh interpreter, from -X importtime"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, cwd=os.getcwd()
+    )
+    if proc.returncode != 0:
+        return None
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1].strip()) / 1000
+    return None
+
+
+def recent_first_paints(limit=20):
+    try:
+        with open(TIMINGS_LOG) as f:
+            return [json.loads(line) for line in f.readlines()[-limit:]]
+    except (OSError, ValueError):
+        return []
+
+
+def build_report(modules=PROFILED_MODULES):
+    report = {
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "import_ms": {module: import_time_ms(module) for module in modules},
+        "first_paint": recent_first_paints(),
+    }
+    return report
+
+
+def regressions(report, baseline, threshold):
+    """Modules whose import time grew past threshold x baseline (and by more than the noise floor)"""
+    found = {}
+    for module, ms in report["import_ms"].items():
+        before = baseline.get("import_ms", {}).get(module)
+        if ms is None or before is None:
+            continue
+        if ms > before * threshold and ms - before > MIN_REGRESSION_MS:
+            found[module] = (before, ms)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile MarketPulse cold-start import times")
+    parser.add_argument("--out", default=REPORT_PATH)
+    parser.add_argument("--baseline", help="Earlier report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Allowed slowdown ratio vs baseline")
+    args = parser.parse_args()
+
+    report = build_report()
+    for module, ms in sorted(report["import_ms"].items(), key=lambda kv: -(kv[1] or 0)):
+        print(f"{module:32} {'n/a' if ms is None else f'{ms:8.1f} ms'}")
+    if report["first_paint"]:
+        paints = [p["seconds"] for p in report["first_paint"]]
+        print(f"first paint (last {len(paints)} starts): median {sorted(paints)[len(paints) // 2]:.3f}s")
+
+    os.makedirs(os.path.dirname(args.out) or ".", exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            found = regressions(report, json.load(f), args.threshold)
+        for module, (before, after) in found.items():
+            print(f"REGRESSION {module}: {before:.1f} ms -> {after:.1f} ms")
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
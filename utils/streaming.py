@@ -0,0 +1,144 @@
+# utils/streaming.py
+
+import math
+
+from utils.indicators import RSI_WINDOW, SMA_WINDOWS
+
+# Re-add the rolling sums from scratch this often so floating-point drift can't build up
+RESYNC_EVERY = 1024
+
+
+class StreamingIndicators:
+    """RSI and SMAs for one symbol, updated in constant time per new bar.
+
+    Values match a full recompute with utils.indicators.compute_indicators (and pandas
+    rolling means) up to floating-point rounding: the first bar counts as a zero move,
+    RSI needs rsi_window bars and each SMA needs its full window.
+    """
+
+    def __init__(self, sma_windows=SMA_WINDOWS, rsi_window=RSI_WINDOW):
+        self.sma_windows = tuple(sma_windows)
+        self.rsi_window = rsi_window
+        self.count = 0
+        self.last_price = None
+        self.since_resync = 0
+
+        # Ring buffers: prices for the longest SMA, gains/losses for RSI
+        self.price_size = max(self.sma_windows, default=1)
+        self.prices = [0.0] * self.price_size
+        self.gains = [0.0] * rsi_window
+        self.losses = [0.0] * rsi_window
+
+        self.sma_sums = {w: 0.0 for w in self.sma_windows}
+        self.gain_sum = 0.0
+        self.loss_sum = 0.0
+        self.gain_nonzero = 0
+        self.loss_nonzero = 0
+
+    @classmethod
+    def from_history(cls, prices, **kwargs):
+        """Seed the state from a price history (oldest first)"""
+        state = cls(**kwargs)
+        for price in prices:
+            state.update(price)
+        return state
+
+    def update(self, price):
+        """Fold in the next bar's price and return the current indicator values"""
+        if price is None or math.isnan(price):
+            return self.values()
+        price = float(price)
+
+        # Prices leaving each SMA window are read before the slot is overwritten
+        slot = self.count % self.price_size
+        for w in self.sma_windows:
+            self.sma_sums[w] += price
+            if self.count >= w:
+                self.sma_sums[w] -= self.prices[(self.count - w) % self.price_size]
+        self.prices[slot] = price
+
+        delta = 0.0 if self.last_price is None else price - self.last_price
+        gain, loss = max(delta, 0.0), max(-delta, 0.0)
+        rsi_slot = self.count % self.rsi_window
+        if self.count >= self.rsi_window:
+            old_gain, old_loss = self.gains[rsi_slot], self.losses[rsi_slot]
+            self.gain_sum -= old_gain
+            self.loss_sum -= old_loss
+            self.gain_nonzero -= old_gain != 0
+            self.loss_nonzero -= old_loss != 0
+        self.gains[rsi_slot], self.losses[rsi_slot] = gain, loss
+        self.gain_sum += gain
+        self.loss_sum += loss
+        self.gain_nonzero += gain != 0
+        self.loss_nonzero += loss != 0
+
+        self.last_price = price
+        self.count += 1
+        self.since_resync += 1
+        if self.since_resync >= RESYNC_EVERY:
+            self._resync()
+        return self.values()
+
+    def _resync(self):
+        """Recompute the rolling sums exactly from the buffers"""
+        for w in self.sma_windows:
+            n = min(w, self.count)
+            self.sma_sums[w] = math.fsum(self.prices[(self.count - 1 - i) % self.price_size] for i in range(n))
+        self.gain_sum = math.fsum(self.gains)
+        self.loss_sum = math.fsum(self.losses)
+        self.since_resync = 0
+
+    def rsi(self):
+        if self.count < self.rsi_window:
+            return math.nan
+        gain = 0.0 if self.gain_nonzero == 0 else self.gain_sum / self.rsi_window
+        loss = 0.0 if self.loss_nonzero == 0 else self.loss_sum / self.rsi_window
+        if loss == 0:
+            return math.nan if gain == 0 else 100.0
+        return 100 - (100 / (1 + gain / loss))
+
+    def sma(self, window):
+        if self.count < window:
+            return math.nan
+        return self.sma_sums[window] / window
+
+    def values(self):
+        """Current indicator values keyed like calculate_technical_indicators' columns"""
+        values = {"RSI": self.rsi()}
+        for w in self.sma_windows:
+            values[f"SMA_{w}"] = self.sma(w)
+        return values
+
+    def to_dict(self):
+        """JSON-serializable snapshot of the full state"""
+        return {
+            "sma_windows": list(self.sma_windows),
+            "rsi_window": self.rsi_window,
+            "count": self.count,
+            "last_price": self.last_price,
+            "since_resync": self.since_resync,
+            "prices": list(self.prices),
+            "gains": list(self.gains),
+            "losses": list(self.losses),
+            "sma_sums": {str(w): s for w, s in self.sma_sums.items()},
+            "gain_sum": self.gain_sum,
+            "loss_sum": self.loss_sum,
+            "gain_nonzero": self.gain_nonzero,
+            "loss_nonzero": self.loss_nonzero,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        state = cls(sma_windows=data["sma_windows"], rsi_window=data["rsi_window"])
+        state.count = data["count"]
+        state.last_price = data["last_price"]
+        state.since_resync = data["since_resync"]
+        state.prices = list(data["prices"])
+        state.gains = list(data["gains"])
+        state.losses = list(data["losses"])
+        state.sma_sums = {int(w): s for w, s in data["sma_sums"].items()}
+        state.gain_sum = data["gain_sum"]
+        state.loss_sum = data["loss_sum"]
+        state.gain_nonzero = data["gain_nonzero"]
+        state.loss_nonzero = data["loss_nonzero"]
+        return state
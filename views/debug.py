@@ -0,0 +1,57 @@
+# views/debug.py
+
+import json
+
+import pandas as pd
+import streamlit as st
+
+from utils import metrics
+
+
+def _format_labels(labels):
+    return ", ".join(f"{k}={v}" for k, v in labels.items())
+
+
+def render():
+    """Debug panel: stage timings, external call latency and cache counters for this process"""
+    with st.expander("🛠️ Debug: Metrics"):
+        snap = metrics.snapshot()
+
+        if snap["histograms"]:
+            st.markdown("**⏱️ Timings**")
+            timings = pd.DataFrame([{
+                "metric": h["name"],
+                "labels": _format_labels(h["labels"]),
+                "count": h["count"],
+                "total (s)": h["sum"],
+                "mean (ms)": h["mean"] * 1000,
+                "p50 ≤ (ms)": h["p50"] * 1000,
+                "p95 ≤ (ms)": h["p95"] * 1000,
+            } for h in snap["histograms"]])
+            st.dataframe(timings.sort_values("total (s)", ascending=False), hide_index=True, use_container_width=True)
+
+        if snap["counters"]:
+            st.markdown("**🔢 Counters**")
+            counters = pd.DataFrame([
+                {"metric": c["name"], "labels": _format_labels(c["labels"]), "value": c["value"]}
+                for c in snap["counters"]
+            ])
+            st.dataframe(counters, hide_index=True, use_container_width=True)
+
+        if not snap["histograms"] and not snap["counters"]:
+            st.info("No metrics recorded yet")
+
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.download_button("📥 JSON", json.dumps(snap, indent=2), file_name="metrics.json",
+                               mime="application/json", key="download_metrics_json")
+
+        with col2:
+            st.download_button("📥 Prometheus", metrics.prometheus_text(), file_name="metrics.prom",
+                               mime="text/plain", key="download_metrics_prom")
+
+        with col3:
+            if st.button("🔄 Reset", key="reset_metrics"):
+                metrics.reset()
+                st.rerun()
@@ -0,0 +1,119 @@
+# views/home.py
+
+import datetime
+import os
+
+import streamlit as st
+
+from utils.result_cache import shared_cache
+
+
+def load_asset_image(filename):
+    """Load image from assets folder"""
+    try:
+        if os.path.exists(f"assets/{filename}"):
+            from PIL import Image
+            return Image.open(f"assets/{filename}")
+        else:
+            return None
+    except:
+        return None
+
+
+def render():
+    """Home page: quick analysis, popular stocks and the screener"""
+    st.markdown('<div class="hero-title">MarketPulse</div>', unsafe_allow_html=True)
+    st.markdown("### 🚀 Your AI-Powered Trading Companion")
+
+    # Quick analysis section
+    st.markdown("## Quick Stock Analysis")
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        quick_ticker = st.text_input("Enter stock ticker (e.g., AAPL, TSLA, GOOGL)", key="home_ticker")
+
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)  # Add spacing
+        if st.button("🚀 Analyze", key="home_analyze", type="primary"):
+            if quick_ticker:
+                st.session_state.analysis_ticker = quick_ticker.upper()
+                st.success(f"Analysis for {quick_ticker.upper()} - Check the Analysis tab!")
+
+    # Feature showcase
+    st.markdown("## 🌟 Why Choose MarketPulse?")
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("""
+        ### 🧠 Smart Analysis
+        AI-powered sentiment analysis combined with technical indicators for complete market insights.
+        """)
+
+    with col2:
+        st.markdown("""
+        ### ⏰ Perfect Timing
+        Historical patterns and seasonal trends help you find optimal entry and exit points.
+        """)
+
+    with col3:
+        st.markdown("""
+        ### 📱 Beginner Friendly
+        No confusing jargon - clean, simple interface designed for new investors.
+        """)
+
+    # Popular stocks showcase
+    st.markdown("## 📈 Popular Stocks")
+    popular_stocks = ["AAPL", "TSLA", "GOOGL", "AMZN", "MSFT", "NVDA"]
+
+    cols = st.columns(len(popular_stocks))
+    for i, stock in enumerate(popular_stocks):
+        with cols[i]:
+            if st.button(f"📊 {stock}", key=f"popular_{stock}"):
+                st.session_state.analysis_ticker = stock
+                st.success(f"Set {stock} for analysis!")
+
+    # Universe screener
+    st.markdown("## 🔎 Market Screener")
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        universe = st.selectbox("Universe:", ["Popular", "S&P 500"], key="screener_universe")
+
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        run_screener = st.button("🔎 Scan", key="run_screener")
+
+    if run_screener:
+        with st.spinner(f"Scanning {universe}..."):
+            try:
+                from utils.engine import PRICE_TTL
+                from utils.screener import load_universe, screen
+                from utils.seasonality import MONTH_NAMES, universe_seasonality
+
+                results = shared_cache.get_or_compute(
+                    ("screen", universe), lambda: screen(load_universe(universe)), ttl=PRICE_TTL
+                )
+                # This month's seasonality for every scanned ticker, from the prices the scan just stored
+                month = datetime.date.today().month
+                seasonal = shared_cache.get_or_compute(
+                    ("universe_seasonality", universe, month),
+                    lambda: universe_seasonality(results['ticker'], month), ttl=PRICE_TTL
+                )
+                month_name = MONTH_NAMES[month - 1]
+                results = results.join(
+                    seasonal[["mean", "hit_rate"]].astype(float).rename(columns=lambda c: f"{month_name.lower()}_{c}"),
+                    on="ticker"
+                )
+                buy_col, sell_col, cross_col = st.columns(3)
+                with buy_col:
+                    st.metric("🟢 Buy Signals", int(results['signal'].str.startswith('BUY').sum()))
+                with sell_col:
+                    st.metric("🔴 Sell Signals", int(results['signal'].str.startswith('SELL').sum()))
+                with cross_col:
+                    st.metric("✨ Fresh Crossovers", int((results['cross'] != "").sum()))
+                st.dataframe(results, use_container_width=True, hide_index=True)
+                st.caption(f"{month_name} columns: average {month_name} return and share of up {month_name}s "
+                           "in each ticker's stored history")
+            except Exception as e:
+                st.error(f"❌ Screener failed: {str(e)}")
@@ -0,0 +1,138 @@
+# views/portfolio.py
+
+import datetime
+
+import streamlit as st
+
+from utils import portfolio_store
+from utils.engine import analyze_ticker
+from utils.portfolio_model import PortfolioModel, session_portfolio
+from views import repricing
+
+
+def render():
+    """Portfolio page: add, save, load, export and clear holdings"""
+    st.markdown("# 💼 Your Portfolio")
+    portfolio = session_portfolio(st.session_state)
+
+    # Saved portfolios live in the portfolio database, keyed by name
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        typed_name = st.text_input("Portfolio name:", value="default", key="portfolio_name").strip() or "default"
+        try:
+            portfolio_name = portfolio_store.portfolio_slug(typed_name)
+        except ValueError:
+            portfolio_name = "default"
+        if portfolio_name != typed_name:
+            st.caption(f"Saved and loaded as '{portfolio_name}'")
+
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button("📂 Load Portfolio", key="load_portfolio"):
+            st.session_state.portfolio = PortfolioModel.from_frame(portfolio_store.load_portfolio(portfolio_name))
+            st.success(f"✅ Loaded {len(st.session_state.portfolio)} stocks from '{portfolio_name}'")
+            st.rerun()
+
+    # Add stock section
+    st.markdown("## ➕ Add New Stock")
+    col1, col2 = st.columns([3, 1])
+
+    with col1:
+        new_ticker = st.text_input("Enter stock ticker:", key="portfolio_input").upper()
+
+    with col2:
+        st.markdown("<br>", unsafe_allow_html=True)
+        if st.button("Add Stock", type="primary", key="add_stock_btn"):
+            if new_ticker:
+                try:
+                    # Quick analysis
+                    analysis = analyze_ticker(new_ticker, "1y", with_sentiment=False)
+                    if analysis is not None:
+                        stock_data = {
+                            "ticker": new_ticker,
+                            "price": analysis['price'],
+                            "rsi": analysis['rsi'],
+                            "recommendation": analysis['recommendation'],
+                            "added_date": str(datetime.date.today())
+                        }
+
+                        portfolio.add(stock_data)
+                        st.success(f"✅ {new_ticker} added to portfolio!")
+                        st.rerun()
+                    else:
+                        st.error("❌ Invalid ticker symbol")
+                except Exception as e:
+                    st.error(f"❌ Error: {str(e)}")
+
+    # Display portfolio
+    if portfolio:
+        st.markdown("## 📊 Portfolio Overview")
+        repricing.render()
+
+        df = portfolio.frame()
+
+        # Portfolio metrics
+        col1, col2, col3, col4 = st.columns(4)
+
+        with col1:
+            st.metric("📈 Total Stocks", len(df))
+
+        with col2:
+            st.metric("🟢 Buy Signals", portfolio.buy_signals)
+
+        with col3:
+            st.metric("🔴 Sell Signals", portfolio.sell_signals)
+
+        with col4:
+            st.metric("📊 Average RSI", f"{portfolio.mean_rsi:.1f}")
+
+        # Portfolio table
+        st.markdown("### 📋 Your Stocks")
+        st.dataframe(df, use_container_width=True)
+
+        # Remove a single holding; saved ones are deleted from the database straight away
+        col1, col2 = st.columns([3, 1])
+
+        with col1:
+            remove_index = st.selectbox(
+                "Remove stock:", range(len(df)), key="remove_stock",
+                format_func=lambda i: f"{df['ticker'].iloc[i]} (added {df['added_date'].iloc[i]})"
+            )
+
+        with col2:
+            st.markdown("<br>", unsafe_allow_html=True)
+            if st.button("➖ Remove", key="remove_stock_btn"):
+                removed = portfolio.remove(remove_index)
+                if removed.get("id") is not None:
+                    portfolio_store.delete_position(portfolio_name, removed["id"])
+                st.success(f"✅ {removed['ticker']} removed from portfolio")
+                st.rerun()
+
+        # Portfolio actions
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            if st.button("💾 Save Portfolio", key="save_portfolio"):
+                st.session_state.portfolio = PortfolioModel(portfolio_store.sync_portfolio(portfolio_name, portfolio))
+                st.success(f"✅ Portfolio saved as '{portfolio_name}'")
+
+        with col2:
+            csv_data = df.to_csv(index=False).encode('utf-8')
+            st.download_button(
+                "📥 Download CSV",
+                csv_data,
+                file_name=f"portfolio_{datetime.date.today()}.csv",
+                mime="text/csv",
+                key="download_csv"
+            )
+
+        with col3:
+            if st.button("🗑️ Clear Portfolio", key="clear_portfolio"):
+                portfolio.clear()
+                st.success("✅ Portfolio cleared!")
+                st.rerun()
+
+    else:
+        st.info("📝 Your portfolio is empty. Add some stocks to get started!")
+        st.markdown("**Suggested stocks to try:** AAPL, TSLA, GOOGL, AMZN, MSFT")
@@ -0,0 +1,128 @@
+# views/reports.py
+
+import datetime
+
+import plotly.express as px
+import streamlit as st
+
+from utils.portfolio_model import session_portfolio
+from utils.risk import BENCHMARK, CONFIDENCE, portfolio_risk
+from views import repricing
+
+MAX_HEATMAP = 40
+
+
+def _pct(value):
+    return "n/a" if value != value else f"{value:.2%}"
+
+
+def _num(value):
+    return "n/a" if value != value else f"{value:.2f}"
+
+
+def render():
+    """Reports page: portfolio risk metrics, recommendation mix and the summary report"""
+    st.markdown("# 📈 Portfolio Reports")
+    portfolio = session_portfolio(st.session_state)
+
+    if not portfolio:
+        st.warning("⚠️ Your portfolio is empty. Add some stocks first!")
+        if st.button("➕ Go Add Stocks", type="primary", key="go_to_portfolio"):
+            st.info("👆 Click the Portfolio tab above to add stocks")
+    else:
+        repricing.render()
+        df = portfolio.frame()
+
+        try:
+            with st.spinner("Computing portfolio risk..."):
+                report = portfolio_risk(df['ticker'].dropna().tolist())
+        except Exception as e:
+            st.warning(f"⚠️ Risk metrics unavailable: {e}")
+            report = None
+
+        # Portfolio analytics
+        col1, col2 = st.columns(2)
+
+        with col1:
+            st.markdown("## 📊 Risk Analysis")
+
+            if report is None:
+                st.info("No price history available for these holdings yet.")
+            else:
+                stats = report["portfolio"]
+                st.metric("📉 Annualized Volatility", _pct(stats["volatility"]))
+                st.metric(f"📐 Beta vs {BENCHMARK}", _num(stats["beta"]))
+                st.metric(f"⚠️ 1-Day VaR ({CONFIDENCE:.0%}, historical)", _pct(stats["var_historical"]))
+                st.metric(f"📏 1-Day VaR ({CONFIDENCE:.0%}, parametric)", _pct(stats["var_parametric"]))
+                st.caption(f"{stats['observations']} trading days to {report['as_of']}, equal weight per position. "
+                           f"Average pairwise correlation: {_num(stats['mean_correlation'])}")
+
+            risk = portfolio.risk_buckets()
+            st.caption(f"RSI extremes: 🔴 {risk['high']} overbought · 🟡 {risk['medium']} neutral · "
+                       f"🟢 {risk['low']} oversold")
+
+        with col2:
+            st.markdown("## 📈 Recommendations Distribution")
+
+            # Create pie chart
+            recommendation_counts = {label: n for label, n in portfolio.signal_counts().items() if n}
+            fig = px.pie(values=list(recommendation_counts.values()),
+                        names=list(recommendation_counts.keys()),
+                        title="Portfolio Recommendations",
+                        color_discrete_map={'BUY 🟢': '#10b981', 'SELL 🔴': '#ef4444', 'HOLD 🟡': '#f59e0b'})
+            st.plotly_chart(fig, use_container_width=True)
+
+        if report is not None and len(report["holdings"]) > 1:
+            with st.expander("🔗 Correlation & Per-Holding Risk"):
+                corr = report["correlation"]
+                if len(corr) > MAX_HEATMAP:
+                    # Heaviest positions first; a 500 x 500 heatmap is unreadable anyway
+                    top = report["holdings"]["weight"].nlargest(MAX_HEATMAP).index
+                    corr = corr.loc[top, top]
+                    st.caption(f"Showing the {MAX_HEATMAP} largest positions.")
+                fig = px.imshow(corr, zmin=-1, zmax=1, color_continuous_scale="RdBu_r",
+                                title="Daily Return Correlation")
+                st.plotly_chart(fig, use_container_width=True)
+                st.dataframe(report["holdings"].style.format({
+                    "weight": "{:.1%}", "volatility": "{:.1%}", "beta": "{:.2f}", "var_historical": "{:.2%}",
+                }), use_container_width=True)
+
+        # Generate report
+        st.markdown("## 📄 Generate Report")
+
+        if st.button("📋 Generate Summary Report", type="primary", key="generate_report"):
+            st.markdown("### 📊 Portfolio Summary Report")
+            st.markdown(f"**Generated on:** {datetime.date.today()}")
+            st.markdown(f"**Total Stocks:** {len(portfolio)}")
+            st.markdown(f"**Average RSI:** {portfolio.mean_rsi:.2f}")
+            if report is not None:
+                stats = report["portfolio"]
+                st.markdown(f"**Annualized Volatility:** {_pct(stats['volatility'])}")
+                st.markdown(f"**Beta vs {BENCHMARK}:** {_num(stats['beta'])}")
+                st.markdown(f"**1-Day VaR ({CONFIDENCE:.0%}):** {_pct(stats['var_historical'])}")
+
+            st.markdown("### 📋 Stock Details")
+            details = (
+                "**" + df['ticker'] + "** - $" + df['price'].map("{:.2f}".format)
+                + " - " + df['recommendation'].astype(str) + " (RSI: " + df['rsi'].map("{:.1f}".format) + ")"
+            )
+            st.markdown("\n\n".join(details))
+
+            st.success("✅ Report generated! You can copy this information or take a screenshot.")
+
+        if st.button("📄 Build PDF Report", key="build_pdf_report"):
+            with st.spinner("Rendering PDF report..."):
+                try:
+                    from utils.report_generator import build_portfolio_report
+                    st.session_state.pdf_report = build_portfolio_report(portfolio.records())
+                except Exception as e:
+                    st.error(f"❌ PDF report failed: {str(e)}")
+
+        if st.session_state.get("pdf_report"):
+            st.download_button(
+                "📥 Download PDF Report",
+                st.session_state.pdf_report,
+                file_name=f"MarketPulse_Report_{datetime.date.today()}.pdf",
+                mime="application/pdf",
+                key="download_pdf_report"
+            )
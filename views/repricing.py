@@ -0,0 +1,57 @@
+# views/repricing.py
+
+import time
+
+import streamlit as st
+
+from utils.engine import PRICE_TTL
+from utils.portfolio_model import session_portfolio
+from utils.repricer import reprice_async
+
+POLL_SECONDS = 1
+
+
+@st.fragment(run_every=POLL_SECONDS)
+def render():
+    """Keep the session portfolio's prices fresh without blocking the page.
+
+    Starts a background reprice when holdings change or prices are older than PRICE_TTL,
+    checks on it every POLL_SECONDS, and reruns the page once the new quotes are applied.
+    """
+    portfolio = session_portfolio(st.session_state)
+    if not portfolio:
+        return
+    tickers = tuple(sorted(set(portfolio.frame()['ticker'].dropna())))
+    future = st.session_state.get("reprice_future")
+    last = st.session_state.get("repriced")
+
+    if future is not None and future.done():
+        del st.session_state["reprice_future"]
+        try:
+            quotes = future.result()
+        except Exception as e:
+            st.session_state.repriced = {"tickers": tickers, "at": time.monotonic(), "as_of": None, "error": str(e)}
+            st.rerun(scope="fragment")
+        portfolio.reprice(quotes)
+        st.session_state.repriced = {
+            "tickers": tickers, "at": time.monotonic(), "error": None,
+            "as_of": quotes['as_of'].max() if not quotes.empty else None,
+        }
+        # Rerun the whole page so the metrics and tables pick up the new prices
+        st.rerun()
+
+    if future is None and (last is None or last["tickers"] != tickers or time.monotonic() - last["at"] > PRICE_TTL):
+        st.session_state.reprice_future = future = reprice_async(tickers)
+
+    col1, col2 = st.columns([4, 1])
+    with col1:
+        if future is not None:
+            st.caption(f"🔄 Repricing {len(tickers)} holdings in the background...")
+        elif last and last["error"]:
+            st.caption(f"⚠️ Repricing failed: {last['error']}")
+        elif last and last["as_of"]:
+            st.caption(f"💹 Prices and signals as of {last['as_of']}")
+    with col2:
+        if st.button("🔄 Refresh Prices", key="refresh_prices", disabled=future is not None):
+            st.session_state.repriced = None
+            st.rerun(scope="fragment")